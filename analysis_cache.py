@@ -0,0 +1,269 @@
+# Analiz sonuçları için içerik adresli disk cache'i (batch pipeline)
+#
+# Anahtar: kaynak metnin hash'i + lexer/parser/format versiyonları. Değer:
+# token tablosu kolonları, identifier tablosu, AST ve hatalar; pickle yerine düz
+# array'ler ve bir string tablosundan oluşan compact binary format. Diğer token
+# değerleri saklanmaz, yüklerken kaynak koddan slice edilir.
+
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from operator import add
+
+from c_lexer_base import (IDENTIFIER_CODE, KEYWORD_CODE, KEYWORD_SPELLINGS, LEXER_VERSION, TOKEN_TYPES,
+                          SymbolTable, TokenTable)
+from parser import PARSER_VERSION, ASTNode
+
+CACHE_FORMAT_VERSION = 3
+CACHE_MAGIC = b'CSAC'
+CACHE_SUFFIX = '.cac'
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+
+# magic, success, token sayısı, node sayısı, symbol sayısı, string sayısı, hata sayısı,
+# blob uzunluğu, header alanları ve verinin digest'i
+HEADER = struct.Struct('<4sBIIIIII16s')
+PAYLOAD_DIGEST_SIZE = 16
+HEADER_FIELDS_SIZE = HEADER.size - PAYLOAD_DIGEST_SIZE
+NO_STRING = 0xFFFFFFFF
+
+# Farklı versiyon veya platform (array item boyutu, byte order) aynı anahtarı üretmesin
+CACHE_KEY_PREFIX = (f"{CACHE_FORMAT_VERSION}:{LEXER_VERSION}:{PARSER_VERSION}:"
+                    f"{sys.byteorder}:{array('I').itemsize}:").encode('ascii')
+
+
+def encode_analysis(success, tokens, ast, errors, error_positions):
+    strings = []
+    string_index = {}
+
+    def intern(text):
+        index = string_index.get(text)
+        if index is None:
+            index = string_index[text] = len(strings)
+            strings.append(text)
+        return index
+
+    # AST preorder: (tip, değer, çocuk sayısı) kolonları
+    node_types = array('I')
+    node_values = array('I')
+    node_child_counts = array('I')
+    stack = [ast] if ast is not None else []
+    while stack:
+        node = stack.pop()
+        node_types.append(intern(node.type))
+        node_values.append(NO_STRING if node.value is None else intern(str(node.value)))
+        node_child_counts.append(len(node.children))
+        stack.extend(reversed(node.children))
+
+    # Identifier tablosu; token'ların symbol id'leri bu sırayla geçerli
+    symbol_strings = array('I', [intern(name) for name in tokens.symbol_table.names[1:]])
+    error_strings = array('I', [intern(error) for error in errors])
+    positions = array('q', [-1 if position is None else position for position in error_positions])
+
+    encoded = [string.encode('utf-8', 'surrogatepass') for string in strings]
+    string_lengths = array('I', [len(data) for data in encoded])
+    blob = b''.join(encoded)
+
+    parts = []
+    for column in (tokens.types, tokens.starts, tokens.lengths, tokens.lines, tokens.columns,
+                   tokens.symbols, node_types, node_values, node_child_counts, symbol_strings,
+                   string_lengths, error_strings, positions):
+        parts.append(column.tobytes())
+    parts.append(blob)
+    payload = b''.join(parts)
+
+    header = HEADER.pack(CACHE_MAGIC, 1 if success else 0, len(tokens), len(node_types),
+                         len(symbol_strings), len(strings), len(errors), len(blob), bytes(PAYLOAD_DIGEST_SIZE))
+    fields = header[:HEADER_FIELDS_SIZE]
+    return fields + payload_digest(fields, payload) + payload
+
+
+def payload_digest(fields, payload):
+    # Token kolonlarındaki bozulma index kontrolleriyle yakalanamaz; digest yakalar
+    digest = hashlib.blake2b(fields, digest_size=PAYLOAD_DIGEST_SIZE)
+    digest.update(payload)
+    return digest.digest()
+
+
+def check_indices(column, limit, what, skip=None):
+    # Kolondaki her index limit'ten küçük olmalı (skip değeri hariç)
+    if skip is not None:
+        column = [index for index in column if index != skip]
+    if column and max(column) >= limit:
+        raise ValueError(f"{what} index out of range in cache entry")
+
+
+def decode_analysis(data, source_code):
+    # Dönüş: (success, tokens, ast, errors, error_positions); bozuk veride ValueError
+    if len(data) < HEADER.size:
+        raise ValueError("truncated cache entry")
+    (magic, success, token_count, node_count, symbol_count, string_count, error_count,
+     blob_length, digest) = HEADER.unpack_from(data)
+    if magic != CACHE_MAGIC:
+        raise ValueError("not an analysis cache entry")
+    if payload_digest(data[:HEADER_FIELDS_SIZE], memoryview(data)[HEADER.size:]) != digest:
+        raise ValueError("cache entry digest mismatch")
+
+    offset = HEADER.size
+
+    def read_column(typecode, count):
+        nonlocal offset
+        column = array(typecode)
+        size = count * column.itemsize
+        if offset + size > len(data):
+            raise ValueError("truncated cache entry")
+        column.frombytes(data[offset:offset + size])
+        offset += size
+        return column
+
+    tokens = TokenTable(source_code)
+    tokens.types = read_column('H', token_count)
+    tokens.starts = read_column('I', token_count)
+    tokens.lengths = read_column('I', token_count)
+    tokens.lines = read_column('I', token_count)
+    tokens.columns = read_column('I', token_count)
+    tokens.symbols = read_column('I', token_count)
+    node_types = read_column('I', node_count)
+    node_values = read_column('I', node_count)
+    node_child_counts = read_column('I', node_count)
+    symbol_strings = read_column('I', symbol_count)
+    string_lengths = read_column('I', string_count)
+    error_strings = read_column('I', error_count)
+    positions = read_column('q', error_count)
+
+    if offset + blob_length != len(data):
+        raise ValueError("cache entry size mismatch")
+
+    # Digest tutsa da index'ler kullanılmadan önce sınırlarına göre kontrol edilir
+    if token_count and max(map(add, tokens.starts, tokens.lengths)) > len(source_code):
+        raise ValueError("token outside the source in cache entry")
+    check_indices(tokens.types, len(TOKEN_TYPES), "token type")
+    check_indices([symbol for code, symbol in zip(tokens.types, tokens.symbols) if code == IDENTIFIER_CODE],
+                  symbol_count + 1, "symbol")
+    check_indices([symbol for code, symbol in zip(tokens.types, tokens.symbols) if code == KEYWORD_CODE],
+                  len(KEYWORD_SPELLINGS), "keyword")
+    check_indices(node_types, string_count, "node type")
+    check_indices(node_values, string_count, "node value", skip=NO_STRING)
+    check_indices(symbol_strings, string_count, "symbol string")
+    check_indices(error_strings, string_count, "error string")
+
+    strings = []
+    for length in string_lengths:
+        strings.append(data[offset:offset + length].decode('utf-8', 'surrogatepass'))
+        offset += length
+
+    symbol_table = SymbolTable()
+    for index in symbol_strings:
+        symbol_table.intern(strings[index])
+    if len(symbol_table) != symbol_count:
+        raise ValueError("duplicate symbol in cache entry")
+    tokens.symbol_table = symbol_table
+
+    # Preorder kolonlarından ağacı iterative kur
+    ast = None
+    pending = []  # (node, kalan çocuk sayısı)
+    for type_index, value_index, child_count in zip(node_types, node_values, node_child_counts):
+        node = ASTNode(strings[type_index], None if value_index == NO_STRING else strings[value_index])
+        if pending:
+            parent = pending[-1]
+            parent[0].children.append(node)
+            parent[1] -= 1
+            if parent[1] == 0:
+                pending.pop()
+        elif ast is None:
+            ast = node
+        else:
+            raise ValueError("extra AST nodes in cache entry")
+        if child_count:
+            pending.append([node, child_count])
+    if pending:
+        raise ValueError("incomplete AST in cache entry")
+
+    errors = [strings[index] for index in error_strings]
+    error_positions = [None if position < 0 else position for position in positions]
+    return bool(success), tokens, ast, errors, error_positions
+
+
+class AnalysisCache:
+    # Her kayıt directory altında <hash>.cac dosyası. Okunan kaydın mtime'ı
+    # güncellenir; evict() toplam boyut max_bytes'ı aşarsa en eski kayıtları siler.
+    # Yazma temp dosya + os.replace ile atomik, paralel worker'lar güvenle paylaşır.
+
+    def __init__(self, directory, max_bytes=DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key_for(self, source_code):
+        digest = hashlib.blake2b(CACHE_KEY_PREFIX, digest_size=20)
+        digest.update(source_code.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def load(self, key, source_code):
+        path = self.path_for(key)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            entry = decode_analysis(data, source_code)
+        except Exception:
+            # Bozuk kayıt miss sayılır; analiz sonrası store() üzerine yazar
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU için son kullanım zamanı
+        except OSError:
+            pass
+        self.hits += 1
+        return entry
+
+    def store(self, key, success, tokens, ast, errors, error_positions):
+        path = self.path_for(key)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_path, 'wb') as file:
+                file.write(encode_analysis(success, tokens, ast, errors, error_positions))
+            os.replace(temporary_path, path)
+        except OSError:
+            # Cache yazılamazsa analiz sonucu yine geçerli
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+
+    def evict(self):
+        # Toplam boyut max_bytes altına inene kadar en uzun süre kullanılmayanları sil
+        entries = []
+        total_size = 0
+        with os.scandir(self.directory) as iterator:
+            for entry in iterator:
+                if not entry.name.endswith(CACHE_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            removed += 1
+        return removed
@@ -0,0 +1,234 @@
+# Analiz ve highlighting fazları için süre ve sayaç ölçümü
+#
+# Her analiz sonucu bir AnalysisMetrics taşır: lex, parse, report, format_clear,
+# format_apply gibi fazların süreleri ve token/node/hata sayıları. Ölçüm
+# kapalıyken DISABLED_METRICS kullanılır; phase() paylaşılan boş bir context
+# manager döndürür, böylece kapalı ölçümün maliyeti birkaç method çağrısıdır.
+
+import json
+import math
+import time
+from contextlib import nullcontext
+
+# Status bar ve trace'te fazların sırası
+PHASE_ORDER = ('cache', 'lex', 'parse', 'report', 'format_clear', 'format_apply')
+
+
+class PhaseTimer:
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.metrics.add_duration(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class AnalysisMetrics:
+    enabled = True
+
+    def __init__(self):
+        self.durations = {}  # faz -> saniye
+        self.counts = {}
+
+    def phase(self, name):
+        return PhaseTimer(self, name)
+
+    def add_duration(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def set_count(self, name, value):
+        self.counts[name] = value
+
+    def total(self):
+        return sum(self.durations.values())
+
+    def ordered_phases(self):
+        phases = [name for name in PHASE_ORDER if name in self.durations]
+        phases.extend(sorted(name for name in self.durations if name not in PHASE_ORDER))
+        return phases
+
+    def summary(self):
+        # "lex 1.2 ms | parse 3.4 ms | ... | 1234 tokens, 567 nodes, 2 errors"
+        parts = [f"{name} {self.durations[name] * 1000:.1f} ms" for name in self.ordered_phases()]
+        counts = [f"{value} {name}" for name, value in self.counts.items()]
+        if counts:
+            parts.append(', '.join(counts))
+        return ' | '.join(parts)
+
+    def to_record(self):
+        return {
+            'time': time.time(),
+            'durations_ms': {name: round(self.durations[name] * 1000, 3) for name in self.ordered_phases()},
+            'total_ms': round(self.total() * 1000, 3),
+            'counts': dict(self.counts),
+        }
+
+
+class DisabledMetrics:
+    # Ölçüm kapalıyken aynı arayüz, hiçbir şey kaydetmez
+    enabled = False
+    durations = {}
+    counts = {}
+
+    def phase(self, name):
+        return NULL_PHASE
+
+    def add_duration(self, name, seconds):
+        pass
+
+    def set_count(self, name, value):
+        pass
+
+    def total(self):
+        return 0.0
+
+    def summary(self):
+        return ''
+
+
+NULL_PHASE = nullcontext()
+DISABLED_METRICS = DisabledMetrics()
+
+
+class MetricsTrace:
+    # Her ölçümü JSON Lines dosyasının sonuna ekler; dosya ilk kayıtta açılır
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def write(self, metrics, **fields):
+        record = metrics.to_record()
+        record.update(fields)
+        try:
+            if self.file is None:
+                self.file = open(self.path, 'a', encoding='utf-8')
+            self.file.write(json.dumps(record) + '\n')
+            self.file.flush()
+        except OSError as e:
+            print(f"Metrics trace error: {e}")
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+# Keystroke -> boyama gecikmesi histogram aralıkları (ms, üst sınırlar)
+LATENCY_BUCKETS_MS = (8, 16, 33, 50, 100, 200, 500, 1000)
+
+
+def percentile(sorted_values, fraction):
+    # Nearest-rank percentile: ceil(fraction * n)'inci değer. round(), 0.07 * 100 gibi
+    # float hatalarının bir üst sıraya taşmasını engeller.
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(round(fraction * len(sorted_values), 9))
+    index = max(0, min(len(sorted_values) - 1, rank - 1))
+    return sorted_values[index]
+
+
+class LatencyTracer:
+    # Editördeki her metin değişikliğinin renkleri doğru boyanana kadar geçen
+    # süre. Aşamalar: textChanged -> debounce timer -> analiz bitişi -> format
+    # uygulaması. Boyanmayı bekleyen keystroke'lar aynı render'da kapanır.
+
+    def __init__(self, initial_text=''):
+        self.pending = []  # (revision, zaman) boyanmayı bekleyen keystroke'lar
+        self.debounce_time = None
+        self.analysis_time = None
+        self.samples = []  # keystroke başına (toplam, debounce, analiz, format) saniye
+        # Replay harness'ı için oturumun edit kaydı
+        self.initial_text = initial_text
+        self.edits = []
+        self.last_edit_time = time.perf_counter()
+
+    def keystroke(self, revision, position, removed, text):
+        now = time.perf_counter()
+        self.pending.append((revision, now))
+        self.edits.append({'delay_ms': round((now - self.last_edit_time) * 1000, 3),
+                           'position': position, 'removed': removed, 'text': text})
+        self.last_edit_time = now
+
+    def debounce_fired(self):
+        self.debounce_time = time.perf_counter()
+
+    def analysis_finished(self):
+        self.analysis_time = time.perf_counter()
+
+    def painted(self, revision):
+        # revision'a kadarki tüm keystroke'ların renkleri artık doğru
+        if not self.pending:
+            return
+        now = time.perf_counter()
+        fired = self.debounce_time if self.debounce_time is not None else now
+        finished = self.analysis_time if self.analysis_time is not None else fired
+        remaining = []
+        for pending_revision, start in self.pending:
+            if pending_revision > revision:
+                remaining.append((pending_revision, start))
+                continue
+            self.samples.append((now - start, max(0.0, fired - start),
+                                 max(0.0, finished - fired), max(0.0, now - finished)))
+        self.pending = remaining
+        self.debounce_time = None
+        self.analysis_time = None
+
+    def histogram(self):
+        # [(etiket, sayı)]: "<8 ms", "8-16 ms", ..., ">=1000 ms"
+        counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        for sample in self.samples:
+            milliseconds = sample[0] * 1000
+            index = 0
+            while index < len(LATENCY_BUCKETS_MS) and milliseconds >= LATENCY_BUCKETS_MS[index]:
+                index += 1
+            counts[index] += 1
+        labels = [f"<{LATENCY_BUCKETS_MS[0]} ms"]
+        labels.extend(f"{low}-{high} ms" for low, high in zip(LATENCY_BUCKETS_MS, LATENCY_BUCKETS_MS[1:]))
+        labels.append(f">={LATENCY_BUCKETS_MS[-1]} ms")
+        return list(zip(labels, counts))
+
+    def stage_percentiles(self, index):
+        values = sorted(sample[index] * 1000 for sample in self.samples)
+        return {'p50': percentile(values, 0.50), 'p90': percentile(values, 0.90),
+                'p99': percentile(values, 0.99), 'max': values[-1] if values else 0.0}
+
+    def to_record(self):
+        return {
+            'keystrokes': len(self.samples),
+            'unpainted': len(self.pending),
+            'total_ms': self.stage_percentiles(0),
+            'debounce_ms': self.stage_percentiles(1),
+            'analysis_ms': self.stage_percentiles(2),
+            'format_ms': self.stage_percentiles(3),
+            'histogram': dict(self.histogram()),
+        }
+
+    def summary(self):
+        total = self.stage_percentiles(0)
+        return (f"{len(self.samples)} keystrokes | p50 {total['p50']:.1f} ms | "
+                f"p90 {total['p90']:.1f} ms | p99 {total['p99']:.1f} ms")
+
+    def report(self):
+        lines = [f"Keystroke-to-paint latency: {self.summary()}"]
+        for index, stage in enumerate(('total', 'debounce', 'analysis', 'format')):
+            values = self.stage_percentiles(index)
+            lines.append(f"  {stage:9} p50 {values['p50']:8.1f} ms  p90 {values['p90']:8.1f} ms  "
+                         f"max {values['max']:8.1f} ms")
+        histogram = self.histogram()
+        largest = max([count for _, count in histogram] + [1])
+        for label, count in histogram:
+            lines.append(f"  {label:>12} {count:6} {'#' * round(40 * count / largest)}")
+        return '\n'.join(lines)
+
+    def session(self):
+        # Replay harness'ının okuduğu biçim: başlangıç metni + zamanlı edit'ler
+        return {'initial_text': self.initial_text, 'edits': self.edits, 'latency': self.to_record()}
@@ -0,0 +1,107 @@
+# Bilgi paneli için token listesi ve parse tree modelleri
+#
+# Modeller analiz sonucundaki token tablosunu ve AST'yi doğrudan gösterir;
+# metin sadece view'ın istediği (görünen) satırlar için üretilir ve yeni
+# sonuç gelince model sadece referansı değiştirir.
+
+from PyQt6.QtCore import QAbstractItemModel, QAbstractListModel, QModelIndex, Qt
+
+from c_lexer_base import TokenType
+
+
+class TokenListModel(QAbstractListModel):
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tokens = []
+        self.token_count = 0
+
+    def set_tokens(self, tokens):
+        self.beginResetModel()
+        self.tokens = tokens if tokens is not None else []
+        # Sondaki EOF token'ı listelenmez
+        self.token_count = len(self.tokens)
+        if self.token_count and self.tokens[self.token_count - 1].type == TokenType.EOF:
+            self.token_count -= 1
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.token_count
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self.token_count:
+            return None
+
+        token = self.tokens[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            # Çok satırlı yorum/string'ler tek satırda gösterilsin
+            value = token.value.replace('\n', '\\n')
+            return f"{token.type.name}: {value}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"Line {token.line}, column {token.column}"
+        return None
+
+
+class ParseTreeModel(QAbstractItemModel):
+    # Her index'in internalPointer'ı bir ASTNode'dur. parent() için node ->
+    # (parent node, parent'ın satırı) eşlemesi index üretildikçe doldurulur,
+    # böylece sadece açılan dallar gezilir.
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.ast = None
+        self.parents = {}
+
+    def set_ast(self, ast):
+        self.beginResetModel()
+        self.ast = ast
+        self.parents = {}
+        self.endResetModel()
+
+    def node_of(self, index):
+        return index.internalPointer() if index.isValid() else None
+
+    def children_of(self, node):
+        if node is None:
+            return [self.ast] if self.ast is not None else []
+        return node.children
+
+    def index(self, row, column, parent=QModelIndex()):
+        if column != 0:
+            return QModelIndex()
+
+        parent_node = self.node_of(parent)
+        children = self.children_of(parent_node)
+        if not 0 <= row < len(children):
+            return QModelIndex()
+
+        child = children[row]
+        if id(child) not in self.parents:
+            self.parents[id(child)] = (parent_node, parent.row() if parent.isValid() else -1)
+        return self.createIndex(row, column, child)
+
+    def parent(self, index=QModelIndex()):
+        node = self.node_of(index)
+        if node is None:
+            return QModelIndex()
+
+        parent_node, parent_row = self.parents.get(id(node), (None, -1))
+        if parent_node is None:
+            return QModelIndex()
+        return self.createIndex(parent_row, 0, parent_node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.children_of(self.node_of(parent)))
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        node = self.node_of(index)
+        if node is None or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return str(node)
@@ -0,0 +1,99 @@
+# Ölçülen analiz maliyetine göre debounce süresini seçen zamanlayıcı
+#
+# Editör her analiz (perform_analysis) ve render süresini doküman boyutuyla
+# birlikte kaydeder. Boyut kovası (2'nin kuvvetleri) başına maliyetlerin
+# üssel ortalaması tutulur; yeni bir boyut için en yakın kova boyut oranıyla
+# ölçeklenir. Tahmini maliyet gecikme bütçesinin yarısına sığıyorsa analiz
+# hemen başlar; sığmıyorsa tam analiz yazmaya ara verilene kadar ertelenir.
+# Renkler bu gecikmeyi beklemez, editörün lexing-only geçişiyle hemen uygulanır.
+
+import time
+
+DEFAULT_LATENCY_BUDGET_MS = 100
+DEFAULT_DEBOUNCE_MS = 100  # Henüz ölçüm yokken (eski sabit gecikme)
+MAX_DEBOUNCE_MS = 1000
+TYPING_PAUSE = 1.0  # saniye; daha uzun aralıklar yazma hızına katılmaz
+COST_SMOOTHING = 0.3
+TYPING_SMOOTHING = 0.3
+
+
+class AnalysisCostModel:
+
+    def __init__(self, smoothing=COST_SMOOTHING):
+        self.smoothing = smoothing
+        self.buckets = {}  # size.bit_length() -> (ortalama boyut, ortalama süre)
+
+    def record(self, size, seconds):
+        bucket = size.bit_length()
+        previous = self.buckets.get(bucket)
+        if previous is None:
+            self.buckets[bucket] = (size, seconds)
+        else:
+            previous_size, previous_seconds = previous
+            self.buckets[bucket] = (previous_size + self.smoothing * (size - previous_size),
+                                    previous_seconds + self.smoothing * (seconds - previous_seconds))
+
+    def predict(self, size):
+        # Ölçüm yoksa None
+        if not self.buckets:
+            return None
+        bucket = size.bit_length()
+        nearest = min(self.buckets, key=lambda other: abs(other - bucket))
+        bucket_size, seconds = self.buckets[nearest]
+        if nearest == bucket or bucket_size <= 0:
+            return seconds
+        return seconds * size / bucket_size
+
+
+class DebounceScheduler:
+
+    def __init__(self, latency_budget_ms=DEFAULT_LATENCY_BUDGET_MS, max_delay_ms=MAX_DEBOUNCE_MS):
+        self.latency_budget_ms = latency_budget_ms
+        self.max_delay_ms = max_delay_ms
+        self.analysis_cost = AnalysisCostModel()  # istekten sonucun gelmesine kadar
+        self.render_cost = AnalysisCostModel()  # sonucun editöre uygulanması (GUI thread)
+        self.typing_interval = None  # keystroke aralıklarının üssel ortalaması (saniye)
+        self.last_keystroke = None
+
+    def keystroke(self):
+        now = time.perf_counter()
+        if self.last_keystroke is not None:
+            interval = now - self.last_keystroke
+            if interval < TYPING_PAUSE:
+                if self.typing_interval is None:
+                    self.typing_interval = interval
+                else:
+                    self.typing_interval += TYPING_SMOOTHING * (interval - self.typing_interval)
+        self.last_keystroke = now
+
+    def record_analysis(self, size, seconds):
+        self.analysis_cost.record(size, seconds)
+
+    def record_render(self, size, seconds):
+        self.render_cost.record(size, seconds)
+
+    def predicted_cost(self, size):
+        # Saniye; ölçüm yoksa None
+        analysis = self.analysis_cost.predict(size)
+        if analysis is None:
+            return None
+        render = self.render_cost.predict(size)
+        return analysis + (render or 0.0)
+
+    def plan(self, size):
+        # Tam analiz (lex + parse) için debounce süresi, ms
+        cost = self.predicted_cost(size)
+        if cost is None:
+            return DEFAULT_DEBOUNCE_MS
+
+        cost_ms = cost * 1000
+        if cost_ms <= self.latency_budget_ms / 2:
+            # Ucuz: beklemeden analiz et, sonuç bütçe içinde boyanır
+            return 0
+
+        # Pahalı: yazma sürerken tam analiz başlamasın; en az bir analiz süresi
+        # ve yazma aralığının 1.5 katı kadar ara bekle
+        delay_ms = cost_ms
+        if self.typing_interval is not None:
+            delay_ms = max(delay_ms, self.typing_interval * 1500)
+        return int(min(delay_ms, self.max_delay_ms))
@@ -0,0 +1,226 @@
+# Kaynak ağaçları için komut satırı toplu analiz aracı (PyQt gerektirmez)
+#
+# Kullanım:
+#   python batch_analyzer.py src/ include/ --jobs 8 --output results.jsonl
+#
+# Her dosya için bir JSON satırı yazılır; throughput özeti stderr'e basılır.
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import nullcontext
+from functools import partial
+from multiprocessing import Pool
+
+from c_lexer_base import TOKEN_TYPES
+from c_lexer_main import DEFAULT_CHUNK_SIZE, iter_tokens
+from analysis_cache import DEFAULT_CACHE_SIZE, AnalysisCache
+from parser import ASTNode, CodeAnalyzer
+
+SOURCE_EXTENSIONS = ('.c', '.h')
+
+
+def find_source_files(roots, extensions=SOURCE_EXTENSIONS):
+    # Verilen dizinleri gez, .c/.h dosyalarını sıralı döndür
+    paths = []
+    for root in roots:
+        if os.path.isfile(root):
+            paths.append(root)
+            continue
+        for directory, subdirectories, filenames in os.walk(root):
+            subdirectories.sort()
+            for filename in sorted(filenames):
+                if filename.endswith(extensions):
+                    paths.append(os.path.join(directory, filename))
+    return paths
+
+
+def summarize_ast(ast):
+    # AST'yi iterative gez; node tipi sayıları ve fonksiyon isimleri
+    if ast is None:
+        return None
+
+    node_counts = {}
+    functions = []
+    max_depth = 0
+    stack = [(ast, 0)]
+    while stack:
+        node, depth = stack.pop()
+        node_counts[node.type] = node_counts.get(node.type, 0) + 1
+        if depth > max_depth:
+            max_depth = depth
+        if node.type == "Function":
+            functions.append(node.value)
+        for child in node.children:
+            if isinstance(child, ASTNode):
+                stack.append((child, depth + 1))
+
+    return {
+        'nodes': sum(node_counts.values()),
+        'depth': max_depth,
+        'top_level': len(ast.children),
+        'node_counts': node_counts,
+        'functions': functions,
+    }
+
+
+def lex_file(path, chunk_size):
+    # Dosyayı token listesi kurmadan chunk chunk lexle (bounded memory)
+    start_time = time.perf_counter()
+    token_count = 0
+    token_counts = {}
+    errors = []
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace', newline='') as file:
+            for token in iter_tokens(file, chunk_size):
+                token_count += 1
+                token_counts[token.type.name] = token_counts.get(token.type.name, 0) + 1
+        size = os.path.getsize(path)
+    except OSError as e:
+        return {'path': path, 'success': False, 'bytes': 0, 'errors': [f"Read error: {str(e)}"]}
+
+    if 'ERROR' in token_counts:
+        errors.append(f"Lexical errors: {token_counts['ERROR']}")
+
+    # Tam analizdeki gibi success dosyanın işlendiğini gösterir; lexical
+    # hatalar errors'ta listelenir
+    return {
+        'path': path,
+        'success': True,
+        'bytes': size,
+        'tokens': token_count,
+        'token_counts': token_counts,
+        'ast': None,
+        'errors': errors,
+        'seconds': round(time.perf_counter() - start_time, 6),
+    }
+
+
+def analyze_file(path, lex_only=False, chunk_size=None, parse_jobs=1, cache_directory=None,
+                 cache_size=DEFAULT_CACHE_SIZE):
+    if lex_only:
+        return lex_file(path, chunk_size or DEFAULT_CHUNK_SIZE)
+
+    start_time = time.perf_counter()
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+    except OSError as e:
+        return {'path': path, 'success': False, 'bytes': 0, 'errors': [f"Read error: {str(e)}"]}
+
+    cache = AnalysisCache(cache_directory, cache_size) if cache_directory else None
+    analyzer = CodeAnalyzer(parse_jobs=parse_jobs, cache=cache)
+    success = analyzer.analyze(data.decode('utf-8', errors='replace'))
+
+    token_counts = {TOKEN_TYPES[type_code].name: count
+                    for type_code, count in Counter(analyzer.tokens.types).items()}
+
+    record = {
+        'path': path,
+        'success': success,
+        'bytes': len(data),
+        'tokens': len(analyzer.tokens),
+        'token_counts': token_counts,
+        'ast': summarize_ast(analyzer.ast),
+        'errors': analyzer.get_errors(),
+        'seconds': round(time.perf_counter() - start_time, 6),
+    }
+    if cache is not None:
+        record['cached'] = cache.hits > 0
+    return record
+
+
+def run_batch(paths, output, jobs=None, chunksize=4, lex_only=False, read_chunk_size=None,
+              parse_jobs=1, cache_directory=None, cache_size=DEFAULT_CACHE_SIZE):
+    # Dosyaları process pool'a dağıt, sonuçları kaynak sırasıyla JSON Lines yaz.
+    # parse_jobs != 1 ise dosyalar sırayla işlenir ve her dosyanın parse'ı
+    # kendi pool'unda paralelleşir (pool worker'ları yeni process açamaz)
+    worker = partial(analyze_file, lex_only=lex_only, chunk_size=read_chunk_size,
+                     parse_jobs=parse_jobs, cache_directory=cache_directory, cache_size=cache_size)
+    file_count = 0
+    cache_hits = 0
+    total_bytes = 0
+    error_count = 0
+    start_time = time.perf_counter()
+
+    use_pool = parse_jobs == 1 or lex_only
+    with Pool(processes=jobs) if use_pool else nullcontext() as pool:
+        if use_pool:
+            records = pool.imap(worker, paths, chunksize=chunksize)
+        else:
+            records = map(worker, paths)
+        for record in records:
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            file_count += 1
+            total_bytes += record['bytes']
+            error_count += len(record['errors'])
+            cache_hits += record.get('cached', False)
+
+    # LRU eviction tek seferde, tüm worker'lar bittikten sonra
+    if cache_directory and not lex_only:
+        AnalysisCache(cache_directory, cache_size).evict()
+
+    elapsed = time.perf_counter() - start_time
+    return {
+        'files': file_count,
+        'bytes': total_bytes,
+        'errors': error_count,
+        'cache_hits': cache_hits,
+        'seconds': elapsed,
+        'files_per_second': file_count / elapsed if elapsed else 0.0,
+        'mb_per_second': total_bytes / (1024 * 1024) / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(description='Analyze C source trees and emit JSON Lines.')
+    argument_parser.add_argument('paths', nargs='+', help='source directories or files')
+    argument_parser.add_argument('-j', '--jobs', type=int, default=None,
+                                 help='worker process count (default: CPU count)')
+    argument_parser.add_argument('-o', '--output', default='-',
+                                 help='JSON Lines output file (default: stdout)')
+    argument_parser.add_argument('--chunksize', type=int, default=4,
+                                 help='files handed to a worker at a time')
+    argument_parser.add_argument('--lex-only', action='store_true',
+                                 help='stream tokens only (no parse); memory stays bounded on huge files')
+    argument_parser.add_argument('--read-chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                                 help='characters read per chunk in --lex-only mode')
+    argument_parser.add_argument('--parse-jobs', type=int, default=1,
+                                 help='parse each file\'s functions in parallel with this many processes '
+                                      '(0: CPU count); files are then handled one at a time')
+    argument_parser.add_argument('--cache-dir', default=None,
+                                 help='reuse analysis results of unchanged files from this directory')
+    argument_parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE // (1024 * 1024),
+                                 help='cache size limit in MB; least recently used entries are evicted')
+    args = argument_parser.parse_args(argv)
+
+    paths = find_source_files(args.paths)
+
+    options = {
+        'jobs': args.jobs,
+        'chunksize': args.chunksize,
+        'lex_only': args.lex_only,
+        'read_chunk_size': args.read_chunk_size,
+        'parse_jobs': args.parse_jobs or None,
+        'cache_directory': args.cache_dir,
+        'cache_size': args.cache_size * 1024 * 1024,
+    }
+    if args.output == '-':
+        stats = run_batch(paths, sys.stdout, **options)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            stats = run_batch(paths, output, **options)
+
+    print(f"Analyzed {stats['files']} files ({stats['bytes'] / (1024 * 1024):.2f} MB) "
+          f"in {stats['seconds']:.2f}s: {stats['files_per_second']:.1f} files/s, "
+          f"{stats['mb_per_second']:.2f} MB/s, {stats['errors']} errors, "
+          f"{stats['cache_hits']} cache hits",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+# Benchmark'lar için deterministik sentetik C corpus üreticisi
+#
+# Aynı (boyut, varyant, seed) her zaman aynı metni üretir; böylece farklı
+# revision'ların sonuçları karşılaştırılabilir. Metin bütün birimlerden
+# oluşur, boyut istenen değere yuvarlanır (kesilmiş token kalmaz).
+#
+#   mixed     her statement ve expression türünden, az yorum
+#   comments  uzun // ve /* */ blokları arasında küçük fonksiyonlar
+#   strings   escape'li uzun string ve karakter literal'leri
+#   nested    iç içe block'lar ve derin parantezli expression'lar
+
+import random
+
+VARIANTS = ('mixed', 'comments', 'strings', 'nested')
+
+TYPES = ('int', 'float', 'char', 'double')
+BINARY_OPERATORS = ('+', '-', '*', '/', '%', '<<', '>>', '&', '|', '^', '&&', '||',
+                    '==', '!=', '<', '<=', '>', '>=')
+WORDS = ('value', 'buffer', 'count', 'index', 'result', 'state', 'offset', 'length',
+         'token', 'node', 'table', 'cursor', 'limit', 'flag')
+
+
+def identifier(rng):
+    return f"{rng.choice(WORDS)}_{rng.randint(0, 99)}"
+
+
+def expression(rng, depth=0):
+    # Rastgele ama her zaman geçerli bir expression
+    if depth > 3 or rng.random() < 0.3:
+        choice = rng.random()
+        if choice < 0.5:
+            return identifier(rng)
+        if choice < 0.8:
+            return str(rng.randint(0, 1000))
+        return f"{rng.randint(0, 99)}.{rng.randint(0, 99)}"
+
+    choice = rng.random()
+    if choice < 0.6:
+        return f"{expression(rng, depth + 1)} {rng.choice(BINARY_OPERATORS)} {expression(rng, depth + 1)}"
+    if choice < 0.75:
+        return f"({expression(rng, depth + 1)})"
+    if choice < 0.85:
+        return f"{identifier(rng)}[{expression(rng, depth + 1)}]"
+    if choice < 0.95:
+        arguments = ', '.join(expression(rng, depth + 1) for _ in range(rng.randint(0, 3)))
+        return f"{identifier(rng)}({arguments})"
+    return f"!{expression(rng, depth + 1)}"
+
+
+def statement(rng, indent):
+    pad = '    ' * indent
+    choice = rng.random()
+    if choice < 0.35:
+        return f"{pad}{identifier(rng)} = {expression(rng)};\n"
+    if choice < 0.55:
+        return f"{pad}{rng.choice(TYPES)} {identifier(rng)} = {expression(rng)};\n"
+    if choice < 0.7:
+        return (f"{pad}if ({expression(rng)}) {{\n{statement(rng, indent + 1)}{pad}}} else {{\n"
+                f"{statement(rng, indent + 1)}{pad}}}\n")
+    if choice < 0.8:
+        loop = identifier(rng)
+        return (f"{pad}for (int {loop} = 0; {loop} < {rng.randint(1, 64)}; {loop} = {loop} + 1) {{\n"
+                f"{statement(rng, indent + 1)}{pad}}}\n")
+    if choice < 0.9:
+        return f"{pad}while ({expression(rng)}) {{\n{statement(rng, indent + 1)}{pad}}}\n"
+    return f"{pad}{identifier(rng)}({expression(rng)}, {expression(rng)});\n"
+
+
+def function(rng, index, body):
+    parameters = ', '.join(f"{rng.choice(TYPES)} {identifier(rng)}" for _ in range(rng.randint(0, 3)))
+    return (f"{rng.choice(TYPES)} function_{index}({parameters}) {{\n{body}"
+            f"    return {expression(rng)};\n}}\n\n")
+
+
+def mixed_unit(rng, index):
+    header = ''
+    if index % 8 == 0:
+        header = f"#include <stdio.h>\n#define LIMIT_{index} {rng.randint(1, 512)}\n"
+    body = ''.join(statement(rng, 1) for _ in range(rng.randint(3, 8)))
+    return (f"{header}// function {index}\n"
+            f"{rng.choice(TYPES)} global_{index}[{rng.randint(1, 64)}];\n"
+            f"{function(rng, index, body)}")
+
+
+def comments_unit(rng, index):
+    lines = [f" * {' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 12)))}"
+             for _ in range(rng.randint(4, 16))]
+    block = "/*\n" + '\n'.join(lines) + "\n */\n"
+    line_comments = ''.join(f"// {' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 10)))}\n"
+                            for _ in range(rng.randint(2, 8)))
+    body = ''.join(f"    {identifier(rng)} = {expression(rng)}; /* {rng.choice(WORDS)} */\n"
+                   for _ in range(rng.randint(1, 3)))
+    return block + line_comments + function(rng, index, body)
+
+
+def string_literal(rng):
+    parts = []
+    for _ in range(rng.randint(4, 24)):
+        choice = rng.random()
+        if choice < 0.15:
+            parts.append(rng.choice(('\\n', '\\t', '\\"', '\\\\', '%d', '%s')))
+        else:
+            parts.append(rng.choice(WORDS))
+    return '"' + ' '.join(parts) + '"'
+
+
+def strings_unit(rng, index):
+    lines = []
+    for _ in range(rng.randint(3, 10)):
+        if rng.random() < 0.2:
+            lines.append(f"    char {identifier(rng)} = '{rng.choice(('a', 'z', '0', chr(92) + 'n', chr(92) + chr(39)))}';\n")
+        else:
+            arguments = ', '.join(string_literal(rng) for _ in range(rng.randint(1, 3)))
+            lines.append(f"    printf({arguments});\n")
+    return function(rng, index, ''.join(lines))
+
+
+def nested_unit(rng, index):
+    # Block derinliği parser'ın statement recursion limitinin altında kalır
+    depth = rng.randint(8, 30)
+    opening = []
+    closing = []
+    for level in range(depth):
+        pad = '    ' * (level + 1)
+        condition = expression(rng)
+        opening.append(f"{pad}{rng.choice(('if', 'while'))} ({condition}) {{\n")
+        closing.append(f"{pad}}}\n")
+    innermost = '    ' * (depth + 1)
+    parens = rng.randint(20, 200)
+    deep_expression = '(' * parens + expression(rng) + ')' * parens
+    body = (''.join(opening) + f"{innermost}{identifier(rng)} = {deep_expression};\n" +
+            ''.join(reversed(closing)))
+    return function(rng, index, body)
+
+
+UNIT_BUILDERS = {
+    'mixed': mixed_unit,
+    'comments': comments_unit,
+    'strings': strings_unit,
+    'nested': nested_unit,
+}
+
+
+def generate_corpus(size, variant='mixed', seed=0):
+    """En az size karakterlik (en yakın bütün birime yuvarlanmış) C kaynağı üret"""
+    builder = UNIT_BUILDERS.get(variant)
+    if builder is None:
+        raise ValueError(f"Unknown corpus variant: {variant}")
+
+    rng = random.Random(f"{variant}:{seed}")
+    parts = []
+    total = 0
+    index = 0
+    while total < size:
+        unit = builder(rng, index)
+        parts.append(unit)
+        total += len(unit)
+        index += 1
+    return ''.join(parts)
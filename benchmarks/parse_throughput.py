@@ -0,0 +1,78 @@
+# CParser micro-benchmark: sabit bir corpus üzerinde saniyede parse edilen token
+#
+# Kullanım:
+#   python benchmarks/parse_throughput.py --units 3000 --repeat 5
+#
+# Lex süresi ölçüme dahil değildir; token tablosu bir kez üretilir ve her
+# tekrarda yeni bir CParser ile parse edilir. En iyi tekrar raporlanır.
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from c_lexer_main import CLexer
+from parser import CParser
+
+# Parser'ın tüm statement ve expression yollarından geçen sabit bir birim
+CORPUS_UNIT = '''#include <stdio.h>
+/* unit %(index)d */
+int table_%(index)d[16];
+float scale_%(index)d = 2.5;
+
+int compute_%(index)d(int a, int b, char c) {
+    int total = 0;
+    // loop over the inputs
+    for (int i = 0; i < a; i = i + 1) {
+        total = total + (a * b - i) / 3 %% 7;
+        if (total >= 100 && b != 0 || !c) {
+            total = total - table_%(index)d[i %% 16] * 2;
+        } else {
+            printf("value=%%d\\n", total, a << 1, b >> 2);
+        }
+    }
+    while (b > 0) {
+        b = b - 1;
+        total = -total + ~b & 255 | a ^ c;
+    }
+    return total + compute_%(index)d(a - 1, b, c);
+}
+'''
+
+
+def build_corpus(units):
+    return ''.join(CORPUS_UNIT % {'index': index} for index in range(units))
+
+
+def measure(tokens, repeat):
+    best = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        CParser(tokens).parse_program()
+        elapsed = time.perf_counter() - start_time
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(description='Measure CParser throughput in tokens per second.')
+    argument_parser.add_argument('--units', type=int, default=3000,
+                                 help='number of generated function units in the corpus')
+    argument_parser.add_argument('--repeat', type=int, default=5,
+                                 help='parse repetitions; the fastest one is reported')
+    args = argument_parser.parse_args(argv)
+
+    source_code = build_corpus(args.units)
+    tokens = CLexer(source_code, 'regex').tokenize_table()
+    elapsed = measure(tokens, args.repeat)
+
+    print(f"{len(source_code) / (1024 * 1024):.2f} MB, {len(tokens)} tokens: "
+          f"{elapsed:.3f}s, {len(tokens) / elapsed:,.0f} tokens/s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# Kaydedilmiş bir edit dizisini offscreen editöre oynatıp keystroke -> boyama
+# gecikmesini ölçer
+#
+# Kullanım:
+#   C_HIGHLIGHTER_LATENCY=session.json python main.py      # oturumu kaydet
+#   python benchmarks/replay_latency.py session.json --output latency.json
+#   python benchmarks/replay_latency.py --synthetic --size 64KB --chars 200 --interval 40
+#
+# Edit'ler kayıttaki aralıklarla (veya --interval ile sabit aralıkla) Qt event
+# loop'u çalışırken uygulanır; debounce timer'ı, analiz thread'i ve lazy
+# highlighting gerçek uygulamadaki gibi devrededir. --sync analizi GUI
+# thread'inde yapar, sonuçlar daha tekrarlanabilir olur.
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_scheduler import DEFAULT_DEBOUNCE_MS, DEFAULT_LATENCY_BUDGET_MS
+from corpus import VARIANTS, generate_corpus
+from run_benchmarks import HIGHLIGHT_MODES, parse_size
+
+# Sentetik oturumda karakter karakter yazılan satırlar
+TYPED_TEXT = '''
+int typed_function(int value, int limit) {
+    int total = 0;
+    for (int i = 0; i < limit; i = i + 1) {
+        total = total + value * i;
+    }
+    return total;
+}
+'''
+
+
+def synthetic_session(size, variant, seed, characters, interval_ms):
+    # Corpus'un ortasına TYPED_TEXT'in ilk characters karakterini tek tek yaz
+    initial_text = generate_corpus(size, variant, seed)
+    position = initial_text.find('\n}\n', len(initial_text) // 2) + 3
+    if position < 3:
+        position = len(initial_text)
+    text = (TYPED_TEXT * (characters // len(TYPED_TEXT) + 1))[:characters]
+    edits = [{'delay_ms': interval_ms, 'position': position + offset, 'removed': 0, 'text': character}
+             for offset, character in enumerate(text)]
+    return {'initial_text': initial_text, 'edits': edits}
+
+
+def run_event_loop(application, seconds):
+    deadline = time.perf_counter() + seconds
+    while True:
+        application.processEvents()
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, 0.001))
+
+
+def apply_edit(editor, edit):
+    from PyQt6.QtGui import QTextCursor
+
+    document_end = editor.document().characterCount() - 1
+    position = min(edit['position'], document_end)
+    cursor = QTextCursor(editor.document())
+    cursor.setPosition(position)
+    cursor.setPosition(min(position + edit['removed'], document_end), QTextCursor.MoveMode.KeepAnchor)
+    cursor.insertText(edit['text'])
+    editor.setTextCursor(cursor)
+
+
+def replay(session, options):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from highlighter_text_edit import CustomSyntaxTextEditor
+
+    application = QApplication.instance() or QApplication([])
+    editor = CustomSyntaxTextEditor(highlight_mode=options.highlight_mode, use_analysis_thread=not options.sync,
+                                    latency_budget_ms=options.budget, adaptive_debounce=not options.fixed_debounce)
+    editor.resize(1000, 800)
+    editor.show()
+
+    # Başlangıç metni ölçüme dahil değil; ilk analiz ve boyama bitene kadar beklenir
+    editor.setPlainText(session['initial_text'])
+    run_event_loop(application, options.settle)
+
+    editor.set_latency_tracing(True)
+    for edit in session['edits']:
+        delay_ms = options.interval if options.interval is not None else edit['delay_ms']
+        run_event_loop(application, delay_ms / 1000)
+        apply_edit(editor, edit)
+
+    # Son keystroke'lar boyanana kadar (en fazla --settle saniye) bekle
+    deadline = time.perf_counter() + options.settle
+    while editor.latency_tracer.pending and time.perf_counter() < deadline:
+        run_event_loop(application, 0.01)
+
+    tracer = editor.set_latency_tracing(False)
+    editor.shutdown_analysis()
+    return tracer
+
+
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(description='Replay an edit session and measure keystroke-to-paint latency.')
+    argument_parser.add_argument('session', nargs='?', default=None,
+                                 help='session JSON recorded with C_HIGHLIGHTER_LATENCY=<file> python main.py')
+    argument_parser.add_argument('--synthetic', action='store_true',
+                                 help='type into a generated corpus instead of replaying a session file')
+    argument_parser.add_argument('--size', default='64KB', help='synthetic corpus size')
+    argument_parser.add_argument('--variant', choices=VARIANTS, default='mixed', help='synthetic corpus variant')
+    argument_parser.add_argument('--seed', type=int, default=0, help='synthetic corpus seed')
+    argument_parser.add_argument('--chars', type=int, default=100, help='characters typed in the synthetic session')
+    argument_parser.add_argument('--interval', type=float, default=None,
+                                 help='fixed delay between edits in ms (default: recorded delays, 50 for --synthetic)')
+    argument_parser.add_argument('--highlight-mode', choices=HIGHLIGHT_MODES, default='document',
+                                 help='editor highlight mode')
+    argument_parser.add_argument('--sync', action='store_true',
+                                 help='run the analysis on the GUI thread instead of the worker thread')
+    argument_parser.add_argument('--budget', type=float, default=DEFAULT_LATENCY_BUDGET_MS,
+                                 help='latency budget in ms for the adaptive debounce scheduler')
+    argument_parser.add_argument('--fixed-debounce', action='store_true',
+                                 help=f'use the fixed {DEFAULT_DEBOUNCE_MS} ms debounce instead of the scheduler')
+    argument_parser.add_argument('--settle', type=float, default=10.0,
+                                 help='seconds to wait for the initial and the final paint')
+    argument_parser.add_argument('-o', '--output', default=None, help='write the latency record as JSON')
+    args = argument_parser.parse_args(argv)
+
+    if args.synthetic:
+        interval = args.interval if args.interval is not None else 50.0
+        session = synthetic_session(parse_size(args.size), args.variant, args.seed, args.chars, interval)
+    elif args.session:
+        with open(args.session, encoding='utf-8') as file:
+            session = json.load(file)
+    else:
+        argument_parser.error('a session file or --synthetic is required')
+
+    tracer = replay(session, args)
+    print(tracer.report(), file=sys.stderr)
+
+    record = tracer.to_record()
+    record['highlight_mode'] = args.highlight_mode
+    record['sync'] = args.sync
+    record['budget_ms'] = None if args.fixed_debounce else args.budget
+    record['edits'] = len(session['edits'])
+    record['bytes'] = len(session['initial_text'])
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(json.dumps(record, indent=2) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,276 @@
+# Lexer, parser, rapor üretimi ve highlighting için tekrarlanabilir benchmark'lar
+#
+# Kullanım:
+#   python benchmarks/run_benchmarks.py --sizes 1KB,1MB --output before.json
+#   python benchmarks/run_benchmarks.py --sizes 1KB,1MB --output after.json --compare before.json
+#
+# Her (benchmark, varyant, boyut) için çalıştırma süreleri toplanır; p50/p99,
+# throughput (p50 üzerinden) ve ayrı bir tracemalloc çalıştırmasıyla peak
+# Python bellek kullanımı raporlanır. Highlighting benchmark'ı Qt'yi
+# offscreen platformla açar; Qt'nin C++ tarafındaki bellek ölçüme dahil değildir.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_metrics import percentile
+from corpus import VARIANTS, generate_corpus
+from c_lexer_main import LEXER_ENGINES, CLexer
+from parser import CodeAnalyzer, CParser
+
+RESULT_FORMAT_VERSION = 1
+BENCHMARKS = ('lex', 'parse', 'report', 'highlight')
+HIGHLIGHT_MODES = ('document', 'layout', 'block')
+DEFAULT_SIZES = '1KB,64KB,1MB'
+SIZE_UNITS = {'KB': 1024, 'MB': 1024 * 1024, 'B': 1}
+MAX_RUNS = 10000
+
+qt_application = None  # Highlighting benchmark'ı için tek QApplication
+
+
+def parse_size(text):
+    # "64KB", "50MB", "1024" -> karakter sayısı
+    text = text.strip().upper()
+    for suffix, factor in SIZE_UNITS.items():
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * factor)
+    return int(text)
+
+
+def format_size(size):
+    if size >= SIZE_UNITS['MB'] and size % SIZE_UNITS['MB'] == 0:
+        return f"{size // SIZE_UNITS['MB']}MB"
+    if size >= SIZE_UNITS['KB'] and size % SIZE_UNITS['KB'] == 0:
+        return f"{size // SIZE_UNITS['KB']}KB"
+    return str(size)
+
+
+def git_revision():
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def prepare_lex(source_code, options):
+    engine = options.engine
+    return lambda: CLexer(source_code, engine).tokenize_all()
+
+
+def prepare_parse(source_code, options):
+    tokens = CLexer(source_code, options.engine).tokenize_table()
+    return lambda: CParser(tokens).parse_program()
+
+
+def prepare_report(source_code, options):
+    analyzer = CodeAnalyzer(lexer_engine=options.engine)
+    analyzer.analyze(source_code)
+    return lambda: (analyzer.get_token_info(), analyzer.get_parse_info())
+
+
+def prepare_highlight(source_code, options):
+    # Analiz bir kez yapılır; ölçülen süre sonucun editöre uygulanması ve çizimi
+    global qt_application
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from highlighter_text_edit import CustomSyntaxTextEditor
+
+    if qt_application is None:
+        qt_application = QApplication.instance() or QApplication([])
+
+    editor = CustomSyntaxTextEditor(highlight_mode=options.highlight_mode, use_analysis_thread=False)
+    editor.resize(1000, 800)
+    editor.show()
+    editor.setPlainText(source_code)
+    editor.highlight_timer.stop()
+    qt_application.processEvents()
+    result = editor.analyzer.perform_analysis(source_code)
+
+    def run():
+        if options.highlight_mode == 'block':
+            editor.block_highlighter.rehighlight()
+        else:
+            # Lexing-only geçişin renkleri yok sayılır, tam renklendirme ölçülür
+            editor.lexical_lexer.invalidate()
+            editor.render_analysis_result(source_code, result)
+        editor.viewport().repaint()
+        editor.lazy_timer.stop()
+
+    return run
+
+
+PREPARERS = {
+    'lex': prepare_lex,
+    'parse': prepare_parse,
+    'report': prepare_report,
+    'highlight': prepare_highlight,
+}
+
+
+def measure(run, repeat, min_time):
+    # En az repeat çalıştırma ve toplam en az min_time saniye
+    timings = []
+    total = 0.0
+    while len(timings) < MAX_RUNS and (len(timings) < repeat or total < min_time):
+        start_time = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start_time
+        timings.append(elapsed)
+        total += elapsed
+    return timings
+
+
+def measure_peak_memory(run):
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(name, variant, size, options):
+    source_code = generate_corpus(size, variant, options.seed)
+    token_count = len(CLexer(source_code, 'regex').tokenize_table()) - 1
+    run = PREPARERS[name](source_code, options)
+
+    run()  # Isınma (regex derleme, format cache'leri vb.)
+    timings = sorted(measure(run, options.repeat, options.min_time))
+    p50 = percentile(timings, 0.50)
+    record = {
+        'benchmark': name,
+        'variant': variant,
+        'size': format_size(size),
+        'bytes': len(source_code),
+        'tokens': token_count,
+        'runs': len(timings),
+        'p50_ms': p50 * 1000,
+        'p99_ms': percentile(timings, 0.99) * 1000,
+        'min_ms': timings[0] * 1000,
+        'max_ms': timings[-1] * 1000,
+        'mb_per_second': len(source_code) / (1024 * 1024) / p50 if p50 else 0.0,
+        'tokens_per_second': token_count / p50 if p50 else 0.0,
+        'peak_memory_bytes': None if options.no_memory else measure_peak_memory(run),
+    }
+    if name == 'lex' or name == 'parse' or name == 'report':
+        record['engine'] = options.engine
+    if name == 'highlight':
+        record['highlight_mode'] = options.highlight_mode
+    return record
+
+
+def record_key(record):
+    return (record['benchmark'], record['variant'], record['size'],
+            record.get('engine'), record.get('highlight_mode'))
+
+
+def compare_results(results, baseline, stream):
+    # p50 oranı: < 1 hızlanma, > 1 yavaşlama
+    baseline_records = {record_key(record): record for record in baseline.get('results', [])}
+    print(f"\nCompared with {baseline.get('revision') or 'baseline'}:", file=stream)
+    for record in results:
+        previous = baseline_records.get(record_key(record))
+        if previous is None:
+            continue
+        ratio = record['p50_ms'] / previous['p50_ms'] if previous['p50_ms'] else float('inf')
+        memory = ''
+        if record['peak_memory_bytes'] and previous.get('peak_memory_bytes'):
+            memory = f", memory x{record['peak_memory_bytes'] / previous['peak_memory_bytes']:.2f}"
+        print(f"  {record['benchmark']:9} {record['variant']:8} {record['size']:>6}: "
+              f"p50 {previous['p50_ms']:.2f} -> {record['p50_ms']:.2f} ms (x{ratio:.2f}{memory})",
+              file=stream)
+
+
+def print_record(record, stream):
+    memory = record['peak_memory_bytes']
+    memory_text = f"{memory / (1024 * 1024):8.2f} MB" if memory is not None else '       -'
+    print(f"{record['benchmark']:9} {record['variant']:8} {record['size']:>6} "
+          f"runs {record['runs']:5}  p50 {record['p50_ms']:9.3f} ms  p99 {record['p99_ms']:9.3f} ms  "
+          f"{record['mb_per_second']:7.2f} MB/s  {record['tokens_per_second']:11,.0f} tok/s  "
+          f"peak {memory_text}", file=stream)
+
+
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(description='Benchmark the lexer, parser, reports and highlighting.')
+    argument_parser.add_argument('--benchmarks', default=','.join(BENCHMARKS),
+                                 help=f"comma separated subset of {', '.join(BENCHMARKS)}")
+    argument_parser.add_argument('--variants', default=','.join(VARIANTS),
+                                 help=f"comma separated subset of {', '.join(VARIANTS)}")
+    argument_parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                                 help='comma separated corpus sizes, e.g. 1KB,64KB,1MB,50MB')
+    argument_parser.add_argument('--repeat', type=int, default=5,
+                                 help='minimum number of timed runs per case')
+    argument_parser.add_argument('--min-time', type=float, default=1.0,
+                                 help='keep running a case until this many seconds were measured')
+    argument_parser.add_argument('--seed', type=int, default=0, help='corpus generator seed')
+    argument_parser.add_argument('--engine', choices=LEXER_ENGINES, default='regex',
+                                 help='lexer engine for the lex, parse and report benchmarks')
+    argument_parser.add_argument('--highlight-mode', choices=HIGHLIGHT_MODES, default='document',
+                                 help='editor highlight mode for the highlight benchmark')
+    argument_parser.add_argument('--no-memory', action='store_true',
+                                 help='skip the extra tracemalloc run that measures peak memory')
+    argument_parser.add_argument('-o', '--output', default='-',
+                                 help='JSON results file (default: stdout)')
+    argument_parser.add_argument('--compare', default=None,
+                                 help='earlier JSON results to compare p50 latency and memory against')
+    args = argument_parser.parse_args(argv)
+
+    names = [name.strip() for name in args.benchmarks.split(',') if name.strip()]
+    variants = [variant.strip() for variant in args.variants.split(',') if variant.strip()]
+    for name in names:
+        if name not in PREPARERS:
+            argument_parser.error(f"unknown benchmark: {name}")
+    for variant in variants:
+        if variant not in VARIANTS:
+            argument_parser.error(f"unknown variant: {variant}")
+    sizes = [parse_size(size) for size in args.sizes.split(',') if size.strip()]
+
+    results = []
+    for name in names:
+        for variant in variants:
+            for size in sizes:
+                record = run_benchmark(name, variant, size, args)
+                print_record(record, sys.stderr)
+                results.append(record)
+
+    report = {
+        'format': RESULT_FORMAT_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'options': {
+            'repeat': args.repeat,
+            'min_time': args.min_time,
+            'seed': args.seed,
+            'engine': args.engine,
+            'highlight_mode': args.highlight_mode,
+        },
+        'results': results,
+    }
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            compare_results(results, json.load(file), sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(text + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
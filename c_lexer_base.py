@@ -1,7 +1,14 @@
 
 # lexer için gerekli olan token tipleri, state'ler ve transition table'lar
 
-from enum import Enum, auto
+import re
+from array import array
+from enum import Enum, IntEnum, auto
+from functools import lru_cache
+
+# Token çıktısı (tipler, sınırlar, keyword seti) değiştiğinde artırılır;
+# disk cache anahtarının parçasıdır
+LEXER_VERSION = 2
 
 
 class TokenType(Enum):
@@ -107,20 +114,115 @@ class LexerState(Enum):
     ACCEPT = auto()
     ERROR = auto()
 
-# C Keywords
-C_KEYWORDS = {
-    'auto', 'break', 'case', 'char', 'const', 'continue', 'default', 'do',
-    'double', 'else', 'enum', 'extern', 'float', 'for', 'goto', 'if',
-    'int', 'long', 'register', 'return', 'short', 'signed', 'sizeof', 'static',
-    'struct', 'switch', 'typedef', 'union', 'unsigned', 'void', 'volatile', 'while'
+class Keyword(IntEnum):
+    # C keyword id'leri; KEYWORD token'ları değerin yanında bu id'yi taşır,
+    # parser string yerine int karşılaştırır. 0 "keyword değil" demektir.
+    AUTO = 1
+    BREAK = auto()
+    CASE = auto()
+    CHAR = auto()
+    CONST = auto()
+    CONTINUE = auto()
+    DEFAULT = auto()
+    DO = auto()
+    DOUBLE = auto()
+    ELSE = auto()
+    ENUM = auto()
+    EXTERN = auto()
+    FLOAT = auto()
+    FOR = auto()
+    GOTO = auto()
+    IF = auto()
+    INT = auto()
+    LONG = auto()
+    REGISTER = auto()
+    RETURN = auto()
+    SHORT = auto()
+    SIGNED = auto()
+    SIZEOF = auto()
+    STATIC = auto()
+    STRUCT = auto()
+    SWITCH = auto()
+    TYPEDEF = auto()
+    UNION = auto()
+    UNSIGNED = auto()
+    VOID = auto()
+    VOLATILE = auto()
+    WHILE = auto()
+
+    # C99
+    INLINE = auto()
+    RESTRICT = auto()
+    BOOL = auto()           # _Bool
+    COMPLEX = auto()        # _Complex
+    IMAGINARY = auto()      # _Imaginary
+
+    # C11
+    ALIGNAS = auto()        # _Alignas
+    ALIGNOF = auto()        # _Alignof
+    ATOMIC = auto()         # _Atomic
+    GENERIC = auto()        # _Generic
+    NORETURN = auto()       # _Noreturn
+    STATIC_ASSERT = auto()  # _Static_assert
+    THREAD_LOCAL = auto()   # _Thread_local
+
+
+# Alt çizgiyle başlayan C99/C11 keyword'lerinin yazılışı
+UNDERSCORE_KEYWORDS = {
+    Keyword.BOOL, Keyword.COMPLEX, Keyword.IMAGINARY, Keyword.ALIGNAS, Keyword.ALIGNOF,
+    Keyword.ATOMIC, Keyword.GENERIC, Keyword.NORETURN, Keyword.STATIC_ASSERT, Keyword.THREAD_LOCAL,
 }
 
+# Keyword metni -> id ve id -> (tek, paylaşılan) metin
+KEYWORD_IDS = {('_' + keyword.name.capitalize() if keyword in UNDERSCORE_KEYWORDS
+                else keyword.name.lower()): keyword for keyword in Keyword}
+KEYWORD_SPELLINGS = [''] + sorted(KEYWORD_IDS, key=KEYWORD_IDS.get)
+
+# C Keywords
+C_KEYWORDS = frozenset(KEYWORD_IDS)
+
+
+class SymbolTable:
+    # Doküman başına identifier tablosu: her isim bir kez saklanır, token'lar
+    # id tutar. Aynı identifier'ın tüm token'ları aynı string nesnesini paylaşır.
+    # id 0 "symbol yok" için ayrılmıştır.
+
+    def __init__(self):
+        self.names = ['']
+        self.ids = {}
+
+    def intern(self, name):
+        symbol = self.ids.get(name)
+        if symbol is None:
+            symbol = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return symbol
+
+    def canonical(self, name):
+        return self.names[self.intern(name)]
+
+    def copy(self):
+        table = SymbolTable()
+        table.names = list(self.names)
+        table.ids = dict(self.ids)
+        return table
+
+    def __len__(self):
+        return len(self.names) - 1
+
+
 class Token:
-    def __init__(self, token_type, value, line, column):
+    __slots__ = ('type', 'value', 'line', 'column', 'start', 'end', 'keyword')
+
+    def __init__(self, token_type, value, line, column, start=None, end=None, keyword=None):
         self.type = token_type
         self.value = value
         self.line = line
         self.column = column
+        # Kaynak koddaki offset aralığı [start, end)
+        self.start = start
+        self.end = end
+        self.keyword = keyword  # KEYWORD token'ları için Keyword id'si
     
     def __str__(self):
         return f"Token({self.type}, '{self.value}', {self.line}:{self.column})"
@@ -128,6 +230,178 @@ class Token:
     def __repr__(self):
         return self.__str__()
 
+
+# Compact token tablosu: token başına bir Python nesnesi yerine paralel
+# array kolonları (tip kodu, start, length, line, column, symbol). Değerler
+# kaynak koddan lazy olarak slice edilir; identifier ve keyword'ler tablodan gelir.
+TOKEN_TYPES = list(TokenType)
+TOKEN_TYPE_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}
+ERROR_CODE = TOKEN_TYPE_CODES[TokenType.ERROR]
+EOF_CODE = TOKEN_TYPE_CODES[TokenType.EOF]
+IDENTIFIER_CODE = TOKEN_TYPE_CODES[TokenType.IDENTIFIER]
+KEYWORD_CODE = TOKEN_TYPE_CODES[TokenType.KEYWORD]
+
+
+class TokenRef:
+    # TokenTable içindeki bir satıra Token ile aynı arayüzden erişim
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def type(self):
+        return TOKEN_TYPES[self.table.types[self.index]]
+
+    @property
+    def value(self):
+        return self.table.value(self.index)
+
+    @property
+    def keyword(self):
+        return self.table.keyword(self.index)
+
+    @property
+    def line(self):
+        return self.table.lines[self.index]
+
+    @property
+    def column(self):
+        return self.table.columns[self.index]
+
+    @property
+    def start(self):
+        return self.table.starts[self.index]
+
+    @property
+    def end(self):
+        return self.table.starts[self.index] + self.table.lengths[self.index]
+
+    def __str__(self):
+        return f"Token({self.type}, '{self.value}', {self.line}:{self.column})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class TokenTable:
+    # Token listesi yerine geçen sequence: len(), [i], iterasyon.
+    # Token başına ~22 byte (Token nesnesi + value string ~220 byte).
+    # symbols kolonu: IDENTIFIER için symbol_table id'si, KEYWORD için Keyword id'si
+
+    def __init__(self, source='', symbol_table=None):
+        self.source = source
+        # Aynı dokümanın tabloları (ör. incremental güncellemeler) symbol tablosunu paylaşır
+        self.symbol_table = symbol_table if symbol_table is not None else SymbolTable()
+        self.types = array('H')
+        self.starts = array('I')
+        self.lengths = array('I')
+        self.lines = array('I')
+        self.columns = array('I')
+        self.symbols = array('I')
+
+    @classmethod
+    def from_tokens(cls, tokens, source, symbol_table=None):
+        table = cls(source, symbol_table)
+        for token in tokens:
+            table.append_token(token)
+        return table
+
+    def append(self, type_code, start, length, line, column, symbol=0):
+        self.types.append(type_code)
+        self.starts.append(start)
+        self.lengths.append(length)
+        self.lines.append(line)
+        self.columns.append(column)
+        self.symbols.append(symbol)
+
+    def append_token(self, token):
+        type_code = TOKEN_TYPE_CODES[token.type]
+        if type_code == KEYWORD_CODE:
+            symbol = token.keyword
+        elif type_code == IDENTIFIER_CODE:
+            symbol = self.symbol_table.intern(token.value)
+        else:
+            symbol = 0
+        self.append(type_code, token.start, token.end - token.start, token.line, token.column, symbol)
+
+    def copy(self):
+        # Başka bir thread'de güncellenecek kopya: symbol tablosu da kopyalanır
+        table = TokenTable(self.source, self.symbol_table.copy())
+        table.extend(self)
+        return table
+
+    def extend(self, other, begin=0, end=None):
+        # other tablosunun [begin, end) satırlarını ekle (array slice, kopya C'de).
+        # symbol id'leri ancak aynı symbol tablosunu paylaşan tablolar arasında geçerlidir
+        self.types.extend(other.types[begin:end])
+        self.starts.extend(other.starts[begin:end])
+        self.lengths.extend(other.lengths[begin:end])
+        self.lines.extend(other.lines[begin:end])
+        self.columns.extend(other.columns[begin:end])
+        self.symbols.extend(other.symbols[begin:end])
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.types)
+        if not 0 <= index < len(self.types):
+            raise IndexError("token index out of range")
+        return TokenRef(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield TokenRef(self, index)
+
+    def token_type(self, index):
+        return TOKEN_TYPES[self.types[index]]
+
+    def keyword(self, index):
+        if self.types[index] == KEYWORD_CODE:
+            return Keyword(self.symbols[index])
+        return None
+
+    def value(self, index):
+        code = self.types[index]
+        if code == IDENTIFIER_CODE:
+            return self.symbol_table.names[self.symbols[index]]
+        if code == KEYWORD_CODE:
+            return KEYWORD_SPELLINGS[self.symbols[index]]
+        start = self.starts[index]
+        text = self.source[start:start + self.lengths[index]]
+        if code == ERROR_CODE:
+            return f"Unexpected character: {text}"
+        return text
+
+    def rows(self):
+        # Toplu okuma için (type, value, line, column, start, end) tuple'ları;
+        # TokenRef property'lerinden geçmez
+        source = self.source
+        names = self.symbol_table.names
+        for code, start, length, line, column, symbol in zip(self.types, self.starts, self.lengths,
+                                                             self.lines, self.columns, self.symbols):
+            end = start + length
+            if code == IDENTIFIER_CODE:
+                value = names[symbol]
+            elif code == KEYWORD_CODE:
+                value = KEYWORD_SPELLINGS[symbol]
+            elif code == ERROR_CODE:
+                value = f"Unexpected character: {source[start:end]}"
+            else:
+                value = source[start:end]
+            yield TOKEN_TYPES[code], value, line, column, start, end
+
+
+def token_rows(tokens):
+    # TokenTable veya Token listesi için ortak (type, value, line, column, start, end) akışı
+    if isinstance(tokens, TokenTable):
+        return tokens.rows()
+    return ((token.type, token.value, token.line, token.column, token.start, token.end)
+            for token in tokens)
+
 # State Transition Table
 # Format: {(current_state, input_char_type): (next_state, action)}
 # Actions: 'consume', 'emit', 'back', 'error'
@@ -224,4 +498,225 @@ TRANSITION_TABLE = {
     # PREPROCESSOR_STATE transitions
     (LexerState.PREPROCESSOR_STATE, 'letter'): (LexerState.PREPROCESSOR_STATE, 'consume'),
     (LexerState.PREPROCESSOR_STATE, 'newline'): (LexerState.ACCEPT, 'emit_preprocessor'),
-}
\ No newline at end of file
+}
+
+# Varsayılan geçişler: TRANSITION_TABLE'da karşılığı olmayan (state, char) çiftleri
+# 'back_*' aksiyonları mevcut karakteri consume etmeden token emit eder
+DEFAULT_TRANSITIONS = {
+    LexerState.START: (LexerState.ACCEPT, 'error'),
+    LexerState.INTEGER_STATE: (LexerState.ACCEPT, 'back_integer'),
+    LexerState.FLOAT_DOT: (LexerState.ACCEPT, 'back_float'),  # "1." de float
+    LexerState.FLOAT_DIGITS: (LexerState.ACCEPT, 'back_float'),
+    LexerState.IDENTIFIER_STATE: (LexerState.ACCEPT, 'back_identifier'),
+    LexerState.STRING_STATE: (LexerState.STRING_STATE, 'consume'),
+    LexerState.STRING_ESCAPE: (LexerState.STRING_STATE, 'consume'),
+    LexerState.CHAR_STATE: (LexerState.CHAR_STATE, 'consume'),
+    LexerState.CHAR_ESCAPE: (LexerState.CHAR_STATE, 'consume'),
+    LexerState.SINGLE_COMMENT_STATE: (LexerState.SINGLE_COMMENT_STATE, 'consume'),
+    LexerState.MULTI_COMMENT_STATE: (LexerState.MULTI_COMMENT_STATE, 'consume'),
+    LexerState.MULTI_COMMENT_END: (LexerState.MULTI_COMMENT_STATE, 'consume'),
+    LexerState.PREPROCESSOR_STATE: (LexerState.PREPROCESSOR_STATE, 'consume'),
+    LexerState.SLASH_STATE: (LexerState.ACCEPT, 'back_divide'),
+    LexerState.EQUAL_STATE: (LexerState.ACCEPT, 'back_assign'),
+    LexerState.LESS_STATE: (LexerState.ACCEPT, 'back_less'),
+    LexerState.GREATER_STATE: (LexerState.ACCEPT, 'back_greater'),
+    LexerState.NOT_STATE: (LexerState.ACCEPT, 'back_not'),
+    LexerState.AND_STATE: (LexerState.ACCEPT, 'back_bitwise_and'),
+    LexerState.OR_STATE: (LexerState.ACCEPT, 'back_bitwise_or'),
+    LexerState.PLUS_STATE: (LexerState.ACCEPT, 'back_plus'),
+    LexerState.MINUS_STATE: (LexerState.ACCEPT, 'back_minus'),
+}
+
+# Dosya sonu geçişleri: yarım kalan token emit edilir, kapanmamış string/yorum dahil
+EOF_TRANSITIONS = {
+    LexerState.START: (LexerState.ACCEPT, 'emit_eof'),
+    LexerState.STRING_STATE: (LexerState.ACCEPT, 'back_string'),
+    LexerState.STRING_ESCAPE: (LexerState.ACCEPT, 'back_string'),
+    LexerState.CHAR_STATE: (LexerState.ACCEPT, 'back_char'),
+    LexerState.CHAR_ESCAPE: (LexerState.ACCEPT, 'back_char'),
+    LexerState.SINGLE_COMMENT_STATE: (LexerState.ACCEPT, 'back_single_comment'),
+    LexerState.MULTI_COMMENT_STATE: (LexerState.ACCEPT, 'back_multi_comment'),
+    LexerState.MULTI_COMMENT_END: (LexerState.ACCEPT, 'back_multi_comment'),
+    LexerState.PREPROCESSOR_STATE: (LexerState.ACCEPT, 'back_preprocessor'),
+}
+
+# emit_* aksiyonları mevcut karakteri token'a dahil eder, back_* etmez
+ACTION_TOKENS = {
+    'emit_newline': TokenType.NEWLINE,
+    'emit_semicolon': TokenType.SEMICOLON,
+    'emit_comma': TokenType.COMMA,
+    'emit_lparen': TokenType.LEFT_PAREN,
+    'emit_rparen': TokenType.RIGHT_PAREN,
+    'emit_lbrace': TokenType.LEFT_BRACE,
+    'emit_rbrace': TokenType.RIGHT_BRACE,
+    'emit_lbracket': TokenType.LEFT_BRACKET,
+    'emit_rbracket': TokenType.RIGHT_BRACKET,
+    'emit_dot': TokenType.DOT,
+    'emit_multiply': TokenType.MULTIPLY,
+    'emit_modulo': TokenType.MODULO,
+    'emit_xor': TokenType.BITWISE_XOR,
+    'emit_not': TokenType.BITWISE_NOT,
+    'emit_string': TokenType.STRING,
+    'emit_char': TokenType.CHARACTER,
+    'emit_comment': TokenType.MULTI_COMMENT,
+    'emit_equal': TokenType.EQUAL,
+    'emit_less_equal': TokenType.LESS_EQUAL,
+    'emit_left_shift': TokenType.LEFT_SHIFT,
+    'emit_greater_equal': TokenType.GREATER_EQUAL,
+    'emit_right_shift': TokenType.RIGHT_SHIFT,
+    'emit_not_equal': TokenType.NOT_EQUAL,
+    'emit_and': TokenType.AND,
+    'emit_or': TokenType.OR,
+    'emit_increment': TokenType.INCREMENT,
+    'emit_decrement': TokenType.DECREMENT,
+    'emit_arrow': TokenType.ARROW,
+    'emit_eof': TokenType.EOF,
+    'back_integer': TokenType.INTEGER,
+    'back_float': TokenType.FLOAT,
+    'back_string': TokenType.STRING,
+    'back_char': TokenType.CHARACTER,
+    'back_single_comment': TokenType.SINGLE_COMMENT,
+    'back_multi_comment': TokenType.MULTI_COMMENT,
+    'back_preprocessor': TokenType.PREPROCESSOR,
+    'back_divide': TokenType.DIVIDE,
+    'back_assign': TokenType.ASSIGN,
+    'back_less': TokenType.LESS,
+    'back_greater': TokenType.GREATER,
+    'back_not': TokenType.NOT,
+    'back_bitwise_and': TokenType.BITWISE_AND,
+    'back_bitwise_or': TokenType.BITWISE_OR,
+    'back_plus': TokenType.PLUS,
+    'back_minus': TokenType.MINUS,
+}
+
+# Dense tablo için integer aksiyon kodları
+ACTION_CONSUME = 0      # karakteri token'a ekle, state değiştir
+ACTION_SKIP = 1         # karakteri atla (START'taki whitespace)
+ACTION_EMIT = 2         # karakteri ekle ve token emit et
+ACTION_BACK = 3         # karakteri eklemeden token emit et
+ACTION_IDENTIFIER = 4   # karakteri eklemeden identifier/keyword emit et
+ACTION_ERROR = 5        # karakteri atla ve ERROR emit et
+
+# Char class index'leri: tabloda geçen tüm sınıflar + 'other' + 'eof'
+CHAR_CLASSES = (['digit', 'letter', 'whitespace', 'newline'] +
+                sorted({key[1] for key in TRANSITION_TABLE if len(key[1]) == 1}) +
+                ['other', 'eof'])
+CHAR_CLASS_INDEX = {name: index for index, name in enumerate(CHAR_CLASSES)}
+CHAR_CLASS_COUNT = len(CHAR_CLASSES)
+OTHER_CLASS = CHAR_CLASS_INDEX['other']
+EOF_CLASS = CHAR_CLASS_INDEX['eof']
+
+STATES = list(LexerState)
+STATE_INDEX = {state: index for index, state in enumerate(STATES)}
+START_INDEX = STATE_INDEX[LexerState.START]
+
+
+def char_class_index(ch):
+    return CHAR_CLASS_INDEX.get(char_type(ch), OTHER_CLASS)
+
+
+# ASCII karakterler için char class index'i önceden hesaplanır
+ASCII_CHAR_CLASSES = [char_class_index(chr(code)) for code in range(128)]
+
+
+def resolve_transition(state, char_class):
+    # Final state'ler (ACCEPT, ERROR) lexer'da tutulmaz, START gibi davranır
+    if state not in DEFAULT_TRANSITIONS:
+        state = LexerState.START
+
+    if char_class == 'eof':
+        next_state, action = EOF_TRANSITIONS.get(state, DEFAULT_TRANSITIONS[state])
+    elif (state, char_class) in TRANSITION_TABLE:
+        next_state, action = TRANSITION_TABLE[(state, char_class)]
+    else:
+        next_state, action = DEFAULT_TRANSITIONS[state]
+
+    if next_state == LexerState.ACCEPT:
+        next_state = LexerState.START
+
+    if action == 'consume':
+        return (STATE_INDEX[next_state], ACTION_CONSUME, None)
+    if action == 'skip':
+        return (STATE_INDEX[state], ACTION_SKIP, None)
+    if action == 'error':
+        return (START_INDEX, ACTION_ERROR, TokenType.ERROR)
+    if action == 'back_identifier':
+        return (START_INDEX, ACTION_IDENTIFIER, None)
+
+    # Satır sonundaki // yorum ve preprocessor newline'ı consume etmez
+    if action == 'emit_comment' and state == LexerState.SINGLE_COMMENT_STATE:
+        return (START_INDEX, ACTION_BACK, TokenType.SINGLE_COMMENT)
+    if action == 'emit_preprocessor':
+        return (START_INDEX, ACTION_BACK, TokenType.PREPROCESSOR)
+    if action == 'emit_eof' or action.startswith('back_'):
+        return (START_INDEX, ACTION_BACK, ACTION_TOKENS[action])
+    return (START_INDEX, ACTION_EMIT, ACTION_TOKENS[action])
+
+
+# Dense transition table: DENSE_TRANSITIONS[state_index * CHAR_CLASS_COUNT + class_index]
+# -> (next_state_index, action_code, token_type); her karakter tek bir liste erişimi
+DENSE_TRANSITIONS = [resolve_transition(state, char_class)
+                     for state in STATES for char_class in CHAR_CLASSES]
+
+
+# Regex engine için token sınıfları
+# TRANSITION_TABLE ile aynı dili tanır; {letter}, {digit}, {whitespace}
+# yer tutucuları char_type() sınıflarından doldurulur
+TOKEN_PATTERNS = [
+    ('WHITESPACE', r'[{whitespace}]+'),
+    ('NEWLINE', r'\n'),
+    ('NUMBER', r'[{digit}]+(?:\.[{digit}]*)?'),
+    ('IDENTIFIER', r'[{letter}][{letter}{digit}]*'),
+    ('STRING', r'"[^"\\]*(?:\\[\s\S][^"\\]*)*\\?"?'),
+    ('CHARACTER', r"'[^'\\]*(?:\\[\s\S][^'\\]*)*\\?'?"),
+    ('SINGLE_COMMENT', r'//[^\n]*'),
+    ('MULTI_COMMENT', r'/\*[^*]*(?:\*+[^*/][^*]*)*(?:\*+/?)?'),
+    ('PREPROCESSOR', r'#[^\n]*'),
+    ('OPERATOR', r'==|!=|<=|>=|<<|>>|&&|\|\||\+\+|--|->|[-+*/%=<>!&|^~;,(){}\[\].]'),
+    ('ERROR', r'[\s\S]'),
+]
+
+# Regex'in tanıdığı operator/punctuation metinlerinin token tipleri
+OPERATOR_TOKENS = {
+    '+': TokenType.PLUS, '-': TokenType.MINUS, '*': TokenType.MULTIPLY,
+    '/': TokenType.DIVIDE, '%': TokenType.MODULO, '=': TokenType.ASSIGN,
+    '==': TokenType.EQUAL, '!=': TokenType.NOT_EQUAL, '<': TokenType.LESS,
+    '<=': TokenType.LESS_EQUAL, '>': TokenType.GREATER, '>=': TokenType.GREATER_EQUAL,
+    '&&': TokenType.AND, '||': TokenType.OR, '!': TokenType.NOT,
+    '&': TokenType.BITWISE_AND, '|': TokenType.BITWISE_OR, '^': TokenType.BITWISE_XOR,
+    '~': TokenType.BITWISE_NOT, '<<': TokenType.LEFT_SHIFT, '>>': TokenType.RIGHT_SHIFT,
+    '++': TokenType.INCREMENT, '--': TokenType.DECREMENT,
+    ';': TokenType.SEMICOLON, ',': TokenType.COMMA,
+    '(': TokenType.LEFT_PAREN, ')': TokenType.RIGHT_PAREN,
+    '{': TokenType.LEFT_BRACE, '}': TokenType.RIGHT_BRACE,
+    '[': TokenType.LEFT_BRACKET, ']': TokenType.RIGHT_BRACKET,
+    '.': TokenType.DOT, '->': TokenType.ARROW,
+}
+
+# Karakter sınıfı regex'e girmesi gereken char_type() sonuçları
+REGEX_CHAR_CLASSES = ('letter', 'digit', 'whitespace')
+
+
+def regex_extra_chars(source):
+    # ASCII dışı harf/rakam/boşluk karakterleri (ör. Türkçe identifier'lar)
+    if source.isascii():
+        return frozenset()
+    return frozenset(ch for ch in set(source)
+                     if not ch.isascii() and char_type(ch) in REGEX_CHAR_CLASSES)
+
+
+@lru_cache(maxsize=32)
+def compile_token_regex(extra_chars=frozenset()):
+    # Karakter sınıflarını char_type() ile üret, iki engine aynı sınıflandırmayı kullansın
+    classes = {name: [] for name in REGEX_CHAR_CLASSES}
+    for ch in [chr(code) for code in range(128)] + sorted(extra_chars):
+        char_class = char_type(ch)
+        if char_class in classes:
+            classes[char_class].append(re.escape(ch))
+
+    parts = []
+    for name, pattern in TOKEN_PATTERNS:
+        for char_class, chars in classes.items():
+            pattern = pattern.replace('{' + char_class + '}', ''.join(chars))
+        parts.append(f'(?P<{name}>{pattern})')
+    return re.compile('|'.join(parts))
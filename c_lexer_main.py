@@ -1,8 +1,17 @@
 
+from array import array
+
 from c_lexer_base import *
 
+# Seçilebilir lexer engine'leri: state table (karakter karakter) veya master regex
+LEXER_ENGINES = ('table', 'regex')
+
+
 class CLexer:
-    def __init__(self, source_code):
+    def __init__(self, source_code, engine='table'):
+        if engine not in LEXER_ENGINES:
+            raise ValueError(f"Unknown lexer engine: {engine}")
+        self.engine = engine
         self.source = source_code
         self.position = 0
         self.line = 1
@@ -11,7 +20,7 @@ class CLexer:
         self.current_token_start_line = 1
         self.current_token_start_column = 1
         self.state = LexerState.START
-        self.buffer = ""
+        self.symbols = SymbolTable()  # Identifier'lar doküman başına intern edilir
         
     def current_char(self):
         if self.position >= len(self.source):
@@ -37,215 +46,436 @@ class CLexer:
         self.current_token_start = self.position
         self.current_token_start_line = self.line
         self.current_token_start_column = self.column
-        self.buffer = ""
     
-    def add_to_buffer(self, char):
-        self.buffer += char
+    def seek(self, position, line, column, state=LexerState.START):
+        # Lexing'i verilen pozisyondan ve state'ten devam ettir; state START değilse
+        # (ör. MULTI_COMMENT_STATE) token bu pozisyonda başlamış sayılır
+        self.position = position
+        self.line = line
+        self.column = column
+        self.state = state
+        self.start_token()
     
     def get_buffer_value(self):
-        return self.buffer
+        # Token değeri kaynak koddan slice edilir, karakter karakter birleştirilmez
+        return self.source[self.current_token_start:self.position]
     
     def create_token(self, token_type, value=None):
         if value is None:
-            value = self.buffer
-        return Token(token_type, value, self.current_token_start_line, self.current_token_start_column)
+            value = self.get_buffer_value()
+        return Token(token_type, value, self.current_token_start_line, self.current_token_start_column,
+                     self.current_token_start, self.position)
     
     def is_keyword(self, identifier):
-        return identifier in C_KEYWORDS
+        return identifier in KEYWORD_IDS
     
-    def next_token(self):
+    def next_token(self, flush_eof=True):
+        # Her karakter için DENSE_TRANSITIONS'da tek bir liste erişimi yapılır;
+        # pozisyon bilgileri döngü boyunca local değişkenlerde tutulur
+        source = self.source
+        length = len(source)
+        transitions = DENSE_TRANSITIONS
+        ascii_classes = ASCII_CHAR_CLASSES
+
+        state = STATE_INDEX[self.state]
+        position = self.position
+        line = self.line
+        column = self.column
+        token_start = self.current_token_start
+        token_line = self.current_token_start_line
+        token_column = self.current_token_start_column
+
         while True:
-            if self.position >= len(self.source):
-                return self.create_token(TokenType.EOF, "")
-            
-            current_char = self.current_char()
-            char_class = char_type(current_char)
-            
-            # State transition table'dan bir sonraki state'i bul
-            transition_key = (self.state, char_class)
-            
-            # Eğer exact match bulamazsa, daha genel bir match ara
-            if transition_key not in TRANSITION_TABLE:
-                # Identifier ve integer state'leri için default davranış
-                if self.state == LexerState.INTEGER_STATE and char_class not in ['digit', '.']:
-                    return self.handle_integer_end()
-                elif self.state == LexerState.IDENTIFIER_STATE and char_class not in ['letter', 'digit']:
-                    return self.handle_identifier_end()
-                elif self.state == LexerState.FLOAT_DIGITS and char_class != 'digit':
-                    return self.handle_float_end()
-                # String ve char state'leri için default consume
-                elif self.state in [LexerState.STRING_STATE, LexerState.CHAR_STATE]:
-                    if self.state == LexerState.STRING_STATE and current_char != '"':
-                        self.add_to_buffer(current_char)
-                        self.advance()
-                        continue
-                    elif self.state == LexerState.CHAR_STATE and current_char != "'":
-                        self.add_to_buffer(current_char)
-                        self.advance()
-                        continue
-                # Comment state'leri için default consume
-                elif self.state in [LexerState.SINGLE_COMMENT_STATE, LexerState.MULTI_COMMENT_STATE]:
-                    self.add_to_buffer(current_char)
-                    self.advance()
-                    continue
-                # Preprocessor için default consume
-                elif self.state == LexerState.PREPROCESSOR_STATE:
-                    if char_class not in ['newline']:
-                        self.add_to_buffer(current_char)
-                        self.advance()
-                        continue
-                # Single operator states - emit and back
-                elif self.state in [LexerState.SLASH_STATE, LexerState.EQUAL_STATE, LexerState.LESS_STATE, 
-                                   LexerState.GREATER_STATE, LexerState.NOT_STATE, LexerState.AND_STATE, 
-                                   LexerState.OR_STATE, LexerState.PLUS_STATE, LexerState.MINUS_STATE]:
-                    return self.handle_single_operator()
+            if position < length:
+                current_char = source[position]
+                code = ord(current_char)
+                if code < 128:
+                    char_class = ascii_classes[code]
                 else:
-                    return self.create_token(TokenType.ERROR, f"Unexpected character: {current_char}")
-            
-            next_state, action = TRANSITION_TABLE[transition_key]
-            
-            # Action'ı uygula
-            if action == 'consume':
-                if self.state == LexerState.START:
-                    self.start_token()
-                self.add_to_buffer(current_char)
-                self.advance()
-                self.state = next_state
-                
-            elif action == 'skip':
-                self.advance()
-                # State START'ta kalır
-                
-            elif action.startswith('emit_'):
-                return self.handle_emit_action(action, current_char)
-                
-            elif action == 'back':
-                # Karakteri consume etmeden token emit et
-                return self.handle_back_action()
-                
-            elif action == 'error':
-                return self.create_token(TokenType.ERROR, f"Lexical error at {current_char}")
-    
-    def handle_emit_action(self, action, current_char):
-        token_map = {
-            'emit_newline': TokenType.NEWLINE,
-            'emit_semicolon': TokenType.SEMICOLON,
-            'emit_comma': TokenType.COMMA,
-            'emit_lparen': TokenType.LEFT_PAREN,
-            'emit_rparen': TokenType.RIGHT_PAREN,
-            'emit_lbrace': TokenType.LEFT_BRACE,
-            'emit_rbrace': TokenType.RIGHT_BRACE,
-            'emit_lbracket': TokenType.LEFT_BRACKET,
-            'emit_rbracket': TokenType.RIGHT_BRACKET,
-            'emit_dot': TokenType.DOT,
-            'emit_multiply': TokenType.MULTIPLY,
-            'emit_modulo': TokenType.MODULO,
-            'emit_xor': TokenType.BITWISE_XOR,
-            'emit_not': TokenType.BITWISE_NOT,
-            'emit_string': TokenType.STRING,
-            'emit_char': TokenType.CHARACTER,
-            'emit_comment': TokenType.SINGLE_COMMENT,
-            'emit_equal': TokenType.EQUAL,
-            'emit_less_equal': TokenType.LESS_EQUAL,
-            'emit_left_shift': TokenType.LEFT_SHIFT,
-            'emit_greater_equal': TokenType.GREATER_EQUAL,
-            'emit_right_shift': TokenType.RIGHT_SHIFT,
-            'emit_not_equal': TokenType.NOT_EQUAL,
-            'emit_and': TokenType.AND,
-            'emit_or': TokenType.OR,
-            'emit_increment': TokenType.INCREMENT,
-            'emit_decrement': TokenType.DECREMENT,
-            'emit_arrow': TokenType.ARROW,
-            'emit_preprocessor': TokenType.PREPROCESSOR
-        }
-        
-        if action in ['emit_newline', 'emit_semicolon', 'emit_comma', 'emit_lparen', 'emit_rparen',
-                      'emit_lbrace', 'emit_rbrace', 'emit_lbracket', 'emit_rbracket', 'emit_dot',
-                      'emit_multiply', 'emit_modulo', 'emit_xor', 'emit_not']:
-            # Single character token
-            self.start_token()
-            self.add_to_buffer(current_char)
-            self.advance()
-            token = self.create_token(token_map[action])
-            self.state = LexerState.START
-            return token
-        
-        elif action in ['emit_string', 'emit_char']:
-            # String/char closing quote consume et
-            self.add_to_buffer(current_char)
-            self.advance()
-            token = self.create_token(token_map[action])
-            self.state = LexerState.START
-            return token
-            
-        elif action == 'emit_comment':
-            if self.state == LexerState.SINGLE_COMMENT_STATE:
-                # Newline'ı consume etme, onu ayrı token olarak döndür
-                token = self.create_token(TokenType.SINGLE_COMMENT)
-                self.state = LexerState.START
-                return token
-            else:  # Multi comment
-                self.add_to_buffer(current_char)  # Closing /
-                self.advance()
-                token = self.create_token(TokenType.MULTI_COMMENT)
-                self.state = LexerState.START
-                return token
-                
-        elif action == 'emit_preprocessor':
-            # Newline'ı consume etme
-            token = self.create_token(TokenType.PREPROCESSOR)
-            self.state = LexerState.START
-            return token
-            
-        else:
-            # Multi-character operators
-            self.add_to_buffer(current_char)
-            self.advance()
-            token = self.create_token(token_map[action])
-            self.state = LexerState.START
-            return token
-    
-    def handle_integer_end(self):
-        token = self.create_token(TokenType.INTEGER)
-        self.state = LexerState.START
-        return token
-    
-    def handle_float_end(self):
-        token = self.create_token(TokenType.FLOAT)
-        self.state = LexerState.START
-        return token
-    
-    def handle_identifier_end(self):
-        value = self.get_buffer_value()
-        if self.is_keyword(value):
-            token = self.create_token(TokenType.KEYWORD)
-        else:
-            token = self.create_token(TokenType.IDENTIFIER)
-        self.state = LexerState.START
-        return token
-    
-    def handle_single_operator(self):
-        operator_map = {
-            LexerState.SLASH_STATE: TokenType.DIVIDE,
-            LexerState.EQUAL_STATE: TokenType.ASSIGN,
-            LexerState.LESS_STATE: TokenType.LESS,
-            LexerState.GREATER_STATE: TokenType.GREATER,
-            LexerState.NOT_STATE: TokenType.NOT,
-            LexerState.AND_STATE: TokenType.BITWISE_AND,
-            LexerState.OR_STATE: TokenType.BITWISE_OR,
-            LexerState.PLUS_STATE: TokenType.PLUS,
-            LexerState.MINUS_STATE: TokenType.MINUS
-        }
-        
-        token = self.create_token(operator_map[self.state])
-        self.state = LexerState.START
-        return token
+                    char_class = char_class_index(current_char)
+            else:
+                current_char = None
+                char_class = EOF_CLASS
+
+            next_state, action, token_type = transitions[state * CHAR_CLASS_COUNT + char_class]
+
+            if action == ACTION_SKIP:
+                # START'taki whitespace; newline ayrı token olduğu için satır değişmez
+                position += 1
+                column += 1
+                continue
+
+            # START'tan çıkarken yeni token başlar
+            if state == START_INDEX:
+                token_start = position
+                token_line = line
+                token_column = column
+
+            if action == ACTION_CONSUME or action == ACTION_EMIT or action == ACTION_ERROR:
+                if current_char == '\n':
+                    line += 1
+                    column = 1
+                else:
+                    column += 1
+                position += 1
+
+            if action == ACTION_CONSUME:
+                state = next_state
+                continue
+
+            self.position = position
+            self.line = line
+            self.column = column
+            self.current_token_start = token_start
+            self.current_token_start_line = token_line
+            self.current_token_start_column = token_column
+
+            # flush_eof=False: sonda yarım kalan token döndürülür ama state korunur,
+            # böylece lexing bir sonraki parçada (ör. sonraki satır) devam edebilir
+            if current_char is None and not flush_eof:
+                next_state = state
+            self.state = STATES[next_state]
+
+            if action == ACTION_ERROR:
+                return Token(TokenType.ERROR, f"Unexpected character: {current_char}",
+                             token_line, token_column, token_start, position)
+
+            value = source[token_start:position]
+            if action == ACTION_IDENTIFIER:
+                keyword = KEYWORD_IDS.get(value)
+                if keyword is not None:
+                    return Token(TokenType.KEYWORD, KEYWORD_SPELLINGS[keyword], token_line, token_column,
+                                 token_start, position, keyword)
+                token_type = TokenType.IDENTIFIER
+                value = self.symbols.canonical(value)
+            return Token(token_type, value, token_line, token_column, token_start, position)
     
     def tokenize_all(self):
+        if self.engine == 'regex':
+            return self.tokenize_regex()
+
         tokens = []
         while True:
             token = self.next_token()
             tokens.append(token)
             if token.type == TokenType.EOF:
                 break
-        return tokens
\ No newline at end of file
+        return tokens
+
+    def tokenize_partial(self):
+        # Girdinin sonuna kadar token üret, yarım kalan token'ı flush etme.
+        # (token listesi, bitiş state'i) döndürür; EOF token'ı eklenmez.
+        tokens = []
+        while True:
+            token = self.next_token(flush_eof=False)
+            if token.type == TokenType.EOF:
+                break
+            tokens.append(token)
+            if self.position >= len(self.source) and self.state != LexerState.START:
+                break
+        return tokens, self.state
+
+    def tokenize_regex(self):
+        # Tüm token'ları tek bir master regex ile, slice ederek üret.
+        # Çıktı (token, value, line, column) table engine ile birebir aynıdır.
+        source = self.source
+        tokens, _, line, line_start = scan_regex(source, symbols=self.symbols)
+
+        # State'i table engine'in tokenize_all sonrasındaki haline getir
+        self.position = len(source)
+        self.line = line
+        self.column = len(source) - line_start + 1
+        self.state = LexerState.START
+
+        tokens.append(Token(TokenType.EOF, "", self.line, self.column, self.position, self.position))
+        return tokens
+
+    def tokenize_table(self):
+        # tokenize_all ile aynı token'lar, compact TokenTable olarak
+        source = self.source
+        if self.engine != 'regex':
+            return TokenTable.from_tokens(self.tokenize_all(), source, self.symbols)
+
+        table = TokenTable(source, self.symbols)
+        _, _, line, line_start = scan_regex(source, table=table)
+
+        self.position = len(source)
+        self.line = line
+        self.column = len(source) - line_start + 1
+        self.state = LexerState.START
+
+        table.append(EOF_CODE, self.position, 0, self.line, self.column)
+        return table
+
+
+MULTILINE_KINDS = ('STRING', 'CHARACTER', 'MULTI_COMMENT')
+NEWLINE_CODE = TOKEN_TYPE_CODES[TokenType.NEWLINE]
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def scan_regex(text, offset=0, line=1, line_start=0, final=True, table=None, symbols=None):
+    # text'i master regex ile tara. offset/line/line_start text'in dosyadaki
+    # mutlak konumudur. final değilse text sonuna değen token devam ediyor
+    # olabilir (string, /* */, "-" -> "->"): orada durulur.
+    # table verilirse Token nesnesi üretilmez, satırlar table'a eklenir.
+    # symbols verilirse (veya table'ınki) identifier'lar orada intern edilir.
+    # Dönüş: (tokens, consumed, line, line_start)
+    scanner = compile_token_regex(regex_extra_chars(text))
+    text_length = len(text)
+
+    tokens = table if table is not None else []
+    if table is not None:
+        symbols = table.symbol_table
+    consumed = text_length
+
+    for match in scanner.finditer(text):
+        start = match.start()
+        end = match.end()
+        if not final and end == text_length:
+            consumed = start
+            break
+
+        kind = match.lastgroup
+        if kind == 'WHITESPACE':
+            continue
+
+        value = match.group()
+        position = offset + start
+        column = position - line_start + 1
+
+        if kind == 'NEWLINE':
+            if table is not None:
+                table.append(NEWLINE_CODE, position, 1, line, column)
+            else:
+                tokens.append(Token(TokenType.NEWLINE, value, line, column, position, position + 1))
+            line += 1
+            line_start = position + 1
+            continue
+
+        if kind == 'IDENTIFIER':
+            keyword = KEYWORD_IDS.get(value)
+            if keyword is not None:
+                if table is not None:
+                    table.append(KEYWORD_CODE, position, end - start, line, column, keyword)
+                else:
+                    tokens.append(Token(TokenType.KEYWORD, KEYWORD_SPELLINGS[keyword], line, column,
+                                        position, offset + end, keyword))
+                continue
+            if table is not None:
+                table.append(IDENTIFIER_CODE, position, end - start, line, column, symbols.intern(value))
+            else:
+                if symbols is not None:
+                    value = symbols.canonical(value)
+                tokens.append(Token(TokenType.IDENTIFIER, value, line, column, position, offset + end))
+            continue
+        elif kind == 'NUMBER':
+            token_type = TokenType.FLOAT if '.' in value else TokenType.INTEGER
+        elif kind == 'OPERATOR':
+            token_type = OPERATOR_TOKENS[value]
+        elif kind == 'ERROR':
+            token_type = TokenType.ERROR
+            value = f"Unexpected character: {value}"
+        else:
+            token_type = TokenType[kind]
+
+        if table is not None:
+            table.append(TOKEN_TYPE_CODES[token_type], position, end - start, line, column)
+        else:
+            tokens.append(Token(token_type, value, line, column, position, offset + end))
+
+        if kind in MULTILINE_KINDS:
+            newline_count = value.count('\n')
+            if newline_count:
+                line += newline_count
+                line_start = position + value.rindex('\n') + 1
+
+    return tokens, consumed, line, line_start
+
+
+def iter_tokens(fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Text file-like nesneden chunk chunk oku, token'ları tembel üret.
+    # Chunk sınırını aşan token'ın başı bir sonraki okumaya taşınır;
+    # bellek kullanımı chunk_size + en uzun token ile sınırlıdır.
+    # start/end/line/column değerleri dosya genelinde mutlaktır.
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+    pending = ''
+    offset = 0
+    line = 1
+    line_start = 0
+    read_size = chunk_size
+
+    while True:
+        chunk = fileobj.read(read_size)
+        final = not chunk
+        text = pending + chunk
+
+        tokens, consumed, line, line_start = scan_regex(text, offset, line, line_start, final)
+        yield from tokens
+
+        if final:
+            break
+
+        pending = text[consumed:]
+        offset += consumed
+        # Hiç ilerleme yoksa (dev bir yorum/string) okumayı büyüt, aksi
+        # halde aynı prefix her chunk'ta baştan taranır (quadratic)
+        read_size = read_size * 2 if consumed == 0 else chunk_size
+
+    position = offset + len(text)
+    yield Token(TokenType.EOF, "", line, position - line_start + 1, position, position)
+
+
+def find_token_index(tokens, position):
+    # end >= position olan ilk token'ın index'i (binary search)
+    low, high = 0, len(tokens)
+    while low < high:
+        middle = (low + high) // 2
+        if tokens[middle].end < position:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+# Bundan küçük symbol tabloları sıkıştırılmaz
+MIN_COMPACT_SYMBOLS = 256
+
+
+class IncrementalLexer:
+    # Düzenleme sonrası sadece değişen bölgeyi yeniden lex eder ve
+    # sonucu önceki token tablosuna ekler
+
+    def __init__(self, engine='regex'):
+        self.engine = engine
+        self.source = None
+        self.tokens = TokenTable()
+        self.relexed_count = 0  # Son güncellemede yeniden üretilen token sayısı
+        self.relexed_range = (0, 0)  # Yeniden üretilen token'ların index aralığı
+        # Edit'ler symbol tablosuna yazılıp silinen isimler bırakır (c, co, cou...);
+        # tablo bu boyutu aşınca canlı isimler sayılır, ölüler çoğunluktaysa sıkıştırılır
+        self.compact_threshold = 0
+
+    def invalidate(self):
+        self.source = None
+        self.tokens = TokenTable()
+
+    def reset(self, source_code):
+        return self.load(source_code, CLexer(source_code, engine=self.engine).tokenize_table())
+
+    def load(self, source_code, tokens):
+        # Dışarıda üretilmiş (ör. cache'ten okunan) token tablosunu benimse
+        self.tokens = tokens
+        self.source = source_code
+        self.relexed_count = len(tokens)
+        self.relexed_range = (0, len(tokens))
+        self.compact_threshold = 2 * max(len(tokens.symbol_table), MIN_COMPACT_SYMBOLS)
+        return tokens
+
+    def update(self, source_code, position, removed, added):
+        # position/removed/added: QTextDocument.contentsChange ile aynı anlamda
+        old_source = self.source
+        if (old_source is None or position < 0 or removed < 0 or added < 0 or
+                position + removed > len(old_source) or
+                len(old_source) - removed + added != len(source_code)):
+            return self.reset(source_code)
+
+        old_tokens = self.tokens
+        old_starts = old_tokens.starts
+        delta = added - removed
+        edit_end = position + added
+
+        # Bitişi edit'e değen ilk token lookahead nedeniyle değişebilir;
+        # edit whitespace içindeyse bir önceki token'ın başından başla
+        first = find_token_index(old_tokens, position)
+        if old_starts[first] > position:
+            first -= 1
+
+        lexer = CLexer(source_code)
+        lexer.symbols = old_tokens.symbol_table
+        if first >= 0:
+            lexer.seek(old_starts[first], old_tokens.lines[first], old_tokens.columns[first])
+        else:
+            first = 0
+
+        new_tokens = TokenTable(source_code, old_tokens.symbol_table)
+        new_tokens.extend(old_tokens, 0, first)
+        old_index = first
+        relexed_count = 0
+
+        while True:
+            token = lexer.next_token()
+            new_tokens.append_token(token)
+            relexed_count += 1
+
+            if token.type == TokenType.EOF:
+                break
+
+            if token.start < edit_end:
+                continue
+
+            # Edit'ten sonra eski akışla aynı offset'te bir token başladıysa
+            # lexer iki akışta da START state'te ve kalan metin aynı: senkronize
+            old_start = token.start - delta
+            while old_starts[old_index] < old_start:
+                old_index += 1
+            if old_starts[old_index] != old_start or old_tokens.types[old_index] == EOF_CODE:
+                continue
+
+            old_line = old_tokens.lines[old_index]
+            line_delta = token.line - old_line
+            column_delta = token.column - old_tokens.columns[old_index]
+            tail = old_index + 1
+            new_tokens.extend(old_tokens, tail)
+            if delta or line_delta or column_delta:
+                shift_tail(new_tokens, len(new_tokens) - len(old_tokens) + tail,
+                           old_line, delta, line_delta, column_delta)
+            break
+
+        if len(new_tokens.symbol_table) > self.compact_threshold:
+            live_count = compact_symbols(new_tokens)
+            self.compact_threshold = 2 * max(live_count, MIN_COMPACT_SYMBOLS)
+
+        self.source = source_code
+        self.tokens = new_tokens
+        self.relexed_count = relexed_count
+        self.relexed_range = (first, first + relexed_count)
+        return new_tokens
+
+
+def compact_symbols(table):
+    # Ölü isimler canlılardan fazlaysa tabloya sadece kullanılan isimlerle yeni bir
+    # symbol tablosu ver. Eski tablo paylaşıldığı (önceki TokenTable'lar) için
+    # yerinde değiştirilmez. Dönüş: canlı isim sayısı.
+    symbols = table.symbols
+    live = {symbol for code, symbol in zip(table.types, symbols) if code == IDENTIFIER_CODE}
+    if len(table.symbol_table) - len(live) <= len(live):
+        return len(live)
+
+    names = table.symbol_table.names
+    compacted = SymbolTable()
+    remap = {symbol: compacted.intern(names[symbol]) for symbol in sorted(live)}
+    table.symbols = array('I', [remap[symbol] if code == IDENTIFIER_CODE else symbol
+                                for code, symbol in zip(table.types, symbols)])
+    table.symbol_table = compacted
+    return len(live)
+
+
+def shift_tail(table, begin, old_line, delta, line_delta, column_delta):
+    # Yeniden kullanılan kuyruğu edit kadar kaydır; kolon sadece
+    # senkron token'ı ile aynı satırdaki (ardışık) token'larda değişir
+    lines = table.lines
+    if column_delta:
+        columns = table.columns
+        index = begin
+        count = len(lines)
+        while index < count and lines[index] == old_line:
+            columns[index] += column_delta
+            index += 1
+    if delta:
+        starts = table.starts
+        starts[begin:] = array('I', [start + delta for start in starts[begin:]])
+    if line_delta:
+        lines[begin:] = array('I', [line + line_delta for line in lines[begin:]])
@@ -1,50 +1,227 @@
-from parser import CodeAnalyzer
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+
+from analysis_metrics import DISABLED_METRICS, AnalysisMetrics
+from c_lexer_base import TokenType
+from parser import CodeAnalyzer, count_token_types, format_parse_info, format_token_info
+
+RESULT_CACHE_ENTRIES = 16
+RESULT_CACHE_BYTES = 64 * 1024 * 1024
+# Sonuç + analyzer state'inin token başına yaklaşık bellek kullanımı
+# (AST node'ları, token tablosu; tracemalloc ile ölçüldü)
+RESULT_BYTES_PER_TOKEN = 190
+
+
+class AnalysisResultCache:
+    # Son analiz sonuçlarının LRU cache'i; entry sayısı ve tahmini bellek ile sınırlı.
+    # Anahtar (uzunluk, hash(metin)); çakışmaya karşı hit'te metin ayrıca karşılaştırılır.
+
+    def __init__(self, max_entries=RESULT_CACHE_ENTRIES, max_bytes=RESULT_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (source, result, state, size)
+        self.total_bytes = 0
+
+    def get(self, source_code):
+        key = (len(source_code), hash(source_code))
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != source_code:
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, source_code, result, state, size):
+        key = (len(source_code), hash(source_code))
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.total_bytes -= previous[3]
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+
+        self.entries[key] = (source_code, result, state, size)
+        self.total_bytes += size
+        while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= evicted[3]
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+
+def estimate_result_size(source_code, token_count):
+    return len(source_code) + token_count * RESULT_BYTES_PER_TOKEN
+
+
+# Top-level node -> render edilmiş metin. Incremental parse değişmeyen
+# declaration'ların node'larını yeniden kullandığı için sadece değişenler render edilir.
+RENDERED_TOP_LEVEL = WeakKeyDictionary()
+
+
+class AnalysisReport:
+    # Bilgi paneli metinleri; ilk istendiğinde üretilir ve saklanır.
+    # Token tablosu ve AST analizden sonra değişmediği için hangi thread'de
+    # üretildiği fark etmez.
+
+    def __init__(self, tokens=None, ast=None, errors=None, empty_text=None):
+        self.tokens = tokens
+        self.ast = ast
+        self.errors = errors or []
+        self.empty_text = empty_text  # Analiz yapılmadıysa tüm metinler bu
+        self.cached_token_counts = None
+        self.cached_token_distribution = None
+        self.cached_token_info = None
+        self.cached_parse_info = None
+
+    def token_count(self):
+        if not self.tokens:
+            return 0
+        return len(self.tokens) - 1 if self.tokens[len(self.tokens) - 1].type == TokenType.EOF else len(self.tokens)
+
+    def token_counts(self):
+        if self.cached_token_counts is None:
+            self.cached_token_counts = count_token_types(self.tokens) if self.tokens else {}
+        return self.cached_token_counts
+
+    def token_distribution(self):
+        # "TYPE: sayı" satırları, çoktan aza (token sayısı tooltip'i)
+        if self.cached_token_distribution is None:
+            distribution = sorted(self.token_counts().items(), key=lambda x: x[1], reverse=True)
+            self.cached_token_distribution = "\n".join(
+                f"{token_type.name}: {count}" for token_type, count in distribution)
+        return self.cached_token_distribution
+
+    def token_info(self):
+        if self.empty_text is not None:
+            return self.empty_text
+        if self.cached_token_info is None:
+            self.cached_token_info = format_token_info(self.tokens, self.token_counts())
+        return self.cached_token_info
+
+    def parse_info(self):
+        if self.empty_text is not None:
+            return self.empty_text
+        if self.cached_parse_info is None:
+            ast_text = None
+            if self.ast is not None:
+                parts = [str(self.ast) + "\n"]
+                for node in self.ast.children:
+                    text = RENDERED_TOP_LEVEL.get(node)
+                    if text is None:
+                        text = RENDERED_TOP_LEVEL[node] = node.to_string(1)
+                    parts.append(text)
+                ast_text = ''.join(parts)
+            self.cached_parse_info = format_parse_info(self.ast, self.errors, ast_text)
+        return self.cached_parse_info
+
 
 class RealTimeAnalyzer:
 
-    def __init__(self):
+    def __init__(self, cache_entries=RESULT_CACHE_ENTRIES, cache_bytes=RESULT_CACHE_BYTES):
         self.analyzer = CodeAnalyzer()
         self.last_analysis_result = None
+        # Undo/redo ile önceki metinlere dönüldüğünde lex/parse tekrarlanmaz
+        self.result_cache = AnalysisResultCache(cache_entries, cache_bytes)
+
+    def lookup(self, source_code):
+        # Metin daha önce analiz edildiyse sonucu döndür ve analyzer'ı o duruma
+        # getir (sonraki incremental edit'ler bu metne göre uygulanır)
+        entry = self.result_cache.get(source_code)
+        if entry is None:
+            return None
+
+        _, cached_result, state, _ = entry
+        self.analyzer.restore(state)
+        result = dict(cached_result)
+        result['changed_lines'] = None  # Önceki render'a göre her yer değişmiş olabilir
+        # Cache'ten gelen sonuç için analiz fazı yok; render süreleri yeni nesneye yazılır
+        metrics = AnalysisMetrics() if self.analyzer.collect_metrics else DISABLED_METRICS
+        metrics.set_count('tokens', len(result['tokens']) if result['tokens'] is not None else 0)
+        metrics.set_count('cached', 1)
+        result['metrics'] = metrics
+        self.last_analysis_result = result
+        return result
     
-    def perform_analysis(self, source_code):
+    def perform_analysis(self, source_code, edit=None):
         if not source_code.strip():
             return {
                 'success': False,
-                'token_info': 'No code to analyze',
-                'parse_info': 'No code to analyze',
-                'errors': []
+                'report': AnalysisReport(empty_text='No code to analyze'),
+                'errors': [],
+                'error_positions': [],
+                'line_starts': [0],
+                'changed_lines': None,
+                'tokens': None,
+                'ast': None,
+                'metrics': DISABLED_METRICS
             }
         
+        cached_result = self.lookup(source_code)
+        if cached_result is not None:
+            return cached_result
+
         # Analizi gerçekleştir
-        success = self.analyzer.analyze(source_code)
+        success = self.analyzer.analyze(source_code, edit)
+        metrics = self.analyzer.metrics
         
         # Sonuçları hazırla
-        result = {
-            'success': success,
-            'token_info': self.analyzer.get_token_info(),
-            'parse_info': self.analyzer.get_parse_info(),
-            'errors': self.analyzer.get_errors()
-        }
+        with metrics.phase('report'):
+            result = {
+                'success': success,
+                # Token dağılımı, token dökümü ve AST metni sadece istenince üretilir
+                'report': AnalysisReport(self.analyzer.tokens, self.analyzer.ast, self.analyzer.errors),
+                'errors': self.analyzer.get_errors(),
+                'error_positions': self.analyzer.error_positions,
+                'line_starts': self.analyzer.line_starts,
+                # Renderer'ın ihtiyaçları da sonuca eklenir; analiz başka bir thread'de
+                # çalışırken analyzer state'ine dışarıdan erişilmesin
+                'changed_lines': self.get_changed_line_range(),
+                # Renderer'lar ve bilgi paneli modelleri token tablosunun kolonlarını
+                # doğrudan okur; analiz sonrası değiştirilmez
+                'tokens': self.analyzer.tokens,
+                'ast': self.analyzer.ast,
+                # Faz süreleri ve sayaçlar; render süreleri editörde eklenir
+                'metrics': metrics
+            }
         
+        if success:
+            self.result_cache.put(source_code, result, self.analyzer.snapshot(),
+                                  estimate_result_size(source_code, len(self.analyzer.tokens)))
+
         self.last_analysis_result = result
         return result
     
-    def get_syntax_highlighting_info(self):
-        #Syntax highlighting için token bilgilerini döndür
-        if not self.analyzer.tokens:
-            return []
-        
-        highlighting_info = []
-        for token in self.analyzer.tokens:
-            if token.type.name != 'EOF':
-                highlighting_info.append({
-                    'type': token.type.name,
-                    'value': token.value,
-                    'line': token.line,
-                    'column': token.column
-                })
-        
-        return highlighting_info
+    def get_changed_line_range(self):
+        # Son analizde yeniden lex edilen token'ların kapsadığı satırlar (1-based)
+        lexer = self.analyzer.lexer
+        start, end = lexer.relexed_range
+        if start >= end or end > len(lexer.tokens):
+            return None
+
+        last_token = lexer.tokens[end - 1]
+        return lexer.tokens[start].line, last_token.line + last_token.value.count('\n')
+
+
+def merge_edit(pending_edit, position, removed, added):
+    # Debounce süresince gelen contentsChange'leri tek bir (position, removed, added)
+    # aralığında birleştir; removed son analiz edilen metne göre hesaplanır
+    if pending_edit is None:
+        return (position, removed, added)
+
+    start, old_removed, old_added = pending_edit
+    end = start + old_added
+    total_delta = old_added - old_removed
+
+    # Mevcut dirty aralığın sonunu yeni edit'e göre kaydır
+    if end > position + removed:
+        end += added - removed
+    elif end > position:
+        end = position + added
+
+    start = min(start, position)
+    end = max(end, position + added)
+    total_delta += added - removed
+    return (start, end - start - total_delta, end - start)
 
 
 # VS Code Dark Modern temalı syntax renk şeması
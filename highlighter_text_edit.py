@@ -1,24 +1,178 @@
 
 from PyQt6.QtWidgets import QTextEdit
-from PyQt6.QtCore import QTimer, pyqtSignal
-from PyQt6.QtGui import QFont, QTextCharFormat, QTextCursor, QColor
+import time
+from bisect import bisect_left, bisect_right
+from PyQt6.QtCore import QObject, QThread, QTimer, QPoint, pyqtSignal
+from PyQt6.QtGui import QFont, QTextCharFormat, QTextCursor, QColor, QSyntaxHighlighter, QTextLayout
 from gui_integration import *
+from analysis_metrics import DISABLED_METRICS, LatencyTracer, MetricsTrace
+from analysis_scheduler import DEFAULT_DEBOUNCE_MS, DEFAULT_LATENCY_BUDGET_MS, DebounceScheduler
+from c_lexer_main import CLexer, IncrementalLexer
+from c_lexer_base import TokenType, TokenTable, LexerState, STATES, STATE_INDEX, TOKEN_TYPES
+
+# Bu boyuttan büyük dokümanlarda önce görünen satırlar renklendirilir,
+# kalan satırlar idle zamanda parça parça formatlanır
+LAZY_HIGHLIGHT_THRESHOLD = 200000  # karakter
+LINES_PER_CHUNK = 200
+
+# Bundan büyük edit'ler (dosya açma, büyük yapıştırma) lexing-only geçişi
+# atlar; renkleri tam analiz sonucu uygular
+LEXICAL_EDIT_CHARS = 65536
+MAX_ERROR_MARKS = 500
+
+
+def build_token_format(token_type):
+    token_format = QTextCharFormat()
+
+    # Renk belirle
+    color = get_token_color(token_type)
+    token_format.setForeground(QColor(color))
+
+    # Kalınlık ve italic açıkça verilir; layout formatı altındaki eski char
+    # formatını (document modunda lexing-only geçiş) tamamen örter
+    token_format.setFontWeight(QFont.Weight.Normal)
+    token_format.setFontItalic(False)
+
+    # Keyword'ler için bold
+    if token_type == 'KEYWORD':
+        token_format.setFontWeight(QFont.Weight.Bold)
+
+    # String ve comment'ler için italic
+    elif token_type in ['STRING', 'CHARACTER', 'SINGLE_COMMENT', 'MULTI_COMMENT']:
+        token_format.setFontItalic(True)
+
+    # Preprocessor için bold + farklı renk
+    elif token_type == 'PREPROCESSOR':
+        token_format.setFontWeight(QFont.Weight.Bold)
+
+    return token_format
+
+
+# Token tipi başına bir kez oluşturulan formatlar
+TOKEN_FORMAT_CACHE = {}
+
+
+def get_token_format(token_type):
+    token_format = TOKEN_FORMAT_CACHE.get(token_type)
+    if token_format is None:
+        token_format = build_token_format(token_type)
+        TOKEN_FORMAT_CACHE[token_type] = token_format
+    return token_format
+
+
+class CBlockHighlighter(QSyntaxHighlighter):
+    # Her QTextBlock (satır) ayrı lex edilir; satır sonundaki LexerState
+    # (ör. MULTI_COMMENT_STATE) block state olarak saklanır. Qt sadece değişen
+    # block'ları ve bitiş state'i değişirse sonraki block'ları yeniden highlight eder.
+
+    def __init__(self, document):
+        super().__init__(document)
+        self.formats = {token_type: get_token_format(token_type.name) for token_type in TokenType}
+
+    def highlightBlock(self, text):
+        previous_state = self.previousBlockState()
+        if previous_state < 0:
+            start_state = LexerState.START
+        else:
+            start_state = STATES[previous_state]
+
+        # Satır sonu karakteri de lex edilir ki bitiş state'i doğru olsun
+        lexer = CLexer(text + '\n')
+        lexer.seek(0, self.currentBlock().blockNumber() + 1, 1, start_state)
+        tokens, end_state = lexer.tokenize_partial()
+
+        text_length = len(text)
+        for token in tokens:
+            if token.type == TokenType.NEWLINE:
+                continue
+            length = min(token.end, text_length) - token.start
+            if length > 0:
+                self.setFormat(token.start, length, self.formats[token.type])
+
+        self.setCurrentBlockState(STATE_INDEX[end_state])
+
+
+class AnalysisWorker(QObject):
+    # Lexer + parser analizini GUI thread dışında çalıştırır.
+    # Her istek dokümanın bir kopyası ve revision numarası ile gelir.
+
+    finished = pyqtSignal(int, str, object)  # revision, analiz edilen metin, sonuç
+
+    def __init__(self, analyzer):
+        super().__init__()
+        self.analyzer = analyzer
+
+    def analyze(self, revision, source_code, edit):
+        try:
+            result = self.analyzer.perform_analysis(source_code, edit)
+        except Exception as e:
+            result = {'success': False, 'errors': [f"Analysis error: {str(e)}"], 'metrics': DISABLED_METRICS}
+        self.finished.emit(revision, source_code, result)
 
 
 class CustomSyntaxTextEditor(QTextEdit):
 
     analysisCompleted = pyqtSignal(dict)
-
-    def __init__(self, parent=None):
+    analysisRequested = pyqtSignal(int, str, object)  # revision, metin, edit
+
+    # 'document': analiz sonrası token'lar QTextCursor ile formatlanır
+    # 'block': renklendirme CBlockHighlighter ile satır satır yapılır
+    # 'layout': token'lar block başına QTextLayout.FormatRange listesi olarak uygulanır,
+    #           doküman değişmez ve undo stack'e kayıt düşmez
+    #
+    # İki aşama: her edit'ten hemen sonra editörün kendi IncrementalLexer'ı
+    # değişen token'ları yeniden renklendirir (lexical). Lex + parse worker'da
+    # düşük öncelikle, debounce sonrası çalışır; sonucu renklere dokunmadan
+    # parser hatalarını dalgalı alt çizgi olarak ekler ve paneli günceller.
+    HIGHLIGHT_MODES = ('document', 'block', 'layout')
+
+    def __init__(self, parent=None, highlight_mode='document', use_analysis_thread=True,
+                 latency_budget_ms=DEFAULT_LATENCY_BUDGET_MS, adaptive_debounce=True):
         super().__init__(parent)
 
         # Real-time analyzer
         self.analyzer = RealTimeAnalyzer()
-
-        # Highlighting delay timer (performans için)
+        self.metrics_trace = None  # set_metrics_enabled ile açılan JSONL trace
+        self.latency_tracer = None  # set_latency_tracing ile açılan keystroke -> boyama ölçümü
+
+        # Analiz worker'ı; thread kullanılmazsa sinyal doğrudan (senkron) çağrılır
+        self.analysis_worker = AnalysisWorker(self.analyzer)
+        self.analysis_thread = None
+        if use_analysis_thread:
+            self.analysis_thread = QThread(self)
+            self.analysis_worker.moveToThread(self.analysis_thread)
+            self.analysis_thread.start(QThread.Priority.LowPriority)
+        self.analysisRequested.connect(self.analysis_worker.analyze)
+        self.analysis_worker.finished.connect(self.on_analysis_finished)
+
+        # Her metin değişikliğinde artar; eski revision'ın sonucu uygulanmaz
+        self.document_revision = 0
+        self.analysis_running = False
+
+        # Highlighting delay timer (performans için); süreyi scheduler ölçülen
+        # analiz maliyetine göre seçer, adaptive_debounce=False ise sabit 100ms
         self.highlight_timer = QTimer()
         self.highlight_timer.setSingleShot(True)
         self.highlight_timer.timeout.connect(self.apply_syntax_highlighting)
+        self.scheduler = DebounceScheduler(latency_budget_ms) if adaptive_debounce else None
+        self.analysis_started = 0.0
+
+        # Renkler tam analizi beklemeden sadece lexer ile uygulanır; lexer son
+        # analiz sonucunun token'larından devam eder
+        self.lexical_lexer = IncrementalLexer()
+        self.lexical_edit = None
+        self.lexical_timer = QTimer()
+        self.lexical_timer.setSingleShot(True)
+        self.lexical_timer.timeout.connect(self.apply_lexical_pass)
+        # Document modunda da lexing-only renkler block layout formatı olarak
+        # yazılır: char format değişiklikleri her keystroke'ta undo stack'ine
+        # girerdi. Tam analiz dokümanı yeniden formatlarken bu formatlar silinir.
+        self.lexical_overlay = False
+
+        # Parser hataları doküman formatlarından ayrı, ExtraSelection olarak çizilir
+        self.error_format = QTextCharFormat()
+        self.error_format.setUnderlineStyle(QTextCharFormat.UnderlineStyle.WaveUnderline)
+        self.error_format.setUnderlineColor(QColor("#ff0000"))
 
         # Font ayarları
         font = QFont("Courier New", 11)
@@ -30,26 +184,271 @@ class CustomSyntaxTextEditor(QTextEdit):
 
         # Event'leri bağla
         self.textChanged.connect(self.on_text_changed)
+        self.document().contentsChange.connect(self.on_contents_change)
 
         # Highlighting durumu
         self.is_highlighting = False
         self.last_highlighted_text = ""
 
-    def on_text_changed(self):
+        # Son analizden beri değişen bölge (incremental lexing için)
+        self.pending_edit = None
+
+        # Büyük dokümanlar için lazy highlighting durumu
+        self.lazy_first_screen_done = False
+        self.lazy_tokens = TokenTable()
+        self.lazy_pending_chunks = set()
+        self.lazy_interrupted = False
+        self.lazy_timer = QTimer()
+        self.lazy_timer.setSingleShot(True)
+        self.lazy_timer.timeout.connect(self.highlight_next_chunk)
+        self.verticalScrollBar().valueChanged.connect(self.on_scroll)
+
+        # Layout modunda block numarası -> uygulanmış (start, length, type) listesi
+        self.layout_format_cache = {}
+        self.layout_block_count = 0
+        self.layout_formats_stale = False
+
+        self.highlight_mode = None
+        self.block_highlighter = None
+        self.set_highlight_mode(highlight_mode)
+
+    def set_highlight_mode(self, mode):
+        if mode not in self.HIGHLIGHT_MODES:
+            raise ValueError(f"Unknown highlight mode: {mode}")
+        if mode == self.highlight_mode:
+            return
+
+        previous_mode = self.highlight_mode
+        self.highlight_mode = mode
+        self.is_highlighting = True
+        try:
+            if previous_mode == 'layout':
+                self.clear_layout_formats()
+            self.clear_lexical_overlay()
+
+            if mode == 'block':
+                self.block_highlighter = CBlockHighlighter(self.document())
+            elif self.block_highlighter is not None:
+                self.block_highlighter.setDocument(None)
+                self.block_highlighter = None
+        finally:
+            self.is_highlighting = False
+
+        # Document modunda renkler bir sonraki analizde yeniden uygulanır
+        self.last_highlighted_text = ""
+        self.lexical_lexer.invalidate()
+        self.on_text_changed()
+
+    def on_contents_change(self, position, removed, added):
+        # Highlighting'in kendi format değişikliklerini edit olarak sayma
         if not self.is_highlighting:
+            self.document_revision += 1
+            self.pending_edit = merge_edit(self.pending_edit, position, removed, added)
+            self.lexical_edit = merge_edit(self.lexical_edit, position, removed, added)
+            if self.latency_tracer is not None:
+                self.latency_tracer.keystroke(self.document_revision, position, removed,
+                                              self.document_text(position, added))
+
+            # Yeni dosya açıldı/büyük yapıştırma: önce ilk ekran renklendirilsin
+            if max(removed, added) >= LAZY_HIGHLIGHT_THRESHOLD:
+                self.lazy_first_screen_done = False
+
+            # Bekleyen parçalar eski token'lara göre, yeni analizi bekle; o analiz
+            # formatlanmamış parçalar dahil tüm satırları yeniden sıraya koyar
+            if self.lazy_pending_chunks:
+                self.lazy_interrupted = True
+            self.lazy_pending_chunks.clear()
+            self.lazy_timer.stop()
+
+            # Değişen block'ların layout formatları yeniden uygulanmalı
+            if self.highlight_mode == 'layout':
+                document = self.document()
+                if document.blockCount() != self.layout_block_count:
+                    # Block numaraları kaydı, tüm block'lar yeniden kontrol edilir
+                    self.layout_formats_stale = True
+                else:
+                    first = document.findBlock(position).blockNumber()
+                    last = document.findBlock(position + added).blockNumber()
+                    for number in range(first, last + 1):
+                        self.layout_format_cache[number] = None
+
+    def set_metrics_enabled(self, enabled, trace_path=None):
+        # Faz süreleri sonuçlara eklenir; trace_path verilirse her render JSONL'e yazılır
+        self.analyzer.analyzer.collect_metrics = enabled
+        if self.metrics_trace is not None:
+            self.metrics_trace.close()
+        self.metrics_trace = MetricsTrace(trace_path) if enabled and trace_path else None
+
+    def set_latency_tracing(self, enabled):
+        # Açılırsa yeni bir oturum başlar; kapatılınca biten oturumun tracer'ı döner
+        tracer = self.latency_tracer
+        self.latency_tracer = LatencyTracer(self.toPlainText()) if enabled else None
+        return tracer
+
+    def document_text(self, position, length):
+        cursor = QTextCursor(self.document())
+        cursor.setPosition(position)
+        cursor.setPosition(min(position + length, self.document().characterCount() - 1),
+                           QTextCursor.MoveMode.KeepAnchor)
+        return cursor.selectedText().replace('\u2029', '\n')
+
+    def set_latency_budget(self, latency_budget_ms):
+        if self.scheduler is not None:
+            self.scheduler.latency_budget_ms = latency_budget_ms
+
+    def on_text_changed(self):
+        if self.is_highlighting:
+            return
+
+        # Renkler: aynı event loop turundaki edit'ler birlikte, parse beklenmeden
+        edit_size = max(self.lexical_edit[1], self.lexical_edit[2]) if self.lexical_edit else 0
+        if edit_size <= LEXICAL_EDIT_CHARS:
+            self.lexical_timer.start(0)
+
+        if self.scheduler is None:
             # 100ms delay ile highlighting uygula (performans için)
-            self.highlight_timer.start(100)
+            self.highlight_timer.start(DEFAULT_DEBOUNCE_MS)
+            return
+
+        # Her keystroke timer'ı yeniden başlatır (bekleyen tam analiz iptal edilir);
+        # çalışmakta olan analizin sonucu revision eskiyse uygulanmaz
+        self.scheduler.keystroke()
+        self.highlight_timer.start(self.scheduler.plan(self.document().characterCount() - 1))
+
+    def lexically_current(self, text):
+        # Lexing-only geçiş bu metnin renklerini zaten uyguladı mı
+        return self.lexical_edit is None and self.lexical_lexer.source == text
+
+    def apply_lexical_pass(self):
+        # Sadece değişen token'lar yeniden lex edilip renklendirilir (parse yok);
+        # block modunda bunu CBlockHighlighter zaten satır satır yapar
+        edit = self.lexical_edit
+        if edit is None or self.lexical_lexer.source is None or self.highlight_mode == 'block':
+            return
+        self.lexical_edit = None
+        tracer = self.latency_tracer
+        if tracer is not None:
+            tracer.debounce_fired()
+
+        self.is_highlighting = True
+        try:
+            tokens = self.lexical_lexer.update(self.toPlainText(), *edit)
+            first, end = self.lexical_lexer.relexed_range
+            if tracer is not None:
+                tracer.analysis_finished()
+            position, _, added = edit
+            self.format_layout_range(tokens, first, end, position, position + added)
+            if self.highlight_mode == 'document':
+                self.lexical_overlay = True
+        except Exception as e:
+            print(f"Lexical highlighting error: {e}")
+            self.lexical_lexer.invalidate()
+        finally:
+            self.is_highlighting = False
+
+        if tracer is not None:
+            tracer.painted(self.document_revision)
+
+    def clear_lexical_overlay(self):
+        # Document modunda lexing-only geçişin layout formatlarını kaldır
+        if self.lexical_overlay:
+            self.lexical_overlay = False
+            self.clear_layout_formats()
+
+    def format_tokens(self, cursor, tokens, first, end, text_length):
+        # tokens[first:end] için karakter formatları; token tablosunun kolonları
+        # doğrudan okunur, token başına nesne oluşturulmaz
+        types = tokens.types
+        starts = tokens.starts
+        lengths = tokens.lengths
+        for index in range(first, end):
+            token_type = TOKEN_TYPES[types[index]]
+            if token_type == TokenType.NEWLINE or token_type == TokenType.EOF:
+                continue
+            start = starts[index]
+            token_end = min(start + lengths[index], text_length)
+            if start >= token_end:
+                continue
+            cursor.setPosition(start)
+            cursor.setPosition(token_end, QTextCursor.MoveMode.KeepAnchor)
+            cursor.setCharFormat(self.create_token_format(token_type.name))
 
     def apply_syntax_highlighting(self):
         current_text = self.toPlainText()
+        if self.latency_tracer is not None:
+            self.latency_tracer.debounce_fired()
 
-        # Metin değişmemişse highlighting yapma
-        if current_text == self.last_highlighted_text:
+        # Metin değişmemişse (veya boşsa) highlighting yapma
+        if current_text == self.last_highlighted_text or not current_text.strip():
+            if self.latency_tracer is not None:
+                self.latency_tracer.painted(self.document_revision)
             return
 
-        if not current_text.strip():
+        # Undo/redo ile daha önce analiz edilmiş bir metne dönüldüyse sonucu hemen
+        # uygula; worker boştayken analyzer'a GUI thread'inden erişmek güvenli
+        if not self.analysis_running:
+            result = self.analyzer.lookup(current_text)
+            if result is not None:
+                if self.latency_tracer is not None:
+                    self.latency_tracer.analysis_finished()
+                self.pending_edit = None
+                self.lazy_first_screen_done = True
+                self.render_analysis_result(current_text, result)
+                return
+
+        lazy = self.highlight_mode == 'document' and len(current_text) >= LAZY_HIGHLIGHT_THRESHOLD
+
+        if lazy and not self.lazy_first_screen_done:
+            # İlk ekran: sadece görünen satırlara kadar lex et ve renklendir,
+            # tam analiz (lex + parse) bir sonraki event loop turunda yapılır
+            cursor = self.textCursor()
+            cursor_position = cursor.position()
+            self.is_highlighting = True
+            try:
+                self.highlight_visible_prefix(current_text)
+                self.lazy_first_screen_done = True
+                if self.latency_tracer is not None:
+                    self.latency_tracer.painted(self.document_revision)
+            except Exception as e:
+                print(f"Highlighting error: {e}")
+            finally:
+                cursor.setPosition(cursor_position)
+                self.setTextCursor(cursor)
+                self.is_highlighting = False
+            QTimer.singleShot(0, self.apply_syntax_highlighting)
+            return
+
+        # Worker meşgulse bekle; bittiğinde sonuç eskiyse yeniden istenir
+        if self.analysis_running:
+            return
+
+        # Analizi worker'a gönder, sadece değişen bölge yeniden lex edilir
+        edit = self.pending_edit
+        self.pending_edit = None
+        self.analysis_running = True
+        self.analysis_started = time.perf_counter()
+        self.analysisRequested.emit(self.document_revision, current_text, edit)
+
+    def on_analysis_finished(self, revision, source_code, result):
+        self.analysis_running = False
+        if self.scheduler is not None:
+            self.scheduler.record_analysis(len(source_code), time.perf_counter() - self.analysis_started)
+
+        # Analiz sürerken doküman değiştiyse sonucu at, güncel metni analiz et
+        if revision != self.document_revision:
+            self.highlight_timer.start(0)
             return
 
+        if self.latency_tracer is not None:
+            self.latency_tracer.analysis_finished()
+        self.render_analysis_result(source_code, result)
+
+    def render_analysis_result(self, current_text, result):
+        lazy = self.highlight_mode == 'document' and len(current_text) >= LAZY_HIGHLIGHT_THRESHOLD
+        # Lexing-only geçiş bu metni renklendirdiyse sadece hatalar eklenir
+        colored = self.lexically_current(current_text) and not self.lazy_interrupted
+        render_started = time.perf_counter()
+
         # Cursor pozisyonunu kaydet
         cursor = self.textCursor()
         cursor_position = cursor.position()
@@ -58,22 +457,60 @@ class CustomSyntaxTextEditor(QTextEdit):
         self.is_highlighting = True
 
         try:
-            # Analizi gerçekleştir
-            result = self.analyzer.perform_analysis(current_text)
+            metrics = result['metrics']
 
-            if result['success']:
-                # Tüm formatları temizle
-                self.clear_all_formatting()
+            if result['success'] and self.highlight_mode == 'block':
+                # Renklendirme CBlockHighlighter'da, sadece analiz sonucunu bildir
+                self.analysisCompleted.emit(result)
+
+            elif result['success'] and self.highlight_mode == 'layout':
+                # Block'ların format cache'iyle karşılaştırılır; değişmeyenlere dokunulmaz
+                with metrics.phase('format_apply'):
+                    self.apply_layout_formats(result['tokens'])
+                self.analysisCompleted.emit(result)
 
-                # Highlighting bilgilerini al
-                highlighting_info = self.analyzer.get_syntax_highlighting_info()
+            elif result['success'] and colored:
+                self.analysisCompleted.emit(result)
+
+            elif result['success'] and lazy:
+                # Görünen satırlar hemen, kalanlar idle zamanda formatlanır. Layout
+                # formatları kalkınca altlarındaki char formatları da yenilenmeli.
+                line_range = result['changed_lines']
+                if self.lazy_interrupted or self.lexical_overlay:
+                    line_range = None
+                    self.clear_lexical_overlay()
+                with metrics.phase('format_apply'):
+                    self.start_lazy_highlighting(result['tokens'], line_range)
+                self.analysisCompleted.emit(result)
+
+            elif result['success']:
+                # Tüm formatları temizle
+                with metrics.phase('format_clear'):
+                    self.clear_lexical_overlay()
+                    self.clear_all_formatting()
 
                 # Her token için highlighting uygula
-                self.apply_token_highlighting(highlighting_info, current_text)
+                with metrics.phase('format_apply'):
+                    self.apply_token_highlighting(result['tokens'], current_text)
 
                 # Analysis completed signal emit et
                 self.analysisCompleted.emit(result)
 
+            if result['success']:
+                self.lazy_interrupted = False
+            self.apply_error_marks(result)
+
+            if metrics.enabled and self.metrics_trace is not None:
+                self.metrics_trace.write(metrics, mode=self.highlight_mode, length=len(current_text))
+            if self.latency_tracer is not None:
+                self.latency_tracer.painted(self.document_revision)
+
+            # Lexing-only geçişler bu sonucun token'larından devam eder; worker
+            # boştayken kopyalanır, symbol tablosu thread'ler arasında paylaşılmaz
+            if not colored and result['success'] and result['tokens'] is not None:
+                self.lexical_lexer.load(current_text, result['tokens'].copy())
+                self.lexical_edit = None
+
             # Cache'e kaydet
             self.last_highlighted_text = current_text
 
@@ -87,73 +524,281 @@ class CustomSyntaxTextEditor(QTextEdit):
             # Highlighting işaretçisini kapat
             self.is_highlighting = False
 
-    def clear_all_formatting(self):
-        cursor = QTextCursor(self.document())
-        cursor.select(QTextCursor.SelectionType.Document)
+        if self.scheduler is not None:
+            self.scheduler.record_render(len(current_text), time.perf_counter() - render_started)
+
+    def apply_error_marks(self, result):
+        # Hatanın başladığı token'ın altı çizilir; ExtraSelection cursor'ları
+        # sonraki edit'lerle birlikte kayar, yeni sonuç gelene kadar yerinde kalır
+        selections = []
+        tokens = result.get('tokens')
+        if result['success'] and tokens is not None:
+            document = self.document()
+            text_length = document.characterCount() - 1
+            for position in result['error_positions'][:MAX_ERROR_MARKS]:
+                if position is None or text_length == 0:
+                    continue
+                start = min(position, text_length - 1)
+                end = start + 1
+                index = bisect_right(tokens.starts, start) - 1
+                if index >= 0 and tokens.starts[index] == start:
+                    end = min(start + max(1, tokens.lengths[index]), text_length)
+
+                selection = QTextEdit.ExtraSelection()
+                selection.cursor = QTextCursor(document)
+                selection.cursor.setPosition(start)
+                selection.cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+                selection.format = self.error_format
+                selections.append(selection)
+        self.setExtraSelections(selections)
+
+    def shutdown_analysis(self):
+        # Uygulama kapanırken worker thread'ini durdur
+        if self.analysis_thread is not None:
+            self.analysis_thread.quit()
+            self.analysis_thread.wait()
+            self.analysis_thread = None
+
+    def visible_line_range(self):
+        # Viewport'ta görünen ilk ve son satır (1-based)
+        top = self.cursorForPosition(QPoint(0, 0)).blockNumber() + 1
+        bottom = self.cursorForPosition(QPoint(0, self.viewport().height() - 1)).blockNumber() + 1
+        return top, bottom
+
+    def visible_chunks(self):
+        top, bottom = self.visible_line_range()
+        return range((top - 1) // LINES_PER_CHUNK, (bottom - 1) // LINES_PER_CHUNK + 1)
+
+    def highlight_visible_prefix(self, text):
+        # Sadece görünen son satırın sonuna kadar olan kısım lex edilir
+        _, bottom = self.visible_line_range()
+        next_block = self.document().findBlockByNumber(bottom)
+        end = next_block.position() if next_block.isValid() else len(text)
+
+        self.set_lazy_tokens(CLexer(text[:end], engine='regex').tokenize_table())
+        for chunk in self.visible_chunks():
+            self.highlight_line_chunk(chunk)
+        self.lazy_pending_chunks.clear()
+
+    def set_lazy_tokens(self, tokens, line_range=None):
+        # Parçalar token'ları satır kolonunda bisect ile bulur
+        self.lazy_tokens = tokens
+
+        # Sadece yeniden lex edilen satırların parçaları formatlanmayı bekler;
+        # diğer satırların formatları metinle birlikte zaten taşınmıştır
+        if line_range is None:
+            first_line, last_line = 1, self.document().blockCount()
+        else:
+            first_line, last_line = line_range
+        self.lazy_pending_chunks = set(range((first_line - 1) // LINES_PER_CHUNK,
+                                             (last_line - 1) // LINES_PER_CHUNK + 1))
+
+    def start_lazy_highlighting(self, tokens, line_range=None):
+        self.set_lazy_tokens(tokens, line_range)
+        for chunk in self.visible_chunks():
+            self.highlight_line_chunk(chunk)
+        self.lazy_timer.start(0)
+
+    def on_scroll(self, value):
+        # Kaydırınca yeni görünen parçalar beklemeden formatlanır
+        if not self.lazy_pending_chunks or self.is_highlighting:
+            return
 
-        # Default format
-        default_format = QTextCharFormat()
-        default_format.setForeground(QColor("#000000"))  # Siyah
-        cursor.setCharFormat(default_format)
+        self.is_highlighting = True
+        try:
+            for chunk in self.visible_chunks():
+                self.highlight_line_chunk(chunk)
+        finally:
+            self.is_highlighting = False
 
-    def apply_token_highlighting(self, highlighting_info, text):
-        lines = text.split('\n')
+    def highlight_next_chunk(self):
+        if not self.lazy_pending_chunks:
+            return
 
-        for token in highlighting_info:
-            try:
-                line_num = token['line'] - 1  # 0-based index
-                column = token['column'] -1
-                token_value = token['value']
-                token_type = token['type']
+        # Viewport'a en yakın bekleyen parça önce formatlanır
+        top, _ = self.visible_line_range()
+        current_chunk = (top - 1) // LINES_PER_CHUNK
+        chunk = min(self.lazy_pending_chunks, key=lambda index: abs(index - current_chunk))
 
-                # Satır ve kolon kontrolleri
-                if line_num < 0 or line_num >= len(lines):
-                    continue
+        self.is_highlighting = True
+        try:
+            self.highlight_line_chunk(chunk)
+        finally:
+            self.is_highlighting = False
 
-                line_text = lines[line_num]
-                if column < 0 or column >= len(line_text):
-                    continue
+        if self.lazy_pending_chunks:
+            self.lazy_timer.start(0)
 
-                # Absolute position hesaplama (düzeltilmiş versiyon)
-                absolute_position = 0
-                for i in range(line_num):
-                    absolute_position += len(lines[i]) + 1  # +1 for newline
+    def highlight_line_chunk(self, chunk):
+        if chunk not in self.lazy_pending_chunks:
+            return
+        self.lazy_pending_chunks.discard(chunk)
 
-                absolute_position += column
+        document = self.document()
+        first_line = chunk * LINES_PER_CHUNK + 1
+        last_line = min(first_line + LINES_PER_CHUNK - 1, document.blockCount())
+        if first_line > last_line:
+            return
 
-                # Token uzunluğu kontrolü
-                token_length = len(token_value)
-                if absolute_position + token_length > len(text):
-                    continue
+        # Parçanın eski formatlarını temizle
+        first_block = document.findBlockByNumber(first_line - 1)
+        last_block = document.findBlockByNumber(last_line - 1)
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        try:
+            cursor.setPosition(first_block.position())
+            cursor.setPosition(last_block.position() + last_block.length() - 1, QTextCursor.MoveMode.KeepAnchor)
+            default_format = QTextCharFormat()
+            default_format.setForeground(QColor("#000000"))
+            cursor.setCharFormat(default_format)
 
-                # Cursor oluştur ve format uygula
-                cursor = QTextCursor(self.document())
-                cursor.setPosition(absolute_position)
-                cursor.setPosition(absolute_position + token_length, QTextCursor.MoveMode.KeepAnchor)
-                token_format = self.create_token_format(token_type)
-                cursor.setCharFormat(token_format)
+            tokens = self.lazy_tokens
+            low = bisect_left(tokens.lines, first_line)
+            high = bisect_right(tokens.lines, last_line)
 
-            except Exception as e:
-                print(f"Token highlighting error: {e}, token: {token}")
+            # Önceki parçada başlayıp bu parçaya uzanan çok satırlı token (yorum/string)
+            if low > 0 and '\n' in tokens.value(low - 1):
+                low -= 1
+
+            self.format_tokens(cursor, tokens, low, high, document.characterCount() - 1)
+        finally:
+            cursor.endEditBlock()
+
+    def apply_layout_formats(self, tokens):
+        # Token'ları block'lara göre grupla; çok satırlı token'lar block sınırında bölünür
+        document = self.document()
+        block_ranges = {}
+        block = document.begin()
+        block_number = 0
+
+        for type_code, start, length in zip(tokens.types, tokens.starts, tokens.lengths):
+            token_type = TOKEN_TYPES[type_code]
+            if token_type == TokenType.NEWLINE or token_type == TokenType.EOF:
                 continue
 
-    def create_token_format(self, token_type):
-        token_format = QTextCharFormat()
+            end = start + length
+            while start < end and block.isValid():
+                block_position = block.position()
+                block_end = block_position + block.length()
+                if start >= block_end:
+                    block = block.next()
+                    block_number += 1
+                    continue
 
-        # Renk belirle
-        color = get_token_color(token_type)
-        token_format.setForeground(QColor(color))
+                piece_end = min(end, block_end - 1)
+                if piece_end > start:
+                    block_ranges.setdefault(block_number, []).append(
+                        (start - block_position, piece_end - start, token_type.name))
+                start = block_end
+
+        # Sadece format listesi değişen block'lar güncellenir ve yeniden çizilir
+        block = document.begin()
+        block_number = 0
+        dirty_start = dirty_end = None
+        while block.isValid():
+            ranges = block_ranges.get(block_number, [])
+            if self.layout_formats_stale or self.layout_format_cache.get(block_number, []) != ranges:
+                self.set_block_layout_formats(block, block_number, ranges)
+                if dirty_start is None:
+                    dirty_start = block.position()
+                dirty_end = block.position() + block.length()
+
+            block = block.next()
+            block_number += 1
+
+        if dirty_start is not None:
+            document.markContentsDirty(dirty_start, dirty_end - dirty_start)
+
+        self.layout_block_count = block_number
+        self.layout_formats_stale = False
+
+    def set_block_layout_formats(self, block, block_number, ranges):
+        format_ranges = []
+        for start, length, token_type in ranges:
+            format_range = QTextLayout.FormatRange()
+            format_range.start = start
+            format_range.length = length
+            format_range.format = get_token_format(token_type)
+            format_ranges.append(format_range)
+
+        # Yeniden çizim için çağıran değişen aralığı bir kez markContentsDirty ile
+        # bildirir; büyük dokümanda her çağrı block başına birkaç ms sürer
+        block.layout().setFormats(format_ranges)
+        if ranges:
+            self.layout_format_cache[block_number] = ranges
+        else:
+            self.layout_format_cache.pop(block_number, None)
+
+    def format_layout_range(self, tokens, first, end, edit_start, edit_end):
+        # Yeniden lex edilen token'ların ve edit'in kapsadığı block'ların format
+        # listeleri baştan kurulur (edit ile bölünen block'ların formatı yoktur)
+        document = self.document()
+        text_length = document.characterCount() - 1
+        span_start = edit_start
+        span_end = edit_end
+        if first < end:
+            span_start = min(span_start, tokens.starts[first])
+            span_end = max(span_end, tokens.starts[end - 1] + tokens.lengths[end - 1])
+
+        starts = tokens.starts
+        lengths = tokens.lengths
+        types = tokens.types
+        token_count = len(tokens)
+        block = document.findBlock(span_start)
+        last_number = document.findBlock(min(span_end, text_length)).blockNumber()
+        dirty_start = block.position()
+        dirty_end = dirty_start
+        while block.isValid() and block.blockNumber() <= last_number:
+            block_position = block.position()
+            block_end = block_position + block.length() - 1
+            ranges = []
+            index = max(0, bisect_right(starts, block_position) - 1)
+            while index < token_count and starts[index] < block_end:
+                token_type = TOKEN_TYPES[types[index]]
+                if token_type != TokenType.NEWLINE and token_type != TokenType.EOF:
+                    start = max(starts[index], block_position)
+                    piece_end = min(starts[index] + lengths[index], block_end)
+                    if piece_end > start:
+                        ranges.append((start - block_position, piece_end - start, token_type.name))
+                index += 1
+            self.set_block_layout_formats(block, block.blockNumber(), ranges)
+            dirty_end = block_end + 1
+            block = block.next()
+        document.markContentsDirty(dirty_start, dirty_end - dirty_start)
+
+    def clear_layout_formats(self):
+        document = self.document()
+        block = document.begin()
+        dirty_start = dirty_end = None
+        while block.isValid():
+            if block.layout().formats():
+                block.layout().setFormats([])
+                if dirty_start is None:
+                    dirty_start = block.position()
+                dirty_end = block.position() + block.length()
+            block = block.next()
+        if dirty_start is not None:
+            document.markContentsDirty(dirty_start, dirty_end - dirty_start)
+        self.layout_format_cache.clear()
+        self.layout_formats_stale = False
 
-        # Keyword'ler için bold
-        if token_type == 'KEYWORD':
-            token_format.setFontWeight(QFont.Weight.Bold)
+    def clear_all_formatting(self):
+        cursor = QTextCursor(self.document())
+        cursor.select(QTextCursor.SelectionType.Document)
 
-        # String ve comment'ler için italic
-        elif token_type in ['STRING', 'CHARACTER', 'SINGLE_COMMENT', 'MULTI_COMMENT']:
-            token_format.setFontItalic(True)
+        # Default format
+        default_format = QTextCharFormat()
+        default_format.setForeground(QColor("#000000"))  # Siyah
+        cursor.setCharFormat(default_format)
 
-        # Preprocessor için bold + farklı renk
-        elif token_type == 'PREPROCESSOR':
-            token_format.setFontWeight(QFont.Weight.Bold)
+    def apply_token_highlighting(self, tokens, text):
+        # Tek edit block: doküman layout'u her token yerine bir kez güncellenir
+        cursor = QTextCursor(self.document())
+        cursor.beginEditBlock()
+        try:
+            self.format_tokens(cursor, tokens, 0, len(tokens), len(text))
+        finally:
+            cursor.endEditBlock()
 
-        return token_format
\ No newline at end of file
+    def create_token_format(self, token_type):
+        return get_token_format(token_type)
\ No newline at end of file
@@ -1,12 +1,20 @@
 
 import sys
 import os
+import json
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout,
-                             QWidget, QLabel,
-                             QFileDialog, QMessageBox, QSplitter)
-from PyQt6.QtCore import Qt
+                             QWidget, QLabel, QListView, QTreeView, QListWidget,
+                             QFileDialog, QMessageBox, QSplitter, QToolTip)
+from PyQt6.QtCore import Qt, QEvent
 from PyQt6.QtGui import QAction
 from highlighter_text_edit import *
+from analysis_models import TokenListModel, ParseTreeModel
+
+# Ayarlanırsa analiz süreleri açık başlar ve her render bu JSONL dosyasına eklenir
+METRICS_TRACE_ENV = 'C_HIGHLIGHTER_TRACE'
+# Ayarlanırsa keystroke gecikme ölçümü açık başlar; oturum (edit kaydı + histogram)
+# kapanışta bu JSON dosyasına yazılır ve benchmarks/replay_latency.py ile tekrar oynatılabilir
+LATENCY_SESSION_ENV = 'C_HIGHLIGHTER_LATENCY'
 
 
 class LabCodeApp(QMainWindow):
@@ -14,6 +22,10 @@ class LabCodeApp(QMainWindow):
         super().__init__()
         self.initUI()
         self.load_stylesheet()
+        if os.environ.get(METRICS_TRACE_ENV):
+            self.metrics_action.setChecked(True)
+        if os.environ.get(LATENCY_SESSION_ENV):
+            self.latency_action.setChecked(True)
 
     def initUI(self):
         self.setWindowTitle('Real-Time C Syntax Highlighter')
@@ -27,6 +39,7 @@ class LabCodeApp(QMainWindow):
         self.create_menu_bar()
         
         splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.splitter = splitter
         
         # Sol panel - Editor
         editor_widget = QWidget()
@@ -49,26 +62,39 @@ class LabCodeApp(QMainWindow):
         
         # Sağ panel - Bilgi paneli
         info_widget = QWidget()
+        self.info_widget = info_widget
         info_layout = QVBoxLayout(info_widget)
         
         info_label = QLabel("Syntax Analysis Info")
         info_label.setObjectName("title_label")
         info_layout.addWidget(info_label)
         
-        self.token_info = QTextEdit()
+        # Token listesi ve parse tree model/view; sadece görünen satırlar formatlanır
+        self.token_model = TokenListModel(self)
+        self.token_info = QListView()
+        self.token_info.setModel(self.token_model)
+        self.token_info.setUniformItemSizes(True)
         self.token_info.setMaximumHeight(200)
         self.token_info.setFont(QFont('Consolas', 10))
-        self.token_info.setPlaceholderText("Token info")
-        self.token_info.setReadOnly(True)
-        info_layout.addWidget(QLabel("Detected Tokens:"))
+        self.token_count_label = QLabel("Detected Tokens:")
+        self.token_count_label.installEventFilter(self)
+        info_layout.addWidget(self.token_count_label)
         info_layout.addWidget(self.token_info)
         
-        self.parse_info = QTextEdit()
+        self.parse_model = ParseTreeModel(self)
+        self.parse_info = QTreeView()
+        self.parse_info.setModel(self.parse_model)
+        self.parse_info.setHeaderHidden(True)
+        self.parse_info.setUniformRowHeights(True)
         self.parse_info.setFont(QFont('Consolas', 10))
-        self.parse_info.setPlaceholderText("Parse info")
-        self.parse_info.setReadOnly(True)
         info_layout.addWidget(QLabel("Parse Tree:"))
         info_layout.addWidget(self.parse_info)
+
+        self.error_list = QListWidget()
+        self.error_list.setMaximumHeight(120)
+        self.error_list.setFont(QFont('Consolas', 10))
+        info_layout.addWidget(QLabel("Errors:"))
+        info_layout.addWidget(self.error_list)
         
         self.status_info = QLabel("Ready - Real-time analysis active")
         self.status_info.setObjectName("status_label")
@@ -78,6 +104,10 @@ class LabCodeApp(QMainWindow):
         splitter.addWidget(info_widget)
         
         splitter.setSizes([800, 400])
+        # Panel kapalıyken gelen sonuçlar panel tekrar açılınca gösterilir
+        splitter.splitterMoved.connect(self.on_splitter_moved)
+        self.latest_result = None
+        self.info_panel_stale = False
         
         main_layout.addWidget(splitter)
         
@@ -110,6 +140,20 @@ class LabCodeApp(QMainWindow):
         clear_action = QAction('&Clear All', self)
         clear_action.triggered.connect(self.clear_all)
         view_menu.addAction(clear_action)
+
+        report_action = QAction('Copy Analysis &Report', self)
+        report_action.triggered.connect(self.copy_analysis_report)
+        view_menu.addAction(report_action)
+
+        self.metrics_action = QAction('Show Analysis &Timings', self)
+        self.metrics_action.setCheckable(True)
+        self.metrics_action.toggled.connect(self.toggle_metrics)
+        view_menu.addAction(self.metrics_action)
+
+        self.latency_action = QAction('Trace Keystroke &Latency', self)
+        self.latency_action.setCheckable(True)
+        self.latency_action.toggled.connect(self.toggle_latency_tracing)
+        view_menu.addAction(self.latency_action)
     
     def create_status_bar(self):
         self.statusBar().showMessage('Ready - Real-time C Syntax Highlighter')
@@ -128,35 +172,105 @@ class LabCodeApp(QMainWindow):
             self.statusBar().showMessage('Ready - Real-time C Syntax Highlighter')
             self.clear_analysis_info()
 
+    def toggle_metrics(self, enabled):
+        self.text_editor.set_metrics_enabled(enabled, os.environ.get(METRICS_TRACE_ENV))
+        if not enabled:
+            self.update_status()
+
+    def toggle_latency_tracing(self, enabled):
+        tracer = self.text_editor.set_latency_tracing(enabled)
+        if tracer is not None:
+            self.finish_latency_session(tracer)
+
+    def finish_latency_session(self, tracer):
+        # Oturumun histogramı yazdırılır, istenmişse replay için kaydedilir
+        print(tracer.report())
+        self.update_status_info(f"Latency: {tracer.summary()}")
+        session_path = os.environ.get(LATENCY_SESSION_ENV)
+        if session_path:
+            try:
+                with open(session_path, 'w', encoding='utf-8') as file:
+                    json.dump(tracer.session(), file)
+            except OSError as e:
+                print(f"Latency session could not be saved: {e}")
+
+    def show_metrics(self, metrics):
+        # Faz süreleri ve sayaçlar satır/karakter bilgisinin yanında gösterilir
+        text_length = len(self.text_editor.toPlainText())
+        line_count = self.text_editor.document().blockCount()
+        self.statusBar().showMessage(f'Lines: {line_count} | Characters: {text_length} | {metrics.summary()}')
+
+    def info_panel_visible(self):
+        return self.info_widget.isVisible() and self.info_widget.width() > 0
+
+    def on_splitter_moved(self, position, index):
+        if self.info_panel_stale and self.info_panel_visible():
+            self.refresh_info_panel()
+
     def update_analysis_results(self, result):
-        if result['success']:
-            # Token info güncelle
-            if hasattr(self, 'token_info'):
-                self.token_info.setText(result['token_info'])
+        self.latest_result = result
+        if result['metrics'].enabled:
+            self.show_metrics(result['metrics'])
+        # Panel görünmüyorsa hiçbir şey formatlanmaz, açılınca güncellenir
+        if self.info_panel_visible():
+            self.refresh_info_panel()
+        else:
+            self.info_panel_stale = True
 
-            # Parse info güncelle
-            if hasattr(self, 'parse_info'):
-                self.parse_info.setText(result['parse_info'])
+    def refresh_info_panel(self):
+        result = self.latest_result
+        self.info_panel_stale = False
+        if result is None:
+            return
+
+        self.error_list.clear()
+        if result['success']:
+            # Modeller sadece yeni token tablosu/AST referansını alır
+            report = result['report']
+            self.token_model.set_tokens(result['tokens'])
+            self.token_count_label.setText(f"Detected Tokens: {report.token_count()}")
+            self.parse_model.set_ast(result['ast'])
+            self.parse_info.expandToDepth(0)
 
             # Hata varsa göster
             if result['errors']:
                 self.update_status_info(f"Analysis complete with {len(result['errors'])} errors")
-                error_text = "Errors:\n" + "\n".join(result['errors'])
-                if hasattr(self, 'parse_info'):
-                    self.parse_info.setText(error_text)
+                self.error_list.addItems(result['errors'])
             else:
                 self.update_status_info("Analysis complete - No errors")
         else:
             # Analiz başarısız
-            if hasattr(self, 'token_info'):
-                self.token_info.setText("Analysis failed")
-            if hasattr(self, 'parse_info'):
-                self.parse_info.setText("Analysis failed")
+            self.token_model.set_tokens(None)
+            self.parse_model.set_ast(None)
+            self.error_list.addItems(result['errors'] or ["Analysis failed"])
             self.update_status_info("Analysis failed")
 
+    def eventFilter(self, watched, event):
+        # Token dağılımı sadece tooltip istendiğinde hesaplanır, raporda saklanır
+        if watched is self.token_count_label and event.type() == QEvent.Type.ToolTip:
+            result = self.latest_result
+            if result is not None and result['success'] and not self.info_panel_stale:
+                QToolTip.showText(event.globalPos(), result['report'].token_distribution(), watched)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().eventFilter(watched, event)
+
+    def copy_analysis_report(self):
+        # Tam metin raporu (token dökümü + AST) sadece burada üretilir
+        if self.latest_result is None or 'report' not in self.latest_result:
+            return
+        report = self.latest_result['report']
+        QApplication.clipboard().setText(report.token_info() + "\n" + report.parse_info())
+        self.update_status_info("Analysis report copied to clipboard")
+
     def clear_analysis_info(self):
-        self.token_info.clear()
-        self.parse_info.clear()
+        self.latest_result = None
+        self.info_panel_stale = False
+        self.token_model.set_tokens(None)
+        self.token_count_label.setText("Detected Tokens:")
+        self.parse_model.set_ast(None)
+        self.error_list.clear()
     
     def open_file(self):
         file_path, _ = QFileDialog.getOpenFileName(self, 'Open C File', '', 'C Files (*.c);;All Files (*)')
@@ -187,6 +301,14 @@ class LabCodeApp(QMainWindow):
     
     def update_status_info(self, message):
         self.status_info.setText(message)
+
+    def closeEvent(self, event):
+        # Analiz thread'i pencere kapanmadan durdurulmalı
+        self.text_editor.shutdown_analysis()
+        tracer = self.text_editor.set_latency_tracing(False)
+        if tracer is not None:
+            self.finish_latency_session(tracer)
+        super().closeEvent(event)
     
     def load_stylesheet(self):
         try:
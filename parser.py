@@ -1,6 +1,15 @@
 
+import os
+from array import array
+from collections import Counter
+from multiprocessing import Pool
+
+from analysis_metrics import DISABLED_METRICS, AnalysisMetrics
 from c_lexer_base import *
-from c_lexer_main import CLexer
+from c_lexer_main import IncrementalLexer
+
+# AST veya hata çıktısı değiştiğinde artırılır; disk cache anahtarının parçasıdır
+PARSER_VERSION = 2
 
 
 class ASTNode:
@@ -11,40 +20,212 @@ class ASTNode:
         self.children = children if children else []
         self.line = None
         self.column = None
+        self.token_span = None  # Top-level node'lar için [start, end) token index aralığı
 
     def add_child(self, child):
         if child is not None:  # None child eklemeyi önle
             self.children.append(child)
         return self  # Method chaining için
 
+    def __reduce__(self):
+        # Paralel parse'ta process'ler arası taşınır; sadece tip, değer ve
+        # çocuklar yeterli (varsayılan __dict__ pickle'ı ~4 kat yavaş).
+        # Alt ağaç düz preorder listesi olarak gider: uzun operatör zincirlerinin
+        # derin ağaçlarında pickle'ın recursion limitine takılmaz
+        return (build_ast, (flatten_ast(self),))
+
     def __str__(self):
         return f"{self.type}({self.value})"
 
     def to_string(self, indent=0):
-        result = "  " * indent + str(self) + "\n"
-        for child in self.children:
-            if isinstance(child, ASTNode):
-                result += child.to_string(indent + 1)
-            else:
-                result += "  " * (indent + 1) + str(child) + "\n"
-        return result
+        # Iterative; satırlar listede toplanıp tek seferde birleştirilir
+        lines = []
+        stack = [(self, indent)]
+        while stack:
+            node, depth = stack.pop()
+            lines.append("  " * depth + str(node) + "\n")
+            if isinstance(node, ASTNode):
+                for child in reversed(node.children):
+                    stack.append((child, depth + 1))
+        return ''.join(lines)
+
+
+def flatten_ast(node):
+    # Preorder (tip, değer, çocuk sayısı) listesi
+    nodes = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        nodes.append((node.type, node.value, len(node.children)))
+        stack.extend(reversed(node.children))
+    return nodes
+
+
+def build_ast(nodes):
+    # flatten_ast çıktısından ağacı iterative kur
+    root = None
+    pending = []  # [node, kalan çocuk sayısı]
+    for node_type, value, child_count in nodes:
+        node = ASTNode(node_type, value)
+        if pending:
+            parent = pending[-1]
+            parent[0].children.append(node)
+            parent[1] -= 1
+            if parent[1] == 0:
+                pending.pop()
+        else:
+            root = node
+        if child_count:
+            pending.append([node, child_count])
+    return root
+
+
+def type_codes(*token_types):
+    return frozenset(TOKEN_TYPE_CODES[token_type] for token_type in token_types)
+
+
+# Parser hot path'lerinde token tipleri TokenTable'daki küçük int kodlarıyla
+# karşılaştırılır (Enum hash'i Python seviyesinde, list üyeliği her seferinde yeni liste)
+PREPROCESSOR_CODE = TOKEN_TYPE_CODES[TokenType.PREPROCESSOR]
+SEMICOLON_CODE = TOKEN_TYPE_CODES[TokenType.SEMICOLON]
+COMMA_CODE = TOKEN_TYPE_CODES[TokenType.COMMA]
+LEFT_PAREN_CODE = TOKEN_TYPE_CODES[TokenType.LEFT_PAREN]
+RIGHT_PAREN_CODE = TOKEN_TYPE_CODES[TokenType.RIGHT_PAREN]
+LEFT_BRACKET_CODE = TOKEN_TYPE_CODES[TokenType.LEFT_BRACKET]
+RIGHT_BRACKET_CODE = TOKEN_TYPE_CODES[TokenType.RIGHT_BRACKET]
+LEFT_BRACE_CODE = TOKEN_TYPE_CODES[TokenType.LEFT_BRACE]
+RIGHT_BRACE_CODE = TOKEN_TYPE_CODES[TokenType.RIGHT_BRACE]
+ASSIGN_CODE = TOKEN_TYPE_CODES[TokenType.ASSIGN]
+
+# Parse sırasında atlanan token'lar
+TRIVIA_CODES = type_codes(TokenType.WHITESPACE, TokenType.NEWLINE,
+                          TokenType.SINGLE_COMMENT, TokenType.MULTI_COMMENT)
+# skip_to_next_statement burada durur
+RECOVERY_CODES = type_codes(TokenType.SEMICOLON, TokenType.LEFT_BRACE, TokenType.RIGHT_BRACE,
+                            TokenType.EOF, TokenType.PREPROCESSOR)
+BRACE_CODES = type_codes(TokenType.LEFT_BRACE, TokenType.RIGHT_BRACE)
+PARAMETER_END_CODES = type_codes(TokenType.EOF, TokenType.RIGHT_PAREN)
+
+# Keyword grupları (Keyword id'leri)
+LOCAL_DECLARATION_TYPES = frozenset([Keyword.INT, Keyword.FLOAT, Keyword.CHAR, Keyword.VOID, Keyword.DOUBLE])
+DECLARATION_TYPES = LOCAL_DECLARATION_TYPES | {Keyword.LONG, Keyword.SHORT, Keyword.SIGNED, Keyword.UNSIGNED}
+STATEMENT_KEYWORDS = LOCAL_DECLARATION_TYPES | {Keyword.IF, Keyword.WHILE, Keyword.FOR, Keyword.RETURN}
+SYNC_KEYWORDS = STATEMENT_KEYWORDS - {Keyword.DOUBLE}
+
+# Expression engine tabloları
+# Binary operatörler: tip kodu -> (binding power, sağdan birleşmeli mi, node tipi); C öncelik sırası
+BINARY_OPERATORS = {TOKEN_TYPE_CODES[token_type]: entry for token_type, entry in (
+    (TokenType.ASSIGN, (1, True, "Assignment")),
+    (TokenType.OR, (2, False, "BinaryOp")),
+    (TokenType.AND, (3, False, "BinaryOp")),
+    (TokenType.BITWISE_OR, (4, False, "BinaryOp")),
+    (TokenType.BITWISE_XOR, (5, False, "BinaryOp")),
+    (TokenType.BITWISE_AND, (6, False, "BinaryOp")),
+    (TokenType.EQUAL, (7, False, "BinaryOp")),
+    (TokenType.NOT_EQUAL, (7, False, "BinaryOp")),
+    (TokenType.LESS, (8, False, "BinaryOp")),
+    (TokenType.LESS_EQUAL, (8, False, "BinaryOp")),
+    (TokenType.GREATER, (8, False, "BinaryOp")),
+    (TokenType.GREATER_EQUAL, (8, False, "BinaryOp")),
+    (TokenType.LEFT_SHIFT, (9, False, "BinaryOp")),
+    (TokenType.RIGHT_SHIFT, (9, False, "BinaryOp")),
+    (TokenType.PLUS, (10, False, "BinaryOp")),
+    (TokenType.MINUS, (10, False, "BinaryOp")),
+    (TokenType.MULTIPLY, (11, False, "BinaryOp")),
+    (TokenType.DIVIDE, (11, False, "BinaryOp")),
+    (TokenType.MODULO, (11, False, "BinaryOp")),
+)}
+
+# Unary: !x -x +x ~x ++x --x &x *x
+PREFIX_OPERATORS = type_codes(
+    TokenType.NOT, TokenType.MINUS, TokenType.PLUS, TokenType.BITWISE_NOT,
+    TokenType.INCREMENT, TokenType.DECREMENT, TokenType.BITWISE_AND, TokenType.MULTIPLY,
+)
+PREFIX_BINDING_POWER = 12
+
+POSTFIX_OPERATORS = type_codes(TokenType.INCREMENT, TokenType.DECREMENT)
+MEMBER_OPERATORS = type_codes(TokenType.DOT, TokenType.ARROW)
+# Açık bir parantez/call/index marker'ı varken ele alınan token'lar
+MARKER_CLOSE_CODES = type_codes(TokenType.RIGHT_PAREN, TokenType.RIGHT_BRACKET, TokenType.COMMA)
+
+LITERAL_NODES = {
+    TOKEN_TYPE_CODES[TokenType.IDENTIFIER]: "Identifier",
+    TOKEN_TYPE_CODES[TokenType.INTEGER]: "Integer",
+    TOKEN_TYPE_CODES[TokenType.FLOAT]: "Float",
+    TOKEN_TYPE_CODES[TokenType.CHARACTER]: "Character",
+    TOKEN_TYPE_CODES[TokenType.STRING]: "String",
+}
+
+# Operand yerine gelince hata vermeden ifadeyi bitiren token'lar
+EXPRESSION_TERMINATORS = type_codes(
+    TokenType.EOF, TokenType.SEMICOLON, TokenType.RIGHT_PAREN, TokenType.RIGHT_BRACE,
+    TokenType.RIGHT_BRACKET,
+)
+
 
 class CParser:
     #Recursive Descent Parser
 
     def __init__(self, tokens):
         self.tokens = tokens
+        self.token_count = len(tokens)
+        # Tip kodları: TokenTable'ın kolonu veya Token listesinden üretilen array
+        # ve keyword id'leri (KEYWORD olmayan token'lar için anlamsız)
+        if isinstance(tokens, TokenTable):
+            self.types = tokens.types
+            self.symbols = tokens.symbols
+            self.value_at = tokens.value
+        else:
+            self.types = array('H', [TOKEN_TYPE_CODES[token.type] for token in tokens])
+            self.symbols = array('I', [token.keyword or 0 for token in tokens])
+            self.value_at = lambda index: tokens[index].value
         self.current = 0
+        self.cached_index = -1
+        self.cached_token = None
         self.errors = []
+        self.error_positions = []  # Her hatanın kaynak koddaki offset'i
+        self.error_records = []  # (mesaj, token index): incremental parse'ta hata metni yeniden üretilir
+        self.program = None
+        self.segments = []  # Top-level öğeler: (start, end, node, error_records)
         self.max_errors = 50  # Maksimum hata sayısı
         self.recursion_depth = 0
         self.max_recursion_depth = 100  # Maksimum recursion derinliği
 
     def current_token(self):
         """Şu anki token"""
-        if self.current < len(self.tokens):
-            return self.tokens[self.current]
-        return Token(TokenType.EOF, "", 0, 0)
+        current = self.current
+        if current == self.cached_index:
+            return self.cached_token
+        if current < self.token_count:
+            token = self.tokens[current]
+        else:
+            token = Token(TokenType.EOF, "", 0, 0)
+        # Aynı token art arda defalarca sorgulanıyor; TokenTable'dan her
+        # seferinde yeni bir Token üretmemek için son token'ı tut
+        self.cached_index = current
+        self.cached_token = token
+        return token
+
+    def current_type(self):
+        """Şu anki token'ın tip kodu"""
+        current = self.current
+        if current < self.token_count:
+            return self.types[current]
+        return EOF_CODE
+
+    def current_keyword(self):
+        """Şu anki token keyword ise Keyword id'si, değilse 0"""
+        current = self.current
+        if current < self.token_count and self.types[current] == KEYWORD_CODE:
+            return self.symbols[current]
+        return 0
+
+    def current_value(self):
+        """Şu anki token'ın değeri; Token nesnesi üretmeden"""
+        current = self.current
+        if current < self.token_count:
+            return self.value_at(current)
+        return ""
 
     def peek_token(self, offset=1):
         pos = self.current + offset
@@ -53,7 +234,7 @@ class CParser:
         return Token(TokenType.EOF, "", 0, 0)
 
     def advance(self):
-        if self.current < len(self.tokens):
+        if self.current < self.token_count:
             self.current += 1
 
     def match(self, expected_type):
@@ -71,8 +252,16 @@ class CParser:
 
     def add_error(self, message):
         if len(self.errors) < self.max_errors:
-            current_token = self.current_token()
-            self.errors.append(f"{message} at line {current_token.line}, column {current_token.column}")
+            self.record_error(message, self.current)
+
+    def record_error(self, message, index):
+        if index < self.token_count:
+            token = self.tokens[index]
+        else:
+            token = Token(TokenType.EOF, "", 0, 0)
+        self.errors.append(f"{message} at line {token.line}, column {token.column}")
+        self.error_positions.append(token.start)
+        self.error_records.append((message, index))
 
     def check_recursion_depth(self):
         if self.recursion_depth > self.max_recursion_depth:
@@ -89,30 +278,22 @@ class CParser:
 
     def skip_to_next_statement(self):
         #bir sonraki statement'a atla hata recovery için
-        recovery_tokens = [
-            TokenType.SEMICOLON, TokenType.LEFT_BRACE, TokenType.RIGHT_BRACE,
-            TokenType.EOF, TokenType.PREPROCESSOR
-        ]
-
-        statement_keywords = ['if', 'while', 'for', 'return', 'int', 'float', 'char', 'void', 'double']
-
         start_pos = self.current
 
-        while (self.current_token().type != TokenType.EOF and
-               self.current < len(self.tokens) and
+        while (self.current_type() != EOF_CODE and
+               self.current < self.token_count and
                self.current - start_pos < 100):
 
-            current = self.current_token()
+            token_type = self.current_type()
 
             # Recovery token bulundu
-            if current.type in recovery_tokens:
-                if current.type == TokenType.SEMICOLON:
+            if token_type in RECOVERY_CODES:
+                if token_type == SEMICOLON_CODE:
                     self.advance()
                 break
 
             # Statement başlatan keyword bulundu
-            if (current.type == TokenType.KEYWORD and
-                current.value in statement_keywords):
+            if self.current_keyword() in STATEMENT_KEYWORDS:
                 break
 
             self.advance()
@@ -122,15 +303,18 @@ class CParser:
         depth = 1
         start_pos = self.current
 
-        while (self.current_token().type != TokenType.EOF and
+        open_code = TOKEN_TYPE_CODES[open_token]
+        close_code = TOKEN_TYPE_CODES[close_token]
+
+        while (self.current_type() != EOF_CODE and
                depth > 0 and
                self.current - start_pos < 200):
 
-            current = self.current_token()
+            token_type = self.current_type()
 
-            if current.type == open_token:
+            if token_type == open_code:
                 depth += 1
-            elif current.type == close_token:
+            elif token_type == close_code:
                 depth -= 1
 
             self.advance()
@@ -139,57 +323,131 @@ class CParser:
         #major syntax error'dan sonra
         self.advance()  # Geçerli token'ı atla
 
-        while self.current_token().type != TokenType.EOF:
-            if self.current_token().type == TokenType.SEMICOLON:
+        while self.current_type() != EOF_CODE:
+            token_type = self.current_type()
+            if token_type == SEMICOLON_CODE:
                 self.advance()
                 return
 
             # Statement başlatan keyword'ler
-            if (self.current_token().type == TokenType.KEYWORD and
-                self.current_token().value in ['if', 'while', 'for', 'return', 'int', 'float', 'char', 'void']):
+            if self.current_keyword() in SYNC_KEYWORDS:
                 return
 
             # Function/class level delimiters
-            if self.current_token().type in [TokenType.LEFT_BRACE, TokenType.RIGHT_BRACE]:
+            if token_type in BRACE_CODES:
                 return
 
             self.advance()
 
     def parse_program(self):
-        program = ASTNode("Program")
+        self.program = ASTNode("Program")
+        self.segments = []
+        self.parse_top_level_items()
+        return self.program
+
+    def reparse_program(self, previous, first, old_end, new_end):
+        """previous parser'ın ağacını kullanarak sadece değişen top-level öğeleri parse et.
+        Token'lar [first, old_end) aralığından [first, new_end) aralığına değişmiş olmalı."""
+        # Hata limiti dolduysa önceki parse yarıda kalmıştır, segment'ler eksik
+        if len(previous.errors) >= previous.max_errors:
+            return self.parse_program()
+
+        self.program = ASTNode("Program")
+        self.segments = []
+        old_segments = previous.segments
+        delta = new_end - old_end
+
+        # Lookahead token'ı (end) dahil değişikliğin önünde kalan öğeler aynen kalır
+        kept = 0
+        while kept < len(old_segments) and old_segments[kept][1] < first:
+            self.reuse_segment(old_segments[kept], 0)
+            kept += 1
+        self.current = old_segments[kept - 1][1] if kept else 0
+
+        # Değişiklikten sonra eski bir öğenin başladığı token'a gelinirse
+        # kalan öğeler de aynıdır (top-level'da parser state'i yok)
+        old_starts = {}
+        for index in range(kept, len(old_segments)):
+            old_starts[old_segments[index][0]] = index
+
+        def resync(start):
+            if start < new_end:
+                return False
+            index = old_starts.get(start - delta)
+            if index is None:
+                return False
+            for segment in old_segments[index:]:
+                self.reuse_segment(segment, delta)
+            return True
 
-        while self.current_token().type != TokenType.EOF:
+        self.parse_top_level_items(resync)
+
+        # Hata limiti aşıldıysa tam parse'la aynı sonuç garanti değil
+        if len(self.errors) >= self.max_errors:
+            self.current = 0
+            self.errors = []
+            self.error_positions = []
+            self.error_records = []
+            return self.parse_program()
+        return self.program
+
+    def reuse_segment(self, segment, delta):
+        start, end, node, error_records = segment
+        if delta:
+            start += delta
+            end += delta
+            error_records = [(message, index + delta) for message, index in error_records]
+        for message, index in error_records:
+            self.record_error(message, index)
+        if node is not None:
+            node.token_span = (start, end)
+            self.program.add_child(node)
+        self.segments.append((start, end, node, error_records))
+
+    def parse_top_level_items(self, resync=None, stop=None):
+        # stop: bu token index'inde veya sonrasında başlayan öğeye gelince dur
+        program = self.program
+
+        while self.current_type() != EOF_CODE:
             # Hata sayısı kontrolü
             if len(self.errors) >= self.max_errors:
                 self.add_error("Too many errors, stopping parsing")
                 break
 
             # Whitespace ve comment'ları atla
-            if self.current_token().type in [TokenType.WHITESPACE, TokenType.NEWLINE,
-                                           TokenType.SINGLE_COMMENT, TokenType.MULTI_COMMENT]:
+            if self.current_type() in TRIVIA_CODES:
                 self.advance()
                 continue
 
+            start = self.current
+            if stop is not None and start >= stop:
+                return
+            if resync is not None and resync(start):
+                return
+
+            error_count = len(self.error_records)
+            self.recursion_depth = 0  # Top-level'da derinlik her zaman 0
+            node = None
+
             # Preprocessor directive'leri
-            if self.current_token().type == TokenType.PREPROCESSOR:
+            if self.current_type() == PREPROCESSOR_CODE:
                 node = self.parse_preprocessor()
-                if node:
-                    program.add_child(node)
-                continue
-
-            # Function declaration/definition veya variable declaration
-            try:
-                declaration = self.parse_declaration()
-                if declaration:
-                    program.add_child(declaration)
-                else:
-                    # Hata durumunda synchronize et
+            else:
+                # Function declaration/definition veya variable declaration
+                try:
+                    node = self.parse_declaration()
+                    if not node:
+                        # Hata durumunda synchronize et
+                        self.synchronize()
+                except Exception as e:
+                    node = None
+                    self.add_error(f"Unexpected error in declaration: {str(e)}")
                     self.synchronize()
-            except Exception as e:
-                self.add_error(f"Unexpected error in declaration: {str(e)}")
-                self.synchronize()
 
-        return program
+            if node:
+                node.token_span = (start, self.current)
+                program.add_child(node)
+            self.segments.append((start, self.current, node, self.error_records[error_count:]))
 
     def parse_preprocessor(self):
         token = self.match(TokenType.PREPROCESSOR)
@@ -200,17 +458,15 @@ class CParser:
     def parse_declaration(self):
         #variable veya function
         # Type specifier bekliyoruz (int, float, char, void, etc.)
-        if self.current_token().type != TokenType.KEYWORD:
+        if self.current_keyword() not in DECLARATION_TYPES:
             return None
 
         type_token = self.current_token()
-        if type_token.value not in ['int', 'float', 'char', 'void', 'double', 'long', 'short', 'signed', 'unsigned']:
-            return None
 
         self.advance()  # Type'ı consume et
 
         # Identifier bekliyoruz
-        if self.current_token().type != TokenType.IDENTIFIER:
+        if self.current_type() != IDENTIFIER_CODE:
             self.add_error(f"Expected identifier after type '{type_token.value}'")
             return None
 
@@ -218,7 +474,7 @@ class CParser:
         self.advance()
 
         # Function mı variable mı kontrol et
-        if self.current_token().type == TokenType.LEFT_PAREN:
+        if self.current_type() == LEFT_PAREN_CODE:
             # Function declaration/definition
             return self.parse_function(type_token, identifier)
         else:
@@ -246,7 +502,7 @@ class CParser:
                 self.skip_until_balanced(TokenType.LEFT_PAREN, TokenType.RIGHT_PAREN)
 
             # Function body veya sadece declaration
-            if self.current_token().type == TokenType.LEFT_BRACE:
+            if self.current_type() == LEFT_BRACE_CODE:
                 # Function definition
                 body = self.parse_compound_statement()
                 if body:
@@ -263,20 +519,20 @@ class CParser:
         """Parameter listesi parse et"""
         params = ASTNode("Parameters")
 
-        if self.current_token().type == TokenType.RIGHT_PAREN:
+        if self.current_type() == RIGHT_PAREN_CODE:
             return params  # Boş parameter listesi
 
         while True:
             # Güvenlik kontrolü
-            if self.current_token().type in [TokenType.EOF, TokenType.RIGHT_PAREN]:
+            if self.current_type() in PARAMETER_END_CODES:
                 break
 
             # Parameter: type identifier
-            if self.current_token().type == TokenType.KEYWORD:
+            if self.current_type() == KEYWORD_CODE:
                 type_token = self.current_token()
                 self.advance()
 
-                if self.current_token().type == TokenType.IDENTIFIER:
+                if self.current_type() == IDENTIFIER_CODE:
                     param_name = self.current_token()
                     self.advance()
 
@@ -291,7 +547,7 @@ class CParser:
                 break
 
             # Comma ile ayrılmış parametreler
-            if self.current_token().type == TokenType.COMMA:
+            if self.current_type() == COMMA_CODE:
                 self.advance()
             else:
                 break
@@ -304,7 +560,7 @@ class CParser:
         var_node.add_child(ASTNode("Type", type_token.value))
 
         # Array declaration kontrol et
-        if self.current_token().type == TokenType.LEFT_BRACKET:
+        if self.current_type() == LEFT_BRACKET_CODE:
             self.advance()
             # Array size (şimdilik basit integer)
             if self.current_token().type == TokenType.INTEGER:
@@ -316,7 +572,7 @@ class CParser:
                 self.skip_until_balanced(TokenType.LEFT_BRACKET, TokenType.RIGHT_BRACKET)
 
         # Initialization
-        if self.current_token().type == TokenType.ASSIGN:
+        if self.current_type() == ASSIGN_CODE:
             self.advance()
             init_expr = self.parse_expression()
             if init_expr:
@@ -336,12 +592,13 @@ class CParser:
 
             block = ASTNode("Block")
 
-            while (self.current_token().type != TokenType.RIGHT_BRACE and
-                   self.current_token().type != TokenType.EOF):
+            while True:
+                token_type = self.current_type()
+                if token_type == RIGHT_BRACE_CODE or token_type == EOF_CODE:
+                    break
 
                 # Whitespace ve comment'ları atla
-                if self.current_token().type in [TokenType.WHITESPACE, TokenType.NEWLINE,
-                                                 TokenType.SINGLE_COMMENT, TokenType.MULTI_COMMENT]:
+                if token_type in TRIVIA_CODES:
                     self.advance()
                     continue
 
@@ -362,24 +619,16 @@ class CParser:
             return None
 
         try:
-            token = self.current_token()
+            token_type = self.current_type()
 
-            # Control flow statements
-            if token.type == TokenType.KEYWORD:
-                if token.value == "if":
-                    return self.parse_if_statement()
-                elif token.value == "while":
-                    return self.parse_while_statement()
-                elif token.value == "for":
-                    return self.parse_for_statement()
-                elif token.value == "return":
-                    return self.parse_return_statement()
-                elif token.value in ['int', 'float', 'char', 'void', 'double']:
-                    # Local variable declaration
-                    return self.parse_declaration()
+            # Control flow statements ve local variable declaration
+            if token_type == KEYWORD_CODE:
+                statement_parser = self.statement_parsers.get(self.current_keyword())
+                if statement_parser is not None:
+                    return statement_parser(self)
 
             # Compound statement
-            if token.type == TokenType.LEFT_BRACE:
+            if token_type == LEFT_BRACE_CODE:
                 return self.parse_compound_statement()
 
             # Expression statement
@@ -411,8 +660,7 @@ class CParser:
             if_node.add_child(ASTNode("ThenStatement").add_child(then_stmt))
 
         # Else clause
-        if (self.current_token().type == TokenType.KEYWORD and
-            self.current_token().value == "else"):
+        if self.current_keyword() == Keyword.ELSE:
             self.advance()
             else_stmt = self.parse_statement()
             if else_stmt:
@@ -451,9 +699,8 @@ class CParser:
         for_node = ASTNode("ForStatement")
 
         # Initialization (optional)
-        if self.current_token().type != TokenType.SEMICOLON:
-            if (self.current_token().type == TokenType.KEYWORD and
-                self.current_token().value in ['int', 'float', 'char', 'void', 'double']):
+        if self.current_type() != SEMICOLON_CODE:
+            if self.current_keyword() in LOCAL_DECLARATION_TYPES:
                 # Variable declaration
                 init_stmt = self.parse_declaration()
             else:
@@ -472,7 +719,7 @@ class CParser:
             for_node.add_child(ASTNode("Initialization"))
 
         # Condition (optional)
-        if self.current_token().type != TokenType.SEMICOLON:
+        if self.current_type() != SEMICOLON_CODE:
             condition = self.parse_expression()
             if condition:
                 for_node.add_child(ASTNode("Condition").add_child(condition))
@@ -482,7 +729,7 @@ class CParser:
         self.expect(TokenType.SEMICOLON)
 
         # Increment/Update (optional)
-        if self.current_token().type != TokenType.RIGHT_PAREN:
+        if self.current_type() != RIGHT_PAREN_CODE:
             increment = self.parse_expression()
             if increment:
                 for_node.add_child(ASTNode("Increment").add_child(increment))
@@ -506,7 +753,7 @@ class CParser:
         return_node = ASTNode("ReturnStatement")
 
         # Optional return value
-        if self.current_token().type != TokenType.SEMICOLON:
+        if self.current_type() != SEMICOLON_CODE:
             expr = self.parse_expression()
             if expr:
                 return_node.add_child(expr)
@@ -520,336 +767,466 @@ class CParser:
             return None
 
         try:
-            return self.parse_assignment_expression()
+            return self.parse_operator_expression()
         finally:
             self.exit_recursion()
 
-    def parse_assignment_expression(self):
-        """Assignment expression parse et"""
-        left = self.parse_logical_or_expression()
-
-        if self.current_token().type == TokenType.ASSIGN:
-            op = self.current_token()
-            self.advance()
-            right = self.parse_assignment_expression()
-
-            if left and right:
-                assign_node = ASTNode("Assignment", op.value)
-                assign_node.add_child(left)
-                assign_node.add_child(right)
-                return assign_node
+    def parse_operator_expression(self):
+        """Precedence climbing; operand ve operatör stack'leri ile, recursion olmadan.
+        Parantez, fonksiyon çağrısı ve dizi index'i operatör stack'inde marker olarak tutulur."""
+        operands = []
+        operators = []  # (kind, binding power, sağdan birleşmeli, veri); marker'ların power'ı 0
+        open_markers = 0
 
-        return left
-
-    def parse_logical_or_expression(self):
-        """Logical OR expression parse et"""
-        left = self.parse_logical_and_expression()
-
-        while self.current_token().type == TokenType.OR:
-            op = self.current_token()
-            self.advance()
-            right = self.parse_logical_and_expression()
-
-            if left and right:
-                binary_node = ASTNode("BinaryOp", op.value)
-                binary_node.add_child(left)
-                binary_node.add_child(right)
-                left = binary_node
-            else:
-                break
-
-        return left
-
-    def parse_logical_and_expression(self):
-        """Logical AND expression parse et"""
-        left = self.parse_equality_expression()
-
-        while self.current_token().type == TokenType.AND:
-            op = self.current_token()
-            self.advance()
-            right = self.parse_equality_expression()
+        while True:
+            # Prefix pozisyonu: unary operatörler, '(' veya bir operand bekleniyor
+            token_type = self.current_type()
 
-            if left and right:
-                binary_node = ASTNode("BinaryOp", op.value)
-                binary_node.add_child(left)
-                binary_node.add_child(right)
-                left = binary_node
-            else:
-                break
+            if token_type in PREFIX_OPERATORS:
+                operators.append(('prefix', PREFIX_BINDING_POWER, True, self.current_value()))
+                self.advance()
+                continue
 
-        return left
+            if token_type == LEFT_PAREN_CODE:
+                self.advance()
+                operators.append(('group', 0, False, None))
+                open_markers += 1
+                continue
 
-    def parse_equality_expression(self):
-        """Equality expression parse et"""
-        left = self.parse_relational_expression()
+            operands.append(self.parse_primary_expression())
 
-        while self.current_token().type in [TokenType.EQUAL, TokenType.NOT_EQUAL]:
-            op = self.current_token()
-            self.advance()
-            right = self.parse_relational_expression()
+            # Infix/postfix pozisyonu
+            while True:
+                token_type = self.current_type()
 
-            if left and right:
-                binary_node = ASTNode("BinaryOp", op.value)
-                binary_node.add_child(left)
-                binary_node.add_child(right)
-                left = binary_node
-            else:
-                break
+                binary = BINARY_OPERATORS.get(token_type)
+                if binary is not None:
+                    binding_power, right_associative, node_type = binary
+                    while operators and self.should_reduce(operators[-1], binding_power, right_associative):
+                        self.reduce_operator(operators.pop(), operands)
+                    operators.append(('binary', binding_power, right_associative,
+                                      (node_type, self.current_value())))
+                    self.advance()
+                    break
 
-        return left
+                # Operand parse edilemediyse postfix, member, call ve index yok;
+                # bu token'lar ifadeyi bitirir, hatayı ifadeyi çağıran verir
+                has_operand = operands[-1] is not None
 
-    def parse_relational_expression(self):
-        """Relational expression parse et"""
-        left = self.parse_additive_expression()
+                if has_operand and token_type in POSTFIX_OPERATORS:
+                    # Postfix en sıkı bağlanan operatör: bekleyen prefix'lerden önce uygulanır
+                    value = self.current_value()
+                    self.advance()
+                    operands[-1] = ASTNode("PostfixOp", value).add_child(operands[-1])
+                    continue
 
-        while self.current_token().type in [TokenType.LESS, TokenType.LESS_EQUAL,
-                                          TokenType.GREATER, TokenType.GREATER_EQUAL]:
-            op = self.current_token()
-            self.advance()
-            right = self.parse_additive_expression()
+                if has_operand and token_type in MEMBER_OPERATORS:
+                    value = self.current_value()
+                    self.advance()
+                    member = self.expect(TokenType.IDENTIFIER)
+                    if member:
+                        operands[-1] = (ASTNode("MemberAccess", value)
+                                        .add_child(operands[-1])
+                                        .add_child(ASTNode("Identifier", member.value)))
+                    continue
 
-            if left and right:
-                binary_node = ASTNode("BinaryOp", op.value)
-                binary_node.add_child(left)
-                binary_node.add_child(right)
-                left = binary_node
-            else:
-                break
+                if has_operand and token_type == LEFT_PAREN_CODE:
+                    # Function call
+                    self.advance()
+                    call = [operands.pop(), ASTNode("Arguments")]
+                    if self.current_type() == RIGHT_PAREN_CODE:
+                        self.advance()
+                        operands.append(self.build_call(call))
+                        continue
+                    operators.append(('call', 0, False, call))
+                    open_markers += 1
+                    break
 
-        return left
+                if has_operand and token_type == LEFT_BRACKET_CODE:
+                    # Array access
+                    self.advance()
+                    operators.append(('index', 0, False, operands.pop()))
+                    open_markers += 1
+                    break
 
-    def parse_additive_expression(self):
-        """Additive expression parse et"""
-        left = self.parse_multiplicative_expression()
+                if open_markers and token_type in MARKER_CLOSE_CODES:
+                    self.reduce_to_marker(operators, operands)
+                    kind, _, _, data = operators[-1]
+                    if kind == 'call' and token_type == COMMA_CODE:
+                        # Sonraki argümana geç
+                        self.advance()
+                        argument = operands.pop()
+                        if argument is not None:
+                            data[1].add_child(argument)
+                        break
+                    closing = RIGHT_BRACKET_CODE if kind == 'index' else RIGHT_PAREN_CODE
+                    if token_type == closing:
+                        self.advance()
+                        operators.pop()
+                        open_markers -= 1
+                        self.close_marker(kind, data, operands)
+                        continue
+
+                # İfade bitti; kapanmamış parantez/bracket varsa hata ver ve atla
+                if open_markers:
+                    self.reduce_to_marker(operators, operands)
+                    kind, _, _, data = operators.pop()
+                    open_markers -= 1
+                    if kind == 'index':
+                        if not self.expect(TokenType.RIGHT_BRACKET):
+                            self.skip_until_balanced(TokenType.LEFT_BRACKET, TokenType.RIGHT_BRACKET)
+                    elif not self.expect(TokenType.RIGHT_PAREN):
+                        self.skip_until_balanced(TokenType.LEFT_PAREN, TokenType.RIGHT_PAREN)
+                    self.close_marker(kind, data, operands)
+                    continue
 
-        while self.current_token().type in [TokenType.PLUS, TokenType.MINUS]:
-            op = self.current_token()
-            self.advance()
-            right = self.parse_multiplicative_expression()
+                while operators:
+                    self.reduce_operator(operators.pop(), operands)
+                return operands[-1] if operands else None
 
-            if left and right:
-                binary_node = ASTNode("BinaryOp", op.value)
-                binary_node.add_child(left)
-                binary_node.add_child(right)
-                left = binary_node
+    def should_reduce(self, entry, binding_power, right_associative):
+        top_power = entry[1]
+        if top_power == 0:  # Marker
+            return False
+        return top_power > binding_power or (top_power == binding_power and not right_associative)
+
+    def reduce_to_marker(self, operators, operands):
+        while operators[-1][1] != 0:
+            self.reduce_operator(operators.pop(), operands)
+
+    def reduce_operator(self, entry, operands):
+        kind, _, _, data = entry
+        if kind == 'prefix':
+            expr = operands.pop()
+            operands.append(ASTNode("UnaryOp", data).add_child(expr) if expr else None)
+            return
+
+        right = operands.pop()
+        left = operands.pop()
+        if left and right:
+            node_type, value = data
+            operands.append(ASTNode(node_type, value).add_child(left).add_child(right))
+        else:
+            operands.append(left)
+
+    def close_marker(self, kind, data, operands):
+        if kind == 'call':
+            argument = operands.pop()
+            if argument is not None:
+                data[1].add_child(argument)
+            operands.append(self.build_call(data))
+        elif kind == 'index':
+            index = operands.pop()
+            if index and data is not None:
+                operands.append(ASTNode("ArrayAccess").add_child(data).add_child(index))
             else:
-                break
+                operands.append(data)
+        # 'group': içteki ifade operand olarak kalır
 
-        return left
+    def build_call(self, call):
+        callee, args = call
+        call_node = ASTNode("FunctionCall")
+        call_node.add_child(callee)
+        call_node.add_child(args)
+        return call_node
 
-    def parse_multiplicative_expression(self):
-        """Multiplicative expression parse et"""
-        left = self.parse_unary_expression()
-
-        while self.current_token().type in [TokenType.MULTIPLY, TokenType.DIVIDE, TokenType.MODULO]:
-            op = self.current_token()
-            self.advance()
-            right = self.parse_unary_expression()
-
-            if left and right:
-                binary_node = ASTNode("BinaryOp", op.value)
-                binary_node.add_child(left)
-                binary_node.add_child(right)
-                left = binary_node
-            else:
-                break
-
-        return left
+    def parse_primary_expression(self):
+        """Primary expression parse et"""
+        token_type = self.current_type()
 
-    def parse_unary_expression(self):
-        """Unary expression parse et"""
-        if self.current_token().type in [TokenType.NOT, TokenType.MINUS, TokenType.PLUS]:
-            op = self.current_token()
+        node_type = LITERAL_NODES.get(token_type)
+        if node_type is not None:
+            node = ASTNode(node_type, self.current_value())
             self.advance()
-            expr = self.parse_unary_expression()
-
-            if expr:
-                unary_node = ASTNode("UnaryOp", op.value)
-                unary_node.add_child(expr)
-                return unary_node
-
-        return self.parse_postfix_expression()
-
-    def parse_postfix_expression(self):
-        """Postfix expression parse et"""
-        left = self.parse_primary_expression()
-        if not left:
-            return None
-
-        iteration_count = 0
-        max_iterations = 50  # Sonsuz döngü koruması
-
-        while iteration_count < max_iterations:
-            iteration_count += 1
+            return node
 
-            if self.current_token().type == TokenType.LEFT_PAREN:
-                # Function call
-                self.advance()
-                args = self.parse_argument_list()
-                if not self.expect(TokenType.RIGHT_PAREN):
-                    self.skip_until_balanced(TokenType.LEFT_PAREN, TokenType.RIGHT_PAREN)
-
-                call_node = ASTNode("FunctionCall")
-                call_node.add_child(left)
-                if args:
-                    call_node.add_child(args)
-                left = call_node
-
-            elif self.current_token().type == TokenType.LEFT_BRACKET:
-                # Array access
-                self.advance()
-                index = self.parse_expression()
-                if not self.expect(TokenType.RIGHT_BRACKET):
-                    self.skip_until_balanced(TokenType.LEFT_BRACKET, TokenType.RIGHT_BRACKET)
-
-                if index:
-                    array_node = ASTNode("ArrayAccess")
-                    array_node.add_child(left)
-                    array_node.add_child(index)
-                    left = array_node
+        # Unexpected token için hata ver ama None dönme
+        if token_type not in EXPRESSION_TERMINATORS:
+            self.add_error(f"Unexpected token {TOKEN_TYPES[token_type]}")
+            self.advance()  # Skip the problematic token
+        return None
 
-            else:
+    # parse_statement dispatch tablosu: Keyword id -> parser metodu
+    statement_parsers = {
+        Keyword.IF: parse_if_statement,
+        Keyword.WHILE: parse_while_statement,
+        Keyword.FOR: parse_for_statement,
+        Keyword.RETURN: parse_return_statement,
+        # Local variable declaration (LOCAL_DECLARATION_TYPES)
+        Keyword.INT: parse_declaration,
+        Keyword.FLOAT: parse_declaration,
+        Keyword.CHAR: parse_declaration,
+        Keyword.VOID: parse_declaration,
+        Keyword.DOUBLE: parse_declaration,
+    }
+
+
+# Paralel parse: token akışı top-level '}' sınırlarından parçalara bölünür,
+# parçalar process pool'da parse edilip kaynak sırasıyla birleştirilir
+PARALLEL_MIN_TOKENS = 20000
+CHUNKS_PER_JOB = 4
+
+parse_worker_tokens = None  # Worker process'teki token tablosu (initializer ile)
+
+
+def split_top_level(tokens, chunk_count):
+    # Brace derinliği 0'a dönen '}' sonrasından, yaklaşık eşit parçalara böl.
+    # Dönüş: [(start, stop), ...] token index aralıkları
+    token_count = len(tokens)
+    target = max(1, token_count // max(1, chunk_count))
+    ranges = []
+    chunk_start = 0
+    depth = 0
+    for index, type_code in enumerate(tokens.types):
+        if type_code == LEFT_BRACE_CODE:
+            depth += 1
+        elif type_code == RIGHT_BRACE_CODE and depth > 0:
+            depth -= 1
+            if depth == 0 and index + 1 - chunk_start >= target:
+                ranges.append((chunk_start, index + 1))
+                chunk_start = index + 1
+    ranges.append((chunk_start, token_count))
+    return ranges
+
+
+def init_parse_worker(tokens):
+    global parse_worker_tokens
+    parse_worker_tokens = tokens
+
+
+def parse_token_range(token_range):
+    start, stop = token_range
+    parser = CParser(parse_worker_tokens)
+    parser.program = ASTNode("Program")
+    parser.current = start
+    parser.parse_top_level_items(stop=stop)
+    return parser.segments, len(parser.errors) >= parser.max_errors
+
+
+def parse_program_parallel(tokens, jobs=None):
+    """Top-level öğeleri process pool'da parse et; sonuç sıralı parse_program ile aynıdır"""
+    jobs = jobs or os.cpu_count() or 1
+    parser = CParser(tokens)
+    if jobs < 2 or len(tokens) < PARALLEL_MIN_TOKENS:
+        parser.parse_program()
+        return parser
+
+    ranges = split_top_level(tokens, jobs * CHUNKS_PER_JOB)
+    with Pool(processes=jobs, initializer=init_parse_worker, initargs=(tokens,)) as pool:
+        results = pool.map(parse_token_range, ranges)
+
+    # Bir parça hata limitine ulaştıysa yarıda kalmıştır
+    if any(error_limit for _, error_limit in results):
+        parser.parse_program()
+        return parser
+
+    # Hata limiti aşıldıysa sıralı parse ile aynı sonuç garanti değil
+    if not merge_parsed_chunks(parser, [segments for segments, _ in results]):
+        parser = CParser(tokens)
+        parser.parse_program()
+    return parser
+
+
+def merge_parsed_chunks(parser, chunks):
+    parser.program = ASTNode("Program")
+    for chunk_segments in chunks:
+        index = 0
+        while index < len(chunk_segments):
+            # Parça başı gerçek bir öğe başı değilse (bir önceki öğe sınırı
+            # aştıysa) aradaki kısım sıralı parse edilir
+            parser.parse_top_level_items(stop=chunk_segments[index][0])
+            if len(parser.errors) >= parser.max_errors:
+                return False
+            position = parser.current
+            while index < len(chunk_segments) and chunk_segments[index][0] < position:
+                index += 1
+            if index < len(chunk_segments) and chunk_segments[index][0] == position:
+                for segment in chunk_segments[index:]:
+                    parser.reuse_segment(segment, 0)
+                parser.current = chunk_segments[-1][1]
                 break
+    parser.parse_top_level_items()
+    return len(parser.errors) < parser.max_errors
 
-        if iteration_count >= max_iterations:
-            self.add_error("Maximum iterations exceeded in postfix expression")
-
-        return left
 
-    def parse_argument_list(self):
-        """Argument listesi parse et"""
-        args = ASTNode("Arguments")
+def count_token_types(tokens):
+    # TokenType -> adet (EOF hariç), ilk görülme sırasıyla
+    if isinstance(tokens, TokenTable):
+        counts = {TOKEN_TYPES[code]: count for code, count in Counter(tokens.types).items()}
+    else:
+        counts = dict(Counter(token.type for token in tokens))
+    counts.pop(TokenType.EOF, None)
+    return counts
 
-        if self.current_token().type == TokenType.RIGHT_PAREN:
-            return args  # Boş argument listesi
 
-        arg_count = 0
-        max_args = 50  # Sonsuz döngü koruması
+def format_token_distribution(token_counts):
+    lines = ["Token distribution:\n"]
+    for token_type, count in sorted(token_counts.items(), key=lambda x: x[1], reverse=True):
+        lines.append(f"  {token_type.name}: {count}\n")
+    return ''.join(lines)
 
-        while arg_count < max_args and self.current_token().type != TokenType.RIGHT_PAREN:
-            arg_count += 1
 
-            expr = self.parse_expression()
-            if expr:
-                args.add_child(expr)
+def format_token_info(tokens, token_counts=None):
+    if not tokens:
+        return "No tokens available"
 
-            if self.current_token().type == TokenType.COMMA:
-                self.advance()
-            else:
-                break
+    if token_counts is None:
+        token_counts = count_token_types(tokens)
+    token_lines = [f"{token_type.name}: {value}\n"
+                   for token_type, value, *_ in token_rows(tokens) if token_type != TokenType.EOF]
+    return (f"Total tokens: {len(tokens)}\n\n" + format_token_distribution(token_counts) +
+            "\n---TOKENS---:\n" + ''.join(token_lines))
 
-        return args
 
-    def parse_primary_expression(self):
-        """Primary expression parse et"""
-        token = self.current_token()
+def format_parse_info(ast, errors, ast_text=None):
+    # ast_text verilirse AST yeniden render edilmez
+    if not ast:
+        return "No parse tree available"
 
-        if token.type == TokenType.IDENTIFIER:
-            self.advance()
-            return ASTNode("Identifier", token.value)
+    info = f"Parse tree structure:\n"
+    info += ast_text if ast_text is not None else ast.to_string()
 
-        elif token.type == TokenType.INTEGER:
-            self.advance()
-            return ASTNode("Integer", token.value)
+    if errors:
+        info += f"\nSyntax errors ({len(errors)}):\n"
+        info += ''.join(f"  - {error}\n" for error in errors)
+    else:
+        info += "\nNo syntax errors found.\n"
 
-        elif token.type == TokenType.FLOAT:
-            self.advance()
-            return ASTNode("Float", token.value)
+    return info
 
-        elif token.type == TokenType.CHARACTER:
-            self.advance()
-            return ASTNode("Character", token.value)
 
-        elif token.type == TokenType.STRING:
-            self.advance()
-            return ASTNode("String", token.value)
+def count_nodes(ast):
+    # AST'deki node sayısı (iterative)
+    if ast is None:
+        return 0
+    count = 0
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
 
-        elif token.type == TokenType.LEFT_PAREN:
-            self.advance()
-            expr = self.parse_expression()
-            if not self.expect(TokenType.RIGHT_PAREN):
-                self.skip_until_balanced(TokenType.LEFT_PAREN, TokenType.RIGHT_PAREN)
-            return expr
 
-        else:
-            # Unexpected token için hata ver ama None dönme
-            if token.type != TokenType.EOF and token.type not in [TokenType.SEMICOLON,
-                                                                  TokenType.RIGHT_PAREN,
-                                                                  TokenType.RIGHT_BRACE]:
-                self.add_error(f"Unexpected token {token.type}")
-                self.advance()  # Skip the problematic token
-            return None
+def build_line_starts(source_code):
+    # Satır başı offset'leri (prefix sum), satır/kolon -> offset dönüşümü O(1)
+    line_starts = [0]
+    position = source_code.find('\n')
+    while position != -1:
+        line_starts.append(position + 1)
+        position = source_code.find('\n', position + 1)
+    return line_starts
 
 
 class CodeAnalyzer:
     """Ana analiz sınıfı"""
 
-    def __init__(self):
-        self.lexer = None
+    def __init__(self, lexer_engine='regex', parse_jobs=1, cache=None, collect_metrics=False):
+        self.lexer_engine = lexer_engine
+        self.parse_jobs = parse_jobs  # 1: sıralı, None: tüm CPU'lar
+        self.cache = cache  # analysis_cache.AnalysisCache; sadece tam analizlerde kullanılır
+        self.collect_metrics = collect_metrics
+        self.metrics = DISABLED_METRICS  # Son analizin faz süreleri ve sayaçları
+        self.lexer = IncrementalLexer(engine=lexer_engine)
         self.parser = None
-        self.tokens = []
+        self.tokens = TokenTable()
         self.ast = None
         self.errors = []
+        self.error_positions = []
+        self.line_starts = [0]  # line_starts[line - 1] = satırın ilk karakterinin offset'i
 
-    def analyze(self, source_code):
-        """Kodu analiz et"""
+    def analyze(self, source_code, edit=None):
+        """Kodu analiz et, edit=(position, removed, added) verilirse sadece değişen bölge lex edilir"""
         self.errors = []
+        self.error_positions = []
+        self.line_starts = build_line_starts(source_code)
+        metrics = self.metrics = AnalysisMetrics() if self.collect_metrics else DISABLED_METRICS
+
+        cache_key = None
+        if edit is None and self.cache is not None:
+            with metrics.phase('cache'):
+                cache_key = self.cache.key_for(source_code)
+                entry = self.cache.load(cache_key, source_code)
+            if entry is not None:
+                success, tokens, self.ast, self.errors, self.error_positions = entry
+                self.tokens = self.lexer.load(source_code, tokens)
+                self.parser = None
+                self.record_counts(metrics)
+                return success
 
         try:
             # Lexical Analysis
-            self.lexer = CLexer(source_code)
-            self.tokens = self.lexer.tokenize_all()
-
-            # Syntax Analysis
-            self.parser = CParser(self.tokens)
-            self.ast = self.parser.parse_program()
+            previous_tokens = self.tokens
+            with metrics.phase('lex'):
+                if edit is not None:
+                    self.tokens = self.lexer.update(source_code, *edit)
+                else:
+                    self.tokens = self.lexer.reset(source_code)
+
+            # Syntax Analysis: edit varsa sadece değişen token'lara dokunan
+            # top-level öğeler yeniden parse edilir
+            with metrics.phase('parse'):
+                previous = self.parser
+                self.parser = CParser(self.tokens)
+                if edit is not None and previous is not None:
+                    first, new_end = self.lexer.relexed_range
+                    old_end = new_end - (len(self.tokens) - len(previous_tokens))
+                    self.ast = self.parser.reparse_program(previous, first, old_end, new_end)
+                elif self.parse_jobs != 1:
+                    self.parser = parse_program_parallel(self.tokens, self.parse_jobs)
+                    self.ast = self.parser.program
+                else:
+                    self.ast = self.parser.parse_program()
             self.errors.extend(self.parser.errors)
+            self.error_positions.extend(self.parser.error_positions)
 
+            if cache_key is not None:
+                with metrics.phase('cache'):
+                    self.cache.store(cache_key, True, self.tokens, self.ast, self.errors, self.error_positions)
+            self.record_counts(metrics)
             return True
         except Exception as e:
+            # Token cache'i yarım kalmış olabilir, bir sonraki analiz baştan lex etsin
+            self.lexer.invalidate()
+            self.parser = None
             self.errors.append(f"Analysis error: {str(e)}")
+            self.error_positions.append(None)
             return False
 
+    def record_counts(self, metrics):
+        if not metrics.enabled:
+            return
+        metrics.set_count('tokens', len(self.tokens))
+        metrics.set_count('relexed', self.lexer.relexed_count)
+        metrics.set_count('nodes', count_nodes(self.ast))
+        metrics.set_count('errors', len(self.errors))
+
+    def snapshot(self):
+        """Başarılı analizin durumunu döndür; restore ile geri yüklenir (undo/redo cache'i)"""
+        return (self.lexer.source, self.tokens, self.ast, self.errors, self.error_positions,
+                self.line_starts, self.parser)
+
+    def restore(self, state):
+        source_code, tokens, self.ast, self.errors, self.error_positions, self.line_starts, \
+            self.parser = state
+        self.tokens = self.lexer.load(source_code, tokens)
+        # Top-level node'lar sonraki parse'larda paylaşılıp kaydırılmış olabilir
+        if self.parser is not None:
+            for start, end, node, _ in self.parser.segments:
+                if node is not None:
+                    node.token_span = (start, end)
+
+    def position_of(self, line, column):
+        """1-based satır/kolonu kaynak koddaki offset'e çevir"""
+        return self.line_starts[line - 1] + column - 1
+
     def get_token_info(self):
         """Token bilgilerini döndür"""
-        if not self.tokens:
-            return "No tokens available"
-
-        info = f"Total tokens: {len(self.tokens)}\n\n"
-
-        # Token type counts
-        token_counts = {}
-        for token in self.tokens:
-            if token.type != TokenType.EOF:
-                token_counts[token.type] = token_counts.get(token.type, 0) + 1
-
-        info += "Token distribution:\n"
-        for token_type, count in sorted(token_counts.items(), key=lambda x: x[1], reverse=True):
-            info += f"  {token_type.name}: {count}\n"
-
-        info += "\n---TOKENS---:\n"
-        for token in self.tokens:
-            if token.type != TokenType.EOF:
-                info += f"{token.type.name}: {token.value}\n"
-
-        return info
+        return format_token_info(self.tokens)
 
     def get_parse_info(self):
         """Parse bilgilerini döndür"""
-        if not self.ast:
-            return "No parse tree available"
-
-        info = f"Parse tree structure:\n"
-        info += self.ast.to_string()
-
-        if self.errors:
-            info += f"\nSyntax errors ({len(self.errors)}):\n"
-            for error in self.errors:
-                info += f"  - {error}\n"
-        else:
-            info += "\nNo syntax errors found.\n"
-
-        return info
+        return format_parse_info(self.ast, self.errors)
 
     def get_errors(self):
         """Hataları döndür"""
@@ -0,0 +1,107 @@
+# Bozuk cache kayıtları analizi düşürmemeli: decode ValueError verir, load()
+# miss döner ve analiz kaydı baştan üretip üzerine yazar
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_cache import (HEADER, PAYLOAD_DIGEST_SIZE, AnalysisCache, decode_analysis, encode_analysis,
+                            payload_digest)
+from parser import CodeAnalyzer
+
+SOURCE = '''int counter = 0;
+int add(int a, int b) { return a + b; }
+int main() {
+    float ratio = 1.5;
+    char *name = "cache";
+    counter = add(counter, 2) @ 3;
+    return counter;
+}
+'''
+RANDOM_SEED = 20241018
+FLIP_TRIALS = 2000
+
+
+def analyzed(source):
+    analyzer = CodeAnalyzer()
+    success = analyzer.analyze(source)
+    return analyzer, encode_analysis(success, analyzer.tokens, analyzer.ast, analyzer.errors,
+                                     analyzer.error_positions)
+
+
+def resealed(data):
+    # Digest'i yeniden hesapla ki index kontrolleri de sınansın
+    fields = data[:HEADER.size - PAYLOAD_DIGEST_SIZE]
+    return fields + payload_digest(fields, data[HEADER.size:]) + data[HEADER.size:]
+
+
+def test_round_trip():
+    analyzer, data = analyzed(SOURCE)
+    success, tokens, ast, errors, error_positions = decode_analysis(data, SOURCE)
+    assert list(tokens.rows()) == list(analyzer.tokens.rows())
+    assert ast.to_string() == analyzer.ast.to_string()
+    assert errors == analyzer.errors
+    assert error_positions == analyzer.error_positions
+
+
+def test_flipped_bytes_are_rejected():
+    _, data = analyzed(SOURCE)
+    rng = random.Random(RANDOM_SEED)
+    for _ in range(FLIP_TRIALS):
+        corrupted = bytearray(data)
+        corrupted[rng.randrange(len(data))] ^= 1 << rng.randrange(8)
+        with pytest.raises(ValueError):
+            decode_analysis(bytes(corrupted), SOURCE)
+
+
+def test_resealed_corruption_raises_only_value_error():
+    _, data = analyzed(SOURCE)
+    rng = random.Random(RANDOM_SEED + 1)
+    for _ in range(FLIP_TRIALS):
+        corrupted = bytearray(data)
+        corrupted[rng.randrange(HEADER.size, len(data))] = rng.randrange(256)
+        try:
+            decode_analysis(resealed(bytes(corrupted)), SOURCE)
+        except ValueError:
+            pass
+
+
+def test_truncated_tree_is_rejected():
+    # Son node'un çocuk sayısı arttırılırsa ağaç tamamlanmaz
+    analyzer, data = analyzed('int x;')
+    node_count = HEADER.unpack_from(data)[3]
+    token_bytes = len(analyzer.tokens) * (2 + 5 * 4)
+    last_child_count = HEADER.size + token_bytes + 2 * node_count * 4 + (node_count - 1) * 4
+    corrupted = bytearray(data)
+    corrupted[last_child_count] += 1
+    with pytest.raises(ValueError):
+        decode_analysis(resealed(bytes(corrupted)), 'int x;')
+
+
+def test_corrupted_entry_is_a_miss(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+    analyzer = CodeAnalyzer(cache=cache)
+    assert analyzer.analyze(SOURCE)
+    expected = analyzer.ast.to_string()
+
+    path = cache.path_for(cache.key_for(SOURCE))
+    with open(path, 'r+b') as file:
+        file.seek(HEADER.size + 7)
+        byte = file.read(1)
+        file.seek(HEADER.size + 7)
+        file.write(bytes([byte[0] ^ 0xFF]))
+
+    analyzer = CodeAnalyzer(cache=cache)
+    analyzer.analyze(SOURCE)
+    assert cache.misses == 2 and cache.hits == 0
+    assert analyzer.ast.to_string() == expected
+
+    # Analiz kaydı yeniden yazdı
+    analyzer = CodeAnalyzer(cache=cache)
+    analyzer.analyze(SOURCE)
+    assert cache.hits == 1
+    assert analyzer.ast.to_string() == expected
@@ -0,0 +1,27 @@
+# Nearest-rank percentile: benchmark ve latency raporları aynı helper'ı kullanır
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_metrics import percentile
+
+
+@pytest.mark.parametrize('values, fraction, expected', [
+    ([], 0.5, 0.0),
+    ([7], 0.99, 7),
+    ([1, 2, 3, 4], 0.5, 2),
+    ([1, 2, 3, 4, 5, 6], 0.5, 3),
+    ([1, 2, 3, 4, 5], 0.5, 3),
+    ([1, 2, 3, 4], 0.0, 1),
+    ([1, 2, 3, 4], 1.0, 4),
+    (list(range(1, 101)), 0.07, 7),
+    (list(range(1, 101)), 0.99, 99),
+    (list(range(1, 21)), 0.95, 19),
+    (list(range(1, 11)), 0.91, 10),
+])
+def test_nearest_rank(values, fraction, expected):
+    assert percentile(values, fraction) == expected
@@ -0,0 +1,134 @@
+# Editör offscreen açılır; her highlight modunda ve büyük dokümanın lazy
+# yolunda, edit'lerden sonra boyanan renkler yeni bir CLexer geçişiyle aynı olmalı
+
+import os
+import random
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+QtWidgets = pytest.importorskip('PyQt6.QtWidgets')
+from PyQt6.QtGui import QColor, QTextCursor
+
+from c_lexer_main import CLexer
+from gui_integration import get_token_color
+from highlighter_text_edit import LAZY_HIGHLIGHT_THRESHOLD, CustomSyntaxTextEditor
+
+ITEM = '''/* block {index}
+   comment */
+int f{index}(int a) {{
+    char *s = "text {index}";  // line comment
+    float r = {index}.5 * a;
+    if (r > 1) {{ a = a - 1; }}
+    return a + 'c';
+}}
+'''
+# Açık comment/string ile sonraki satırların rengini değiştiren edit'ler
+EDITS = ['/*', 'x', '*/', '"', '\n', 'int ', '"', '@']
+RANDOM_SEED = 20241022
+IDLE_TIMEOUT = 120.0
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def make_source(size):
+    parts = []
+    index = 0
+    while sum(map(len, parts)) < size:
+        parts.append(ITEM.format(index=index))
+        index += 1
+    return ''.join(parts)
+
+
+def is_idle(editor):
+    return (not editor.analysis_running and not editor.highlight_timer.isActive() and
+            not editor.lexical_timer.isActive() and not editor.lazy_pending_chunks and
+            editor.last_highlighted_text == editor.toPlainText())
+
+
+def wait_idle(app, editor):
+    deadline = time.perf_counter() + IDLE_TIMEOUT
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        if is_idle(editor):
+            # Son format değişikliklerinin tetiklediği event'ler de işlensin
+            app.processEvents()
+            if is_idle(editor):
+                return
+        time.sleep(0.005)
+    pytest.fail("editor did not finish highlighting")
+
+
+def color_at(document, position):
+    # Layout formatları (layout modu ve lexical overlay) char formatın üstünde çizilir
+    block = document.findBlock(position)
+    offset = position - block.position()
+    for format_range in block.layout().formats():
+        if format_range.start <= offset < format_range.start + format_range.length:
+            return format_range.format.foreground().color().name()
+    cursor = QTextCursor(document)
+    cursor.setPosition(position)
+    cursor.setPosition(position + 1, QTextCursor.MoveMode.KeepAnchor)
+    return cursor.charFormat().foreground().color().name()
+
+
+def mismatched_tokens(editor):
+    text = editor.toPlainText()
+    document = editor.document()
+    mismatches = []
+    for token in CLexer(text).tokenize_all():
+        if token.type.name in ('NEWLINE', 'EOF') or token.start >= token.end:
+            continue
+        expected = QColor(get_token_color(token.type.name)).name()
+        for position in {token.start, token.end - 1}:
+            if text[position] != '\n' and color_at(document, position) != expected:
+                mismatches.append((token.type.name, token.value[:20], position))
+                break
+    return mismatches
+
+
+def edit_and_check(app, editor, source):
+    editor.setPlainText(source)
+    wait_idle(app, editor)
+    assert mismatched_tokens(editor) == []
+
+    rng = random.Random(RANDOM_SEED)
+    for text in EDITS:
+        cursor = QTextCursor(editor.document())
+        cursor.setPosition(rng.randrange(len(editor.toPlainText())))
+        cursor.insertText(text)
+        app.processEvents()
+    wait_idle(app, editor)
+    assert mismatched_tokens(editor) == []
+
+
+@pytest.mark.parametrize('mode', CustomSyntaxTextEditor.HIGHLIGHT_MODES)
+def test_colors_match_lexer(app, mode):
+    editor = CustomSyntaxTextEditor(highlight_mode=mode)
+    editor.resize(800, 600)
+    editor.show()
+    try:
+        edit_and_check(app, editor, make_source(4000))
+    finally:
+        editor.shutdown_analysis()
+        editor.close()
+
+
+def test_lazy_highlighting_colors_match_lexer(app):
+    editor = CustomSyntaxTextEditor(highlight_mode='document')
+    editor.resize(800, 600)
+    editor.show()
+    try:
+        source = make_source(LAZY_HIGHLIGHT_THRESHOLD + 1000)
+        assert len(source) >= LAZY_HIGHLIGHT_THRESHOLD
+        edit_and_check(app, editor, source)
+    finally:
+        editor.shutdown_analysis()
+        editor.close()
@@ -0,0 +1,80 @@
+# IncrementalLexer.update: her edit'ten sonra token tablosu tam lex ile aynı olmalı
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from c_lexer_main import MIN_COMPACT_SYMBOLS, CLexer, IncrementalLexer
+
+SOURCE = '''int total = 0;
+int add(int a, int b) { return a + b; }
+int main() {
+    total = add(total, 1);
+    return total;
+}
+'''
+
+# Rastgele edit'lerde eklenen parçalar: açık string/comment, satır sonu,
+# token'ları birleştiren/bölen karakterler
+FRAGMENTS = [
+    'x', 'count', '1', '.5', ' ', '\n', ';', '{', '}', '(', ')', '+', '=', '/', '*',
+    '"', "'", '\\', '/*', '*/', '//', 'int ', 'return ', 'ğ', '@', '"a b"', '/* c */',
+]
+RANDOM_SEED = 20241019
+RANDOM_EDITS = 1500
+
+
+def full_rows(source):
+    return list(CLexer(source, engine='regex').tokenize_table().rows())
+
+
+@pytest.mark.parametrize('engine', ['regex', 'table'])
+def test_random_edits_match_full_lex(engine):
+    rng = random.Random(RANDOM_SEED)
+    lexer = IncrementalLexer(engine=engine)
+    text = SOURCE
+    lexer.reset(text)
+    for step in range(RANDOM_EDITS):
+        position = rng.randint(0, len(text))
+        removed = rng.randint(0, min(rng.choice([0, 0, 1, 3, 12]), len(text) - position))
+        inserted = rng.choice(FRAGMENTS) if rng.random() < 0.8 else ''
+        text = text[:position] + inserted + text[position + removed:]
+        tokens = lexer.update(text, position, removed, len(inserted))
+        assert list(tokens.rows()) == full_rows(text), (step, text)
+        first, end = lexer.relexed_range
+        assert end - first == lexer.relexed_count
+        if step % 300 == 299:
+            text = SOURCE
+            lexer.reset(text)
+
+
+def test_inconsistent_edit_falls_back_to_full_lex():
+    lexer = IncrementalLexer()
+    lexer.reset(SOURCE)
+    text = SOURCE.replace('total', 'sum')
+    tokens = lexer.update(text, 0, 0, 0)
+    assert list(tokens.rows()) == full_rows(text)
+    assert lexer.relexed_range == (0, len(tokens))
+
+
+def test_symbol_table_stays_bounded():
+    # Yazılıp silinen isimlerin önekleri (c, co, cou...) tabloda birikmemeli
+    lexer = IncrementalLexer()
+    lexer.reset(SOURCE)
+    text = SOURCE
+    position = SOURCE.index('return total')
+    for index in range(400):
+        end = position
+        for character in f'counter{index} = 1; ':
+            text = text[:end] + character + text[end:]
+            lexer.update(text, end, 0, 1)
+            end += 1
+        text = text[:position] + text[end:]
+        lexer.update(text, position, end - position, 0)
+    assert text == SOURCE
+    assert len(lexer.tokens.symbol_table) <= 2 * MIN_COMPACT_SYMBOLS
+    assert list(lexer.tokens.rows()) == full_rows(text)
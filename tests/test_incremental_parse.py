@@ -0,0 +1,73 @@
+# CodeAnalyzer.analyze(source, edit): sadece değişen top-level öğeleri yeniden
+# parse eden yol (CParser.reparse_program) tam parse ile aynı sonucu vermeli
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import CodeAnalyzer
+
+SOURCE = ''.join(
+    f'int f{index}(int a) {{\n'
+    f'    int x = a * {index};\n'
+    f'    if (x > 1) {{ x = x - 1; }}\n'
+    f'    while (x) {{ x = x / 2; }}\n'
+    f'    return x;\n'
+    f'}}\n'
+    f'float g{index} = {index}.5;\n'
+    f'/* comment {index} */\n'
+    for index in range(12)
+)
+# Öğe sınırlarını bozan ve onaran parçalar
+FRAGMENTS = [
+    'x', ';', '{', '}', '(', ')', '"', '\n', ' ', '=', '1', '/* c */', '/*', '*/',
+    ' return 1; ', ' if (a) b = 2; ', 'int q = 3;', 'void g(int a) { }\n',
+]
+RANDOM_SEED = 20241020
+RANDOM_EDITS = 400
+
+
+def assert_same_analysis(incremental, full, step):
+    assert incremental.ast.to_string() == full.ast.to_string(), step
+    assert incremental.errors == full.errors, step
+    assert incremental.error_positions == full.error_positions, step
+    assert ([node.token_span for node in incremental.ast.children] ==
+            [node.token_span for node in full.ast.children]), step
+
+
+def test_random_edits_match_full_parse():
+    rng = random.Random(RANDOM_SEED)
+    incremental = CodeAnalyzer()
+    full = CodeAnalyzer()
+    text = SOURCE
+    incremental.analyze(text)
+    for step in range(RANDOM_EDITS):
+        if step % 50 == 49:
+            # Birikmiş hatalar hata limitine dayanmasın
+            incremental.analyze(SOURCE, (0, len(text), len(SOURCE)))
+            text = SOURCE
+            continue
+        position = rng.randint(0, len(text))
+        removed = rng.randint(0, min(rng.choice([0, 0, 1, 2, 8]), len(text) - position))
+        inserted = rng.choice(FRAGMENTS) if rng.random() < 0.8 else ''
+        text = text[:position] + inserted + text[position + removed:]
+        incremental.analyze(text, (position, removed, len(inserted)))
+        full.analyze(text)
+        assert_same_analysis(incremental, full, step)
+
+
+def test_edit_inside_function_reuses_other_items():
+    analyzer = CodeAnalyzer()
+    analyzer.analyze(SOURCE)
+    before = analyzer.ast.children
+    position = SOURCE.index('x = x - 1') + len('x = x - ')
+    text = SOURCE[:position] + '2' + SOURCE[position + 1:]
+    analyzer.analyze(text, (position, 1, 1))
+
+    full = CodeAnalyzer()
+    full.analyze(text)
+    assert_same_analysis(analyzer, full, 'single edit')
+    reused = [old is new for old, new in zip(before, analyzer.ast.children)]
+    assert reused.count(False) == 1
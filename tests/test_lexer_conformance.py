@@ -0,0 +1,145 @@
+# Regex engine (CLexer.tokenize_regex) ile table engine (next_token) token
+# token aynı çıktıyı vermeli: type, value, line, column, start, end
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from c_lexer_base import TokenType
+from c_lexer_main import CLexer
+
+FIXED_CASES = [
+    '',
+    'int main() {\n    return 0;\n}\n',
+    # Sonlanmamış string, char ve block comment
+    '"abc',
+    '"abc\ndef',
+    "'a",
+    "'",
+    '/* open comment\nint x;',
+    '/* a * b',
+    '/*',
+    # Escape sequence'ler
+    r'"a\"b" x',
+    r"'\'' y",
+    r"'\\' z",
+    '"line\\\ncontinued"',
+    r'"ends with backslash\\',
+    '"\\',
+    # '1.' ve sayı biçimleri
+    '1.',
+    '1. + 2',
+    '1.5e3',
+    '.5',
+    '3.14;',
+    # Non-ASCII identifier'lar
+    'değişken = 1;',
+    'ünïcödé_x += ğ2;',
+    'café->naïve',
+    # Hatalı karakterler
+    '@',
+    'a @ b $ c ` d',
+    'x = 1 # 2',
+    # Operatörler ve comment'ler
+    'a<<=b>>=c&&d||e->f++--g!=h',
+    '// line comment\nx',
+    '// comment at eof',
+    'a /* x ** / */ b',
+    'a/**/b/***/c',
+    # EOF pozisyonu
+    'x\n',
+    'x\n\n  ',
+    '\t \t',
+    '\n\n\n',
+]
+
+# Rastgele girdilerin alfabesi: operatörler, tırnaklar, comment başları,
+# escape, non-ASCII ve hatalı karakterler
+ALPHABET = [
+    'a', 'b', '_', 'x1', 'int', 'return', 'ğ', 'é', '0', '7', '1.', '.', '5',
+    '+', '-', '*', '/', '%', '=', '<', '>', '!', '&', '|', '^', '~', '?', ':',
+    '(', ')', '[', ']', '{', '}', ',', ';', '->', '++', '--',
+    '"', "'", '\\', '/*', '*/', '//',
+    ' ', '\t', '\n', '@', '$', '`', '#',
+]
+RANDOM_SEED = 20241017
+RANDOM_CASES = 2000
+
+
+def table_rows(source):
+    lexer = CLexer(source, engine='table')
+    tokens = lexer.tokenize_all()
+    return [(token.type, token.value, token.line, token.column, token.start, token.end)
+            for token in tokens]
+
+
+def regex_rows(source):
+    lexer = CLexer(source, engine='regex')
+    tokens = lexer.tokenize_regex()
+    return [(token.type, token.value, token.line, token.column, token.start, token.end)
+            for token in tokens]
+
+
+def assert_conforms(source):
+    table = table_rows(source)
+    regex = regex_rows(source)
+    for index, (expected, actual) in enumerate(zip(table, regex)):
+        assert actual == expected, f"{source!r}: token {index} differs"
+    assert len(regex) == len(table), f"{source!r}: token count differs"
+
+
+@pytest.mark.parametrize('source', FIXED_CASES)
+def test_fixed_cases(source):
+    assert_conforms(source)
+
+
+def test_random_inputs():
+    rng = random.Random(RANDOM_SEED)
+    for _ in range(RANDOM_CASES):
+        source = ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 40)))
+        assert_conforms(source)
+
+
+def test_token_tables_match():
+    rng = random.Random(RANDOM_SEED + 1)
+    for _ in range(200):
+        source = ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 40)))
+        table = list(CLexer(source, engine='table').tokenize_table().rows())
+        regex = list(CLexer(source, engine='regex').tokenize_table().rows())
+        assert regex == table, source
+
+
+# Table engine'in regex engine'e uyması için değişen davranışları
+
+def test_error_character_is_skipped():
+    rows = table_rows('a @ b')
+    assert [row[0] for row in rows] == [TokenType.IDENTIFIER, TokenType.ERROR, TokenType.IDENTIFIER,
+                                        TokenType.EOF]
+    assert rows[1][1:] == ('Unexpected character: @', 1, 3, 2, 3)
+
+
+def test_escape_sequences_are_consumed():
+    rows = table_rows(r'"a\"b" ' + r"'\''")
+    assert rows[0][:2] == (TokenType.STRING, r'"a\"b"')
+    assert rows[1][:2] == (TokenType.CHARACTER, r"'\''")
+
+
+def test_star_inside_block_comment_keeps_it_open():
+    rows = table_rows('/* a * b ** / */ x')
+    assert rows[0][:2] == (TokenType.MULTI_COMMENT, '/* a * b ** / */')
+    assert rows[1][:2] == (TokenType.IDENTIFIER, 'x')
+
+
+def test_float_without_fraction_digits():
+    assert table_rows('1.')[0][:2] == (TokenType.FLOAT, '1.')
+
+
+def test_pending_token_is_emitted_before_eof():
+    source = 'x = "open\ny'
+    rows = table_rows(source)
+    assert rows[-2][:2] == (TokenType.STRING, '"open\ny')
+    assert rows[-1] == (TokenType.EOF, '', 2, 2, len(source), len(source))
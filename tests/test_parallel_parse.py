@@ -0,0 +1,75 @@
+# parse_program_parallel sonucu sıralı parse_program ile aynı olmalı; parçalar
+# bir öğenin ortasından başlasa da (dengesiz brace'ler) birleştirme doğru kalmalı
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parser as analysis_parser
+from c_lexer_main import CLexer
+from parser import CParser, parse_program_parallel
+
+ITEMS = [
+    'int f{index}(int a) {{ int x = a; if (x) {{ x = 1; }} return x; }}\n',
+    'float g{index};\n',
+    '#define M{index} 1\n',
+    'void h{index}() {{ while (a) {{ b = 2; }} }}\n',
+    '/* c{index} */\n',
+]
+# Parça sınırlarını kaydıran bozuk parçalar
+BROKEN = ['}', '{', ';', 'int', '(', 'x', ')', '} }', '{ {']
+RANDOM_SEED = 20241021
+
+
+def random_source(rng):
+    parts = [rng.choice(ITEMS).format(index=index) for index in range(rng.randint(1, 60))]
+    for _ in range(rng.randint(0, 4)):
+        parts.insert(rng.randint(0, len(parts)), rng.choice(BROKEN))
+    return ''.join(parts)
+
+
+def serial_parse(tokens):
+    parser = CParser(tokens)
+    parser.parse_program()
+    return parser
+
+
+def assert_same_parse(parallel, serial, source):
+    assert parallel.program.to_string() == serial.program.to_string(), source
+    assert parallel.errors == serial.errors, source
+    assert parallel.error_positions == serial.error_positions, source
+    assert [segment[:2] for segment in parallel.segments] == [segment[:2] for segment in serial.segments]
+
+
+def test_merged_chunks_match_serial_parse():
+    # Pool olmadan: parçalar bu process'te parse edilip birleştirilir
+    rng = random.Random(RANDOM_SEED)
+    merged = 0
+    for _ in range(300):
+        source = random_source(rng)
+        tokens = CLexer(source, engine='regex').tokenize_table()
+        analysis_parser.init_parse_worker(tokens)
+        results = [analysis_parser.parse_token_range(token_range)
+                   for token_range in analysis_parser.split_top_level(tokens, rng.randint(1, 12))]
+        if any(error_limit for _, error_limit in results):
+            continue
+        parallel = CParser(tokens)
+        if not analysis_parser.merge_parsed_chunks(parallel, [segments for segments, _ in results]):
+            continue
+        merged += 1
+        assert_same_parse(parallel, serial_parse(tokens), source)
+    assert merged > 200
+
+
+@pytest.mark.parametrize('jobs', [2, 3])
+def test_process_pool_matches_serial_parse(monkeypatch, jobs):
+    monkeypatch.setattr(analysis_parser, 'PARALLEL_MIN_TOKENS', 0)
+    rng = random.Random(RANDOM_SEED + jobs)
+    for _ in range(5):
+        source = random_source(rng)
+        tokens = CLexer(source, engine='regex').tokenize_table()
+        assert_same_parse(parse_program_parallel(tokens, jobs), serial_parse(tokens), source)
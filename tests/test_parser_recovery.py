@@ -0,0 +1,269 @@
+# Hatalı ifadelerde parser'ın toparlanması
+#
+# Beklenen AST ve hatalar user-018 öncesindeki recursive descent parser'ın
+# çıktısıdır: operand parse edilemediğinde '(' '[' '.' '->' ifadeyi bitirir,
+# callee'si olmayan FunctionCall ya da kaybolan "Expected SEMICOLON" olmamalı.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import CodeAnalyzer
+
+RECURSIVE_DESCENT_CASES = [
+    ('void f(){ x = for (1); }',
+     (
+         'Program(None)\n'
+         '  Function(f)\n'
+         '    ReturnType(void)\n'
+         '    Parameters(None)\n'
+         '    Block(None)\n'
+         '      ExpressionStatement(None)\n'
+         '        Identifier(x)\n'
+         '      ExpressionStatement(None)\n'
+         '        Integer(1)\n'
+     ),
+     [
+         'Unexpected token TokenType.KEYWORD at line 1, column 15',
+         'Expected TokenType.SEMICOLON, got TokenType.LEFT_PAREN at line 1, column 19',
+     ]),
+    ('void f(){ x = int [3]; }',
+     (
+         'Program(None)\n'
+         '  Function(f)\n'
+         '    ReturnType(void)\n'
+         '    Parameters(None)\n'
+         '    Block(None)\n'
+         '      ExpressionStatement(None)\n'
+         '        Identifier(x)\n'
+     ),
+     [
+         'Unexpected token TokenType.KEYWORD at line 1, column 15',
+         'Expected TokenType.SEMICOLON, got TokenType.LEFT_BRACKET at line 1, column 19',
+         'Unexpected token TokenType.LEFT_BRACKET at line 1, column 19',
+     ]),
+    ('void f(){ x = if (a) y; }',
+     (
+         'Program(None)\n'
+         '  Function(f)\n'
+         '    ReturnType(void)\n'
+         '    Parameters(None)\n'
+         '    Block(None)\n'
+         '      ExpressionStatement(None)\n'
+         '        Identifier(x)\n'
+         '      ExpressionStatement(None)\n'
+         '        Identifier(a)\n'
+         '      ExpressionStatement(None)\n'
+         '        Identifier(y)\n'
+     ),
+     [
+         'Unexpected token TokenType.KEYWORD at line 1, column 15',
+         'Expected TokenType.SEMICOLON, got TokenType.LEFT_PAREN at line 1, column 18',
+         'Expected TokenType.SEMICOLON, got TokenType.IDENTIFIER at line 1, column 22',
+     ]),
+    ('void f(){ for (1); }',
+     (
+         'Program(None)\n'
+         '  Function(f)\n'
+         '    ReturnType(void)\n'
+         '    Parameters(None)\n'
+         '    Block(None)\n'
+         '      ForStatement(None)\n'
+         '        Initialization(None)\n'
+         '          ExpressionStatement(None)\n'
+         '            Integer(1)\n'
+         '        Increment(None)\n'
+     ),
+     [
+         'Expected TokenType.SEMICOLON, got TokenType.RIGHT_PAREN at line 1, column 17',
+         'Expected TokenType.SEMICOLON, got TokenType.RIGHT_PAREN at line 1, column 17',
+     ]),
+    ('void f(){ y = @ (a, b); z = 1; }',
+     (
+         'Program(None)\n'
+         '  Function(f)\n'
+         '    ReturnType(void)\n'
+         '    Parameters(None)\n'
+         '    Block(None)\n'
+         '      ExpressionStatement(None)\n'
+         '        Identifier(y)\n'
+         '      ExpressionStatement(None)\n'
+         '        Identifier(a)\n'
+         '      ExpressionStatement(None)\n'
+         '        Assignment(=)\n'
+         '          Identifier(z)\n'
+         '          Integer(1)\n'
+     ),
+     [
+         'Unexpected token TokenType.ERROR at line 1, column 15',
+         'Expected TokenType.SEMICOLON, got TokenType.LEFT_PAREN at line 1, column 17',
+         'Expected TokenType.RIGHT_PAREN, got TokenType.COMMA at line 1, column 19',
+     ]),
+    ('void f(){ y = a + @ [2]; }',
+     (
+         'Program(None)\n'
+         '  Function(f)\n'
+         '    ReturnType(void)\n'
+         '    Parameters(None)\n'
+         '    Block(None)\n'
+         '      ExpressionStatement(None)\n'
+         '        Assignment(=)\n'
+         '          Identifier(y)\n'
+         '          Identifier(a)\n'
+     ),
+     [
+         'Unexpected token TokenType.ERROR at line 1, column 19',
+         'Expected TokenType.SEMICOLON, got TokenType.LEFT_BRACKET at line 1, column 21',
+         'Unexpected token TokenType.LEFT_BRACKET at line 1, column 21',
+     ]),
+    ('void f(){ x = (while [1]); }',
+     (
+         'Program(None)\n'
+         '  Function(f)\n'
+         '    ReturnType(void)\n'
+         '    Parameters(None)\n'
+         '    Block(None)\n'
+         '      ExpressionStatement(None)\n'
+         '        Identifier(x)\n'
+     ),
+     [
+         'Unexpected token TokenType.KEYWORD at line 1, column 16',
+         'Expected TokenType.RIGHT_PAREN, got TokenType.LEFT_BRACKET at line 1, column 22',
+     ]),
+    ('void f(){ g(a, int (b)); }',
+     (
+         'Program(None)\n'
+         '  Function(f)\n'
+         '    ReturnType(void)\n'
+         '    Parameters(None)\n'
+         '    Block(None)\n'
+         '      ExpressionStatement(None)\n'
+         '        FunctionCall(None)\n'
+         '          Identifier(g)\n'
+         '          Arguments(None)\n'
+         '            Identifier(a)\n'
+     ),
+     [
+         'Unexpected token TokenType.KEYWORD at line 1, column 16',
+         'Expected TokenType.RIGHT_PAREN, got TokenType.LEFT_PAREN at line 1, column 20',
+     ]),
+    ('void f(){ x = @ . y; }',
+     (
+         'Program(None)\n'
+         '  Function(f)\n'
+         '    ReturnType(void)\n'
+         '    Parameters(None)\n'
+         '    Block(None)\n'
+         '      ExpressionStatement(None)\n'
+         '        Identifier(x)\n'
+     ),
+     [
+         'Unexpected token TokenType.ERROR at line 1, column 15',
+         'Expected TokenType.SEMICOLON, got TokenType.DOT at line 1, column 17',
+         'Unexpected token TokenType.DOT at line 1, column 17',
+     ]),
+    ('void f(){ x = @ -> y; }',
+     (
+         'Program(None)\n'
+         '  Function(f)\n'
+         '    ReturnType(void)\n'
+         '    Parameters(None)\n'
+         '    Block(None)\n'
+         '      ExpressionStatement(None)\n'
+         '        Identifier(x)\n'
+     ),
+     [
+         'Unexpected token TokenType.ERROR at line 1, column 15',
+         'Expected TokenType.SEMICOLON, got TokenType.ARROW at line 1, column 17',
+         'Unexpected token TokenType.ARROW at line 1, column 17',
+     ]),
+    ('void f(){ return @ (1); }',
+     (
+         'Program(None)\n'
+         '  Function(f)\n'
+         '    ReturnType(void)\n'
+         '    Parameters(None)\n'
+         '    Block(None)\n'
+         '      ReturnStatement(None)\n'
+         '      ExpressionStatement(None)\n'
+         '        Integer(1)\n'
+     ),
+     [
+         'Unexpected token TokenType.ERROR at line 1, column 18',
+         'Expected TokenType.SEMICOLON, got TokenType.LEFT_PAREN at line 1, column 20',
+     ]),
+    ('void f(){ a[int (2)] = 1; }',
+     (
+         'Program(None)\n'
+         '  Function(f)\n'
+         '    ReturnType(void)\n'
+         '    Parameters(None)\n'
+         '    Block(None)\n'
+         '      ExpressionStatement(None)\n'
+         '        Assignment(=)\n'
+         '          Identifier(a)\n'
+         '          Integer(1)\n'
+     ),
+     [
+         'Unexpected token TokenType.KEYWORD at line 1, column 13',
+         'Expected TokenType.RIGHT_BRACKET, got TokenType.LEFT_PAREN at line 1, column 17',
+     ]),
+    ('int x = for (1);',
+     (
+         'Program(None)\n'
+         '  VariableDeclaration(x)\n'
+         '    Type(int)\n'
+     ),
+     [
+         'Unexpected token TokenType.KEYWORD at line 1, column 9',
+         'Expected TokenType.SEMICOLON, got TokenType.LEFT_PAREN at line 1, column 13',
+     ]),
+]
+
+
+def analyze(source):
+    analyzer = CodeAnalyzer()
+    analyzer.analyze(source)
+    return analyzer.ast.to_string(), analyzer.errors
+
+
+@pytest.mark.parametrize('source, expected_ast, expected_errors', RECURSIVE_DESCENT_CASES)
+def test_matches_recursive_descent_recovery(source, expected_ast, expected_errors):
+    ast, errors = analyze(source)
+    assert ast == expected_ast
+    assert errors == expected_errors
+
+
+@pytest.mark.parametrize('operator', ['++', '--'])
+def test_postfix_after_failed_operand_ends_expression(operator):
+    # Eski parser ++/-- bilmiyordu; artık ifade burada biter ve ';' hatası
+    # verilir, sonraki deyim prefix operatör olarak parse edilir
+    ast, errors = analyze(f'void f(){{ x = @ {operator}; }}')
+    assert 'PostfixOp' not in ast
+    assert errors == [
+        'Unexpected token TokenType.ERROR at line 1, column 15',
+        f'Expected TokenType.SEMICOLON, got TokenType.{"INCREMENT" if operator == "++" else "DECREMENT"} at line 1, column 17',
+    ]
+
+
+def test_valid_postfix_chain():
+    ast, errors = analyze('void f(){ x = a.b->c[1](2)++; }')
+    assert errors == []
+    assert ast.endswith(
+        '        Assignment(=)\n'
+        '          Identifier(x)\n'
+        '          PostfixOp(++)\n'
+        '            FunctionCall(None)\n'
+        '              ArrayAccess(None)\n'
+        '                MemberAccess(->)\n'
+        '                  MemberAccess(.)\n'
+        '                    Identifier(a)\n'
+        '                    Identifier(b)\n'
+        '                  Identifier(c)\n'
+        '                Integer(1)\n'
+        '              Arguments(None)\n'
+        '                Integer(2)\n'
+    )